@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" == __name__
+
+
+def _private():
+    import os
+    import re
+    import sys
+    import argparse
+    import tempfile
+    import subprocess
+
+    _source = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+    _package = "p5.shelleport"
+    _line_pattern = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)\s*$")
+    _forbidden = (f"{_package}._modes.server", f"{_package}._modes.bench")
+    _connect_module = f"{_package}._modes.client._class"
+    _late_modules = ("asyncio", )
+    _default_modules = 220
+    _default_milliseconds = 250
+
+    def _measure():
+        with tempfile.TemporaryDirectory() as _directory:
+            _environment = {**os.environ, "PYTHONPATH": os.pathsep.join(filter(None, (
+                _source, os.environ.get("PYTHONPATH")
+            )))}
+            _process = subprocess.run(
+                (sys.executable, "-X", "importtime", "-m", _package, "client", f"unix:{_directory}/missing"),
+                stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.PIPE, env = _environment
+            )
+        _modules = list()
+        for _line in _process.stderr.decode("utf-8").splitlines():
+            _match = _line_pattern.match(_line)
+            if _match is None: continue
+            _, _cumulative, _indent, _name = _match.groups()
+            _modules.append((_name, int(_cumulative), 1 == len(_indent)))
+        assert _modules, "no import timings collected"
+        _milliseconds = sum(_cumulative for _, _cumulative, _top in _modules if _top) / 1000
+        return _modules, _milliseconds
+
+    def _check_order(modules: list):
+        _names = [_name for _name, _, _ in modules]
+        if _connect_module not in _names: return [f"{_connect_module} was not imported"]
+        _index = _names.index(_connect_module)
+        return [
+            f"{_name} is imported before the connection is started"
+            for _name in _late_modules if _name in _names[:_index + 1]
+        ]
+
+    def _routine():
+        _parser = argparse.ArgumentParser(description = "client import time budget (`-X importtime`)")
+        _parser.add_argument("-m", "--modules", type = int, default = _default_modules, help = "module count budget")
+        _parser.add_argument("-t", "--milliseconds", type = int, default = _default_milliseconds, help = "import time budget")
+        _parser.add_argument("-r", "--repeat", type = int, default = 5, help = "measurements (best is checked)")
+        _arguments = _parser.parse_args()
+        assert 0 < _arguments.modules
+        assert 0 < _arguments.milliseconds
+        assert 0 < _arguments.repeat
+        _modules, _milliseconds = min((_measure() for _ in range(_arguments.repeat)), key = lambda _item: _item[1])
+        _names = [_name for _name, _, _ in _modules]
+        _own = [_name for _name in _names if _name.startswith(f"{_package}.")]
+        print(f"modules {len(_names):>5} ({len(_own)} own), budget {_arguments.modules}", flush = True)
+        print(f"imports {_milliseconds:8.1f} ms, budget {_arguments.milliseconds} ms", flush = True)
+        for _name, _cumulative, _ in sorted((_item for _item in _modules if _item[2]), key = lambda _item: -_item[1])[:10]:
+            print(f"{_cumulative / 1000:8.1f} ms {_name}", flush = True)
+        _failures = _check_order(modules = _modules)
+        _failures.extend(
+            f"{_name} is imported by the client" for _name in _own if _name.startswith(_forbidden)
+        )
+        if _arguments.modules < len(_names): _failures.append(f"{len(_names)} modules exceed the budget")
+        if _arguments.milliseconds < _milliseconds: _failures.append(f"{_milliseconds:.1f} ms exceed the budget")
+        for _failure in _failures: print(f"FAIL: {_failure}", file = sys.stderr, flush = True)
+        if _failures: exit(1)
+
+    class _Result(object):
+        routine = _routine
+
+    return _Result
+
+
+try: _private().routine()
+finally: del _private
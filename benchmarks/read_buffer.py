@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" == __name__
+
+
+def _private():
+    import os
+    import sys
+    import time
+    import argparse
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+    from p5.shelleport._common import protocol as _protocol_module
+
+    _protocol = _protocol_module.make()
+    _header_size = _protocol.binary_header_size
+    _data_kind = _protocol.binary_kinds.data
+    _stdout_channel = _protocol.binary_channels.index("stdout")
+    _network_chunk_sizes = {"framed": 64 * 1024, "burst": 8 * 1024 * 1024}
+    _chunk_sizes = {"4KiB": 4 * 1024, "64KiB": 64 * 1024, "8MiB": 8 * 1024 * 1024}
+
+    def _aligned(chunk_size: int, volume: int):
+        _buffer = _protocol.make_read_buffer()
+        _chunk = os.urandom(chunk_size)
+        _counter = 0
+        while volume > _counter:
+            _buffer.push(chunk = _chunk)
+            _blob = _buffer.pop_blob(size = chunk_size)
+            assert chunk_size == len(_blob)
+            del _blob
+            _counter += chunk_size
+        return _counter
+
+    def _framed(chunk_size: int, volume: int, network_chunk_size: int):
+        _buffer = _protocol.make_read_buffer()
+        _frame = _protocol.serialize_binary_header(
+            kind = _data_kind, channel = _stdout_channel, size = chunk_size
+        ) + os.urandom(chunk_size)
+        _stream = memoryview(_frame * max(1, network_chunk_size // len(_frame)))
+        _counter = 0
+        _pending = None
+        while volume > _counter:
+            for _offset in range(0, len(_stream), network_chunk_size):
+                _buffer.push(chunk = _stream[_offset:_offset + network_chunk_size])
+                while True:
+                    if _pending is None:
+                        if _header_size > _buffer.size: break
+                        _pending = _protocol.parse_binary_header(value = _buffer.pop_bytes(size = _header_size))[-1]
+                    if _pending > _buffer.size: break
+                    _blob = _buffer.pop_blob(size = _pending)
+                    assert _pending == len(_blob)
+                    del _blob
+                    _counter += _pending
+                    _pending = None
+        return _counter
+
+    def _make_framed(network_chunk_size: int): return lambda chunk_size, volume: _framed(
+        chunk_size = chunk_size, volume = volume, network_chunk_size = network_chunk_size
+    )
+
+    _scenarios = {"aligned": _aligned, **{
+        _name: _make_framed(network_chunk_size = _size) for _name, _size in _network_chunk_sizes.items()
+    }}
+
+    def _measure(scenario, chunk_size: int, volume: int, repeat: int):
+        _best = None
+        for _ in range(repeat):
+            _time = time.perf_counter()
+            _counter = scenario(chunk_size = chunk_size, volume = volume)
+            _time = time.perf_counter() - _time
+            _rate = _counter / _time
+            if (_best is None) or (_best < _rate): _best = _rate
+        return _best
+
+    def _routine():
+        _parser = argparse.ArgumentParser(description = "protocol read buffer throughput")
+        _parser.add_argument("-v", "--volume", type = int, default = 256, help = "MiB per measurement")
+        _parser.add_argument("-r", "--repeat", type = int, default = 3, help = "measurements per case (best is reported)")
+        _arguments = _parser.parse_args()
+        assert 0 < _arguments.volume
+        assert 0 < _arguments.repeat
+        _volume = _arguments.volume * 1024 * 1024
+        for _scenario_name, _scenario in _scenarios.items():
+            for _size_name, _size in _chunk_sizes.items():
+                _rate = _measure(scenario = _scenario, chunk_size = _size, volume = _volume, repeat = _arguments.repeat)
+                print(f"{_scenario_name:>8} {_size_name:>6} {_rate / 1024 / 1024:12.1f} MiB/s", flush = True)
+
+    class _Result(object):
+        routine = _routine
+
+    return _Result
+
+
+try: _private().routine()
+finally: del _private
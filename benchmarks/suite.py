@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" == __name__
+
+
+def _private():
+    import os
+    import re
+    import sys
+    import json
+    import time
+    import typing
+    import asyncio
+    import argparse
+    import platform
+    import datetime
+
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+    from p5.shelleport._common import protocol as _protocol_module
+    from p5.shelleport._common import asynchronous_tools as _asynchronous_tools_module
+
+    _protocol = _protocol_module.make()
+    _executors = _asynchronous_tools_module.executor_registry.shared
+    _make_task_group = _asynchronous_tools_module.task_group.make
+    _make_iteration_controller = _asynchronous_tools_module.iteration_controller.make
+
+    _format_version = 1
+    _network_chunk_size = 64 * 1024
+    _control_message = {"session": 1, "channel": "stdout", "credit": 4 * 1024 * 1024}
+
+    class _Timer(object):
+        @property
+        def seconds(self): return self.__seconds
+
+        def __enter__(self):
+            self.__started = time.perf_counter()
+            return self
+
+        def __exit__(self, exception_type, exception_instance, exception_traceback):
+            self.__seconds = time.perf_counter() - self.__started
+
+        def __init__(self):
+            super().__init__()
+            self.__started = None
+            self.__seconds = None
+
+    def _count(scale: float, base: int): return max(1, int(base * scale))
+
+    def _make_read_buffer_case(chunk_size: int):
+        async def _case(scale: float):
+            _buffer = _protocol.make_read_buffer()
+            _chunk = os.urandom(chunk_size)
+            _volume = _count(scale = scale, base = 256 * 1024 * 1024)
+            _counter = 0
+            with _Timer() as _timer:
+                while _volume > _counter:
+                    _buffer.push(chunk = _chunk)
+                    _blob = _buffer.pop_blob(size = chunk_size)
+                    assert chunk_size == len(_blob)
+                    del _blob
+                    _counter += chunk_size
+            return _counter, _timer.seconds
+
+        return _case
+
+    async def _serialize_case(scale: float):
+        _iterations = _count(scale = scale, base = 200000)
+        with _Timer() as _timer:
+            for _ in range(_iterations): _protocol.serialize_message(message = _control_message)
+        return _iterations, _timer.seconds
+
+    async def _parse_case(scale: float):
+        _iterations = _count(scale = scale, base = 200000)
+        _value, = _protocol.serialize_message(message = _control_message)
+        with _Timer() as _timer:
+            for _ in range(_iterations): _protocol.parse_message(value = _value)
+        return _iterations, _timer.seconds
+
+    def _make_messages(scale: float, blob_size: int):
+        _blob = os.urandom(blob_size)
+        _count_value = _count(scale = scale, base = (64 * 1024 * 1024) // blob_size)
+        return [{"session": 1, "channel": "stdout", "blob": _blob} for _ in range(_count_value)]
+
+    async def _write_stream(messages: typing.List[dict], framing: str):
+        _chunks = list()
+
+        async def _destination(chunks: typing.Iterable[bytes]): _chunks.extend(chunks)
+
+        async with _protocol.open_writer(destination = _destination, framing = lambda: framing) as _writer:
+            with _Timer() as _timer:
+                for _message in messages: await _writer(_message)
+        return bytes().join(_chunks), _timer.seconds
+
+    def _make_writer_case(framing: str, blob_size: int):
+        async def _case(scale: float):
+            _messages = _make_messages(scale = scale, blob_size = blob_size)
+            _stream, _seconds = await _write_stream(messages = _messages, framing = framing)
+            return len(_messages) * blob_size, _seconds
+
+        return _case
+
+    def _make_reader_case(framing: str, blob_size: int):
+        async def _case(scale: float):
+            _messages = _make_messages(scale = scale, blob_size = blob_size)
+            _stream, _seconds = await _write_stream(messages = _messages, framing = framing)
+            _stream = memoryview(_stream)
+
+            class _Context(object):
+                offset = 0
+
+            async def _source(size: int):
+                _chunk = bytes(_stream[_Context.offset:_Context.offset + min(size, _network_chunk_size)])
+                _Context.offset += len(_chunk)
+                return _chunk
+
+            _counter = 0
+            async with _protocol.open_reader(source = _source, framing = lambda: framing) as _reader:
+                with _Timer() as _timer:
+                    async for _message in _reader: _counter += len(_message.get("blob", bytes()))
+            assert len(_messages) * blob_size == _counter
+            return _counter, _timer.seconds
+
+        return _case
+
+    async def _asynchronizer_call_case(scale: float):
+        _asynchronizer = _executors.make_asynchronizer()
+        _iterations = _count(scale = scale, base = 20000)
+
+        def _delegate(): return None
+
+        with _Timer() as _timer:
+            for _ in range(_iterations): await _asynchronizer(_delegate)
+        return _iterations, _timer.seconds
+
+    async def _asynchronizer_iteration_case(scale: float):
+        _asynchronizer = _executors.make_asynchronizer()
+        _iterations = _count(scale = scale, base = 20000)
+        _counter = 0
+        with _Timer() as _timer:
+            async for _ in _asynchronizer(range(_iterations)): _counter += 1
+        assert _iterations == _counter
+        return _iterations, _timer.seconds
+
+    async def _iteration_controller_case(scale: float):
+        _iterations = _count(scale = scale, base = 50000)
+
+        async def _generator():
+            for _index in range(_iterations): yield _index
+
+        _counter = 0
+        with _Timer() as _timer:
+            async with _make_iteration_controller(factory = _generator) as _controller:
+                await _controller.open()
+                async for _ in _controller.make_iterator(): _counter += 1
+        assert _iterations == _counter
+        return _iterations, _timer.seconds
+
+    async def _task_group_spawn_case(scale: float):
+        _iterations = _count(scale = scale, base = 100000)
+
+        async def _coroutine(): return None
+
+        with _Timer() as _timer:
+            async with _make_task_group(lazy = True) as _task_group:
+                for _ in range(_iterations): _task_group.spawn(_coroutine())
+        return _iterations, _timer.seconds
+
+    async def _task_group_cancel_case(scale: float):
+        _iterations = _count(scale = scale, base = 100000)
+
+        with _Timer() as _timer:
+            async with _make_task_group(lazy = True) as _task_group:
+                for _ in range(_iterations): _task_group.spawn(asyncio.sleep(+1.0e+3))
+                await asyncio.sleep(0)
+                _task_group.cancel()
+        return _iterations, _timer.seconds
+
+    _cases = {
+        "read_buffer.push_pop.4KiB": ("bytes", _make_read_buffer_case(chunk_size = 4 * 1024)),
+        "read_buffer.push_pop.64KiB": ("bytes", _make_read_buffer_case(chunk_size = 64 * 1024)),
+        "protocol.serialize_message": ("messages", _serialize_case),
+        "protocol.parse_message": ("messages", _parse_case),
+        **{
+            f"protocol.{_kind}.{_framing}.{_name}": ("bytes", _factory(framing = _framing, blob_size = _size))
+            for _kind, _factory in (("writer", _make_writer_case), ("reader", _make_reader_case))
+            for _framing in _protocol.framings
+            for _name, _size in (("4KiB", 4 * 1024), ("64KiB", 64 * 1024))
+        },
+        "asynchronizer.call": ("calls", _asynchronizer_call_case),
+        "asynchronizer.iteration": ("items", _asynchronizer_iteration_case),
+        "iteration_controller.item": ("items", _iteration_controller_case),
+        "task_group.spawn": ("tasks", _task_group_spawn_case),
+        "task_group.cancel": ("tasks", _task_group_cancel_case)
+    }
+
+    async def _measure(case: typing.Callable, scale: float, repeat: int):
+        _best = None
+        for _ in range(repeat):
+            _counter, _seconds = await case(scale = scale)
+            assert 0 < _seconds
+            if (_best is None) or (_best[0] / _best[1] < _counter / _seconds): _best = _counter, _seconds
+        return _best
+
+    def _load_baseline(path: typing.Optional[str]):
+        if path is None: return dict()
+        with open(path, "r") as _stream: _baseline = json.load(_stream)
+        assert isinstance(_baseline, dict)
+        assert _format_version == _baseline.get("version"), "unsupported baseline format"
+        return {_name: _value["rate"] for _name, _value in _baseline["results"].items()}
+
+    async def _coroutine(pattern: typing.Optional[str], scale: float, repeat: int, baseline: typing.Dict[str, float]):
+        asyncio.get_running_loop().set_default_executor(_executors.get())
+        _results = dict()
+        for _name, (_unit, _case) in _cases.items():
+            if (pattern is not None) and (re.search(pattern, _name) is None): continue
+            _counter, _seconds = await _measure(case = _case, scale = scale, repeat = repeat)
+            _result = {"unit": _unit, "count": _counter, "seconds": _seconds, "rate": _counter / _seconds}
+            _summary = f"{_name:<40} {_result['rate']:16.1f} {_unit}/s"
+            try: _baseline = baseline[_name]
+            except KeyError: pass
+            else:
+                _result["baseline"] = _baseline
+                _result["ratio"] = _result["rate"] / _baseline
+                _summary = f"{_summary} {_result['ratio']:8.3f}x"
+            _results[_name] = _result
+            print(_summary, file = sys.stderr, flush = True)
+        return _results
+
+    def _routine():
+        _parser = argparse.ArgumentParser(description = "shelleport micro-benchmark suite (JSON report)")
+        _parser.add_argument("-k", "--filter", default = None, help = "regular expression selecting cases")
+        _parser.add_argument("-s", "--scale", type = float, default = +1.0e+0, help = "workload multiplier")
+        _parser.add_argument("-r", "--repeat", type = int, default = 3, help = "measurements per case (best is reported)")
+        _parser.add_argument("-b", "--baseline", default = None, help = "previous report to compare rates against")
+        _parser.add_argument("-o", "--output", default = None, help = "report path (standard output by default)")
+        _parser.add_argument("-l", "--list", action = "store_true", help = "list cases and exit")
+        _arguments = _parser.parse_args()
+        if _arguments.list:
+            for _name, (_unit, _case) in _cases.items(): print(f"{_name} ({_unit})")
+            return
+        assert 0 < _arguments.scale
+        assert 0 < _arguments.repeat
+        if _arguments.filter is not None: re.compile(_arguments.filter)
+        _baseline = _load_baseline(path = _arguments.baseline)
+        _report = {
+            "version": _format_version,
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "scale": _arguments.scale,
+            "repeat": _arguments.repeat,
+            "results": asyncio.run(_coroutine(
+                pattern = _arguments.filter, scale = _arguments.scale, repeat = _arguments.repeat, baseline = _baseline
+            ))
+        }
+        _report = json.dumps(_report, indent = 2, sort_keys = True)
+        if _arguments.output is None: print(_report, flush = True)
+        else:
+            with open(_arguments.output, "w") as _stream: print(_report, file = _stream)
+
+    class _Result(object):
+        routine = _routine
+
+    return _Result
+
+
+try: _private().routine()
+finally: del _private
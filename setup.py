@@ -62,6 +62,7 @@ def _private():
             ),
         },
         install_requires = ("asyncio", ),
+        extras_require = {"uvloop": ("uvloop", )},
         setup_requires = ("wheel", )
     )
 
@@ -13,6 +13,7 @@ def _private():
         lazy_getter = _make_lazy_getter(dictionary = {
             "Mode": lambda module: module.mode.Class,
             "CliValidator": lambda module: module.cli_validator.Class,
+            "Multiplexer": lambda module: module.multiplexer.Class,
             "PlatformInfo": lambda module: module.platform_info.Class,
             "ContextManipulator": lambda module: module.context_manipulator.Class,
             "parse_address": lambda module: getattr(module, "_parse_address").routine
@@ -13,7 +13,9 @@ def _private():
         lazy_getter = _make_lazy_getter(dictionary = {
             "TaskGroup": lambda module: module.task_group.Class,
             "ThreadPool": lambda module: module.thread_pool.Class,
+            "TimerHeap": lambda module: module.timer_heap.Class,
             "Asynchronizer": lambda module: module.asynchronizer.Class,
+            "ExecutorRegistry": lambda module: module.executor_registry.Class,
             "IterationController": lambda module: module.iteration_controller.Class
         })
 
@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import time
+    import typing
+    import asyncio
+    import threading
+    import concurrent.futures
+
+    from . import asynchronizer as _asynchronizer_module
+
+    _make_asynchronizer = _asynchronizer_module.make
+
+    _cpu_count = os.cpu_count() or 1
+    _default_limits = {
+        "default": min(32, _cpu_count + 4),
+        "io": min(32, _cpu_count + 4),
+        "codec": _cpu_count,
+        "passthrough": 64
+    }
+
+    class _Pool(concurrent.futures.ThreadPoolExecutor):
+        @property
+        def name(self): return self.__name
+
+        @property
+        def limit(self): return self.__limit
+
+        @property
+        def closed(self): return self.__closed
+
+        def statistics(self):
+            with self.__lock:
+                _uptime = time.monotonic() - self.__created
+                _busy = self.__busy + sum(time.monotonic() - _time for _time in self.__active.values())
+                return {
+                    "limit": self.__limit,
+                    "submitted": self.__submitted,
+                    "completed": self.__completed,
+                    "failed": self.__failed,
+                    "cancelled": self.__cancelled,
+                    "queued": self.__queued,
+                    "running": len(self.__active),
+                    "wait_time_total": self.__wait,
+                    "wait_time_max": self.__wait_max,
+                    "busy_time_total": _busy,
+                    "utilisation": (_busy / (_uptime * self.__limit)) if 0 < _uptime else 0.0
+                }
+
+        def submit(self, delegate: typing.Callable, /, *args, **kwargs):
+            _submitted = time.monotonic()
+
+            def _wrapper():
+                _started = time.monotonic()
+                _key = object()
+                with self.__lock:
+                    self.__queued -= 1
+                    self.__active[_key] = _started
+                    self.__wait += _started - _submitted
+                    self.__wait_max = max(self.__wait_max, _started - _submitted)
+                _failed = True
+                try:
+                    _result = delegate(*args, **kwargs)
+                    _failed = False
+                    return _result
+                finally:
+                    with self.__lock:
+                        self.__busy += time.monotonic() - self.__active.pop(_key)
+                        if _failed: self.__failed += 1
+                        else: self.__completed += 1
+
+            with self.__lock:
+                self.__queued += 1
+                self.__submitted += 1
+
+            try: _future = super().submit(_wrapper)
+            except BaseException:
+                with self.__lock:
+                    self.__queued -= 1
+                    self.__submitted -= 1
+                raise
+
+            _future.add_done_callback(self.__on_done)
+            return _future
+
+        def shutdown(self, *args, **kwargs):
+            self.__closed = True
+            return super().shutdown(*args, **kwargs)
+
+        async def __call__(self, *args, **kwargs):
+            args = list(args)
+            _delegate = args.pop(0)
+            _loop = asyncio.get_running_loop()
+            assert isinstance(_loop, asyncio.AbstractEventLoop)
+            return await _loop.run_in_executor(self, lambda: _delegate(*args, **kwargs))
+
+        def __init__(self, name: str, limit: int):
+            assert isinstance(name, str)
+            assert name
+            assert isinstance(limit, int)
+            assert 0 < limit
+            super().__init__(max_workers = limit, thread_name_prefix = f"{__name__}:{name}")
+            self.__name = name
+            self.__limit = limit
+            self.__lock = threading.Lock()
+            self.__closed = False
+            self.__created = time.monotonic()
+            self.__active = dict()
+            self.__submitted = 0
+            self.__completed = 0
+            self.__failed = 0
+            self.__cancelled = 0
+            self.__queued = 0
+            self.__wait = 0.0
+            self.__wait_max = 0.0
+            self.__busy = 0.0
+
+        def __on_done(self, future: concurrent.futures.Future):
+            if not future.cancelled(): return
+            with self.__lock:
+                self.__queued -= 1
+                self.__cancelled += 1
+
+    class _Class(object):
+        @property
+        def names(self):
+            with self.__lock: return tuple(self.__pools.keys())
+
+        def configure(self, name: str, limit: int):
+            assert isinstance(name, str)
+            assert name
+            assert isinstance(limit, int)
+            assert 0 < limit
+            with self.__lock:
+                _pool = self.__pools.get(name)
+                assert (_pool is None) or _pool.closed or (limit == _pool.limit), "pool is in use already"
+                self.__limits[name] = limit
+
+        def get(self, name: str = "default"):
+            assert isinstance(name, str)
+            with self.__lock:
+                _pool = self.__pools.get(name)
+                if (_pool is None) or _pool.closed:
+                    _pool = _Pool(name = name, limit = self.__limits.get(name, _default_limits["default"]))
+                    self.__pools[name] = _pool
+                return _pool
+
+        def make_asynchronizer(self, name: str = "default"): return _make_asynchronizer(executor = self.get(name = name))
+
+        def statistics(self):
+            with self.__lock: _pools = tuple(self.__pools.items())
+            return {_name: _pool.statistics() for _name, _pool in _pools}
+
+        def reset(self):
+            with self.__lock: self.__pools.clear()
+
+        def after_fork(self):
+            self.__lock = threading.Lock()
+            self.__pools = dict()
+
+        def __init__(self, limits: typing.Dict[str, int] = None):
+            super().__init__()
+            _limits = _default_limits.copy()
+            if limits is not None:
+                for _name, _limit in limits.items():
+                    assert isinstance(_name, str)
+                    assert _name
+                    assert isinstance(_limit, int)
+                    assert 0 < _limit
+                    _limits[_name] = _limit
+            self.__lock = threading.Lock()
+            self.__pools = dict()
+            self.__limits = _limits
+
+    _shared = _Class()
+    os.register_at_fork(after_in_child = _shared.after_fork)
+
+    class _Result(object):
+        Pool = _Pool
+        Class = _Class
+        shared = _shared
+
+    return _Result
+
+
+_private = _private()
+try:
+    Pool = _private.Pool
+    Class = _private.Class
+    shared = _private.shared
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
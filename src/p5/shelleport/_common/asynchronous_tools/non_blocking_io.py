@@ -6,25 +6,19 @@ assert "__main__" != __name__
 
 def _private():
     import os
+    import stat
     import typing
     import asyncio
     import contextlib
 
-    from . import thread_pool as _thread_pool_module
-    from . import asynchronizer as _asynchronizer_module
+    from . import executor_registry as _executor_registry_module
 
     from .. import protocol as _protocol_module
+    from .. import chunk_sizer as _chunk_sizer_module
 
     _protocol = _protocol_module.make()
-    _make_thread_pool = _thread_pool_module.make
-    _make_asynchronizer = _asynchronizer_module.make
-
-    @contextlib.asynccontextmanager
-    async def _open_asynchronizer():
-        with _make_thread_pool(max_workers = 1) as _thread_pool:
-            def _spawn(delegate: typing.Callable): return _thread_pool(delegate)
-            _thread_pool.open()
-            yield await _thread_pool(_make_asynchronizer, executor = _spawn)
+    _make_chunk_sizer = _chunk_sizer_module.make
+    _executors = _executor_registry_module.shared
 
     @contextlib.contextmanager
     def _open_stream(stream: typing.Union[int, typing.IO[bytes]], mode: str):
@@ -55,13 +49,40 @@ def _private():
                     if _blocking: os.set_blocking(_descriptor, True)
         finally: os.close(_descriptor)
 
-    @contextlib.asynccontextmanager
-    async def _open_reader(source: typing.Union[int, typing.IO[bytes]]):
+    def _make_operation(descriptor: int, action: typing.Callable, writer: bool):
+        if stat.S_ISREG(os.fstat(descriptor).st_mode):
+            _asynchronizer = _executors.make_asynchronizer(name = "io")
+
+            async def _threaded(argument): return await _asynchronizer(action, descriptor, argument)
+            return _threaded
+
         _loop = asyncio.get_running_loop()
         assert isinstance(_loop, asyncio.AbstractEventLoop)
+        if writer: _watch, _unwatch = _loop.add_writer, _loop.remove_writer
+        else: _watch, _unwatch = _loop.add_reader, _loop.remove_reader
+
+        async def _wait():
+            _future = _loop.create_future()
+
+            def _ready():
+                if not _future.done(): _future.set_result(None)
 
+            _watch(descriptor, _ready)
+            try: await _future
+            finally: _unwatch(descriptor)
+
+        async def _native(argument):
+            while True:
+                try: return action(descriptor, argument)
+                except BlockingIOError: await _wait()
+
+        return _native
+
+    @contextlib.asynccontextmanager
+    async def _open_reader(source: typing.Union[int, typing.IO[bytes]]):
         class _Context(object):
-            event = asyncio.Event()
+            finished = False
+            sizer = _make_chunk_sizer(maximum = _protocol.ideal_chunk_size)
 
         async def _coroutine(delegate: typing.Callable, size: typing.Optional[int]):
             if size is None: size = _protocol.ideal_chunk_size
@@ -69,84 +90,59 @@ def _private():
                 assert isinstance(size, int)
                 if -1 == size: size = _protocol.ideal_chunk_size
                 else: assert 0 < size
+            size = _Context.sizer.limit(size = size)
 
-            if _Context.event is None: return bytes()
+            if _Context.finished: return bytes()
 
             try:
-                _chunk = await delegate(size = size)
+                _chunk = await delegate(size)
                 assert isinstance(_chunk, bytes)
 
             except BaseException:
-                _Context.event = None
+                _Context.finished = True
                 raise
 
-            if not _chunk: _Context.event = None
+            if not _chunk: _Context.finished = True
+            else: _Context.sizer.observe(requested = size, received = len(_chunk))
             return _chunk
 
-        async with _open_asynchronizer() as _asynchronizer:
-            async def _operation(size: int): return await _asynchronizer(os.read, source, size)
-            async with _asynchronizer(await _asynchronizer(_open_stream, stream = source, mode = "r")) as source:
-                async def _delegate(size: int):
-                    try: return await _operation(size = size)
-                    except BlockingIOError:
-                        _Context.event.clear()
-                        _loop.add_reader(source, _Context.event.set)
-                        try:
-                            await _Context.event.wait()
-                            assert _Context.event.is_set()
-                        finally: _loop.remove_reader(source)
-                        return await _operation(size = size)
-                _result: typing.Callable[
-                    [typing.Optional[int]], typing.Awaitable[bytes]
-                ] = lambda size = None: _coroutine(delegate = _delegate, size = size)
-                yield _result
+        with _open_stream(stream = source, mode = "r") as source:
+            _delegate = _make_operation(descriptor = source, action = os.read, writer = False)
+            _result: typing.Callable[
+                [typing.Optional[int]], typing.Awaitable[bytes]
+            ] = lambda size = None: _coroutine(delegate = _delegate, size = size)
+            yield _result
 
     @contextlib.asynccontextmanager
     async def _open_writer(destination: typing.Union[int, typing.IO[bytes]]):
-        _loop = asyncio.get_running_loop()
-        assert isinstance(_loop, asyncio.AbstractEventLoop)
-
         class _Context(object):
-            event = asyncio.Event()
+            finished = False
 
-        async def _coroutine(delegate: typing.Callable, data: bytes):
-            assert isinstance(data, bytes)
+        async def _coroutine(delegate: typing.Callable, data: typing.Union[bytes, memoryview]):
+            assert isinstance(data, (bytes, memoryview))
             assert data
-            if _Context.event is None: return 0
+            if _Context.finished: return 0
             data = memoryview(data)
             _counter = 0
             try:
                 while data:
-                    _size = await delegate(data = data)
+                    _size = await delegate(data)
                     assert isinstance(_size, int)
                     assert 0 < _size
                     assert len(data) >= _size
                     _counter = _counter + _size
                     data = data[_size:]
             except BaseException:
-                _Context.event = None
+                _Context.finished = True
                 raise
             return _counter
 
-        async with _open_asynchronizer() as _asynchronizer:
-            async def _operation(data: bytes): return await _asynchronizer(os.write, destination, data)
-            async with _asynchronizer(await _asynchronizer(
-                _open_stream, stream = destination, mode = "w"
-            )) as destination:
-                async def _delegate(data):
-                    try: return await _operation(data = data)
-                    except BlockingIOError:
-                        _Context.event.clear()
-                        _loop.add_writer(destination, _Context.event.set)
-                        try:
-                            await _Context.event.wait()
-                            assert _Context.event.is_set()
-                        finally: _loop.remove_writer(destination)
-                        return await _operation(data = data)
-                _result: typing.Callable[[bytes], typing.Awaitable[int]] = lambda data: _coroutine(
-                    delegate = _delegate, data = data
-                )
-                yield _result
+        with _open_stream(stream = destination, mode = "w") as destination:
+            _delegate = _make_operation(descriptor = destination, action = os.write, writer = True)
+            _result: typing.Callable[[bytes], typing.Awaitable[int]] = lambda data: _coroutine(
+                delegate = _delegate, data = data
+            )
+            yield _result
 
     class _Result(object):
         open_reader = _open_reader
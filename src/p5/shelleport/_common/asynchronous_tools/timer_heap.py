@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import math
+    import heapq
+    import typing
+    import asyncio
+    import weakref
+    import itertools
+
+    from .. import metrics as _metrics_module
+
+    _metrics = _metrics_module.shared
+    _default_resolution = +2.5e-1
+    _stale_ratio = 2
+
+    _pending_metric = _metrics.gauge(name = "timer_heap_pending", help = "deadlines queued in event loop timer heaps")
+    _wakeups_metric = _metrics.counter(name = "timer_heap_wakeups_total", help = "event loop wakeups serving timer heaps")
+    _expired_metric = _metrics.counter(name = "timer_heap_expired_total", help = "timers fired by timer heaps")
+
+    class _Timer(object):
+        @property
+        def deadline(self): return self.__deadline
+
+        @property
+        def armed(self): return self.__deadline is not None
+
+        def arm(self, delay: float):
+            assert isinstance(delay, float)
+            assert 0 <= delay
+            self.__deadline = self.__loop.time() + delay
+            if (self.__entry is None) or (self.__deadline < self.__entry[0]):
+                if self.__entry is not None: self.__discard()
+                self.__entry = self.__schedule(timer = self, deadline = self.__deadline)
+
+        def disarm(self):
+            self.__deadline = None
+            if self.__entry is None: return
+            self.__entry = None
+            self.__discard()
+
+        def holds(self, entry: tuple): return entry is self.__entry
+
+        def expire(self, entry: tuple):
+            assert entry is self.__entry
+            assert self.__deadline is not None
+            self.__entry = None
+            if entry[0] < self.__deadline:
+                self.__entry = self.__schedule(timer = self, deadline = self.__deadline)
+                return False
+            self.__deadline = None
+            self.__callback()
+            return True
+
+        def __init__(
+            self, loop: asyncio.AbstractEventLoop, schedule: typing.Callable, discard: typing.Callable[[], None],
+            callback: typing.Callable[[], None]
+        ):
+            super().__init__()
+            assert isinstance(loop, asyncio.AbstractEventLoop)
+            assert callable(schedule)
+            assert callable(discard)
+            assert callable(callback)
+            self.__loop = loop
+            self.__schedule = schedule
+            self.__discard = discard
+            self.__callback = callback
+            self.__deadline = None
+            self.__entry = None
+
+    class _Class(object):
+        @property
+        def loop(self): return self.__loop
+
+        @property
+        def resolution(self): return self.__resolution
+
+        @property
+        def pending(self): return len(self.__heap)
+
+        def make_timer(self, callback: typing.Callable[[], None]):
+            return _Timer(loop = self.__loop, schedule = self.__schedule, discard = self.__discard, callback = callback)
+
+        def __init__(self, loop: asyncio.AbstractEventLoop, resolution: float = None):
+            super().__init__()
+            assert isinstance(loop, asyncio.AbstractEventLoop)
+            if resolution is None: resolution = _default_resolution
+            assert isinstance(resolution, float)
+            assert 0 < resolution
+            self.__loop = loop
+            self.__resolution = resolution
+            self.__heap = list()
+            self.__stale = 0
+            self.__counter = itertools.count()
+            self.__handle = None
+
+        def __schedule(self, timer: _Timer, deadline: float):
+            _slot = math.ceil(deadline / self.__resolution) * self.__resolution
+            _entry = (_slot, next(self.__counter), timer)
+            heapq.heappush(self.__heap, _entry)
+            _pending_metric.inc()
+            if self.__handle is not None:
+                if self.__handle.when() <= _slot: return _entry
+                self.__handle.cancel()
+            self.__handle = self.__loop.call_at(_slot, self.__run)
+            return _entry
+
+        def __discard(self):
+            self.__stale += 1
+            if len(self.__heap) > _stale_ratio * self.__stale: return
+            _size = len(self.__heap)
+            self.__heap = [_entry for _entry in self.__heap if _entry[2].holds(entry = _entry)]
+            heapq.heapify(self.__heap)
+            self.__stale = 0
+            _pending_metric.dec(_size - len(self.__heap))
+
+        def __run(self):
+            self.__handle = None
+            _wakeups_metric.inc()
+            _time = self.__loop.time() + self.__resolution / 2
+            while self.__heap and (self.__heap[0][0] <= _time):
+                _entry = heapq.heappop(self.__heap)
+                _pending_metric.dec()
+                _timer = _entry[2]
+                if not _timer.holds(entry = _entry):
+                    self.__stale -= 1
+                    continue
+                try:
+                    if _timer.expire(entry = _entry): _expired_metric.inc()
+                except Exception as _exception: self.__loop.call_exception_handler({
+                    "message": "timer callback failed", "exception": _exception
+                })
+            if self.__heap and (self.__handle is None): self.__handle = self.__loop.call_at(self.__heap[0][0], self.__run)
+
+    _instances = weakref.WeakKeyDictionary()
+
+    def _get(loop: asyncio.AbstractEventLoop = None):
+        if loop is None: loop = asyncio.get_running_loop()
+        assert isinstance(loop, asyncio.AbstractEventLoop)
+        try: return _instances[loop]
+        except KeyError: pass
+        _instance = _Class(loop = loop)
+        _instances[loop] = _instance
+        return _instance
+
+    class _Result(object):
+        Class = _Class
+        get = _get
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    get = _private.get
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
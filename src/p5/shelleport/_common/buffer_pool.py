@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import typing
+    import collections
+
+    from . import metrics as _metrics_module
+
+    _metrics = _metrics_module.shared
+    _min_size = 16 * 1024
+    _default_capacity = 64 * 1024 * 1024
+    _scan_limit = 4
+
+    _idle_metric = _metrics.gauge(name = "buffer_pool_idle_bytes", help = "pooled read buffers waiting for reuse")
+    _acquired_metric = _metrics.counter(
+        name = "buffer_pool_acquired_total", help = "read buffers handed out by the pool", labels = ("outcome", )
+    )
+
+    def _size_class(size: int):
+        assert isinstance(size, int)
+        assert 0 < size
+        return max(_min_size, 1 << (size - 1).bit_length())
+
+    def _shared(value: bytearray):
+        try: _byte = value.pop()
+        except BufferError: return True
+        value.append(_byte)
+        return False
+
+    class _Class(object):
+        @property
+        def capacity(self): return self.__capacity
+
+        @property
+        def idle(self): return self.__idle
+
+        def acquire(self, size: int):
+            _size = _size_class(size = size)
+            _buffers = self.__buffers.get(_size)
+            if _buffers:
+                for _ in range(min(_scan_limit, len(_buffers))):
+                    _buffer = _buffers.popleft()
+                    if _shared(value = _buffer):
+                        _buffers.append(_buffer)
+                        continue
+                    self.__idle -= _size
+                    _idle_metric.dec(_size)
+                    _acquired_metric.labels(outcome = "reused").inc()
+                    return _buffer
+            _acquired_metric.labels(outcome = "allocated").inc()
+            return bytearray(_size)
+
+        def release(self, buffer: typing.Union[bytearray, memoryview]):
+            if isinstance(buffer, memoryview): buffer = buffer.obj
+            assert isinstance(buffer, bytearray)
+            _size = len(buffer)
+            if (_size != _size_class(size = _size)) or (self.__capacity < self.__idle + _size): return
+            self.__buffers[_size].append(buffer)
+            self.__idle += _size
+            _idle_metric.inc(_size)
+
+        @staticmethod
+        def view(buffer: bytearray, size: int):
+            assert isinstance(buffer, bytearray)
+            assert isinstance(size, int)
+            assert 0 < size <= len(buffer)
+            with memoryview(buffer) as _view: return _view[:size].toreadonly()
+
+        def __init__(self, capacity: int = None):
+            super().__init__()
+            if capacity is None: capacity = _default_capacity
+            assert isinstance(capacity, int)
+            assert 0 <= capacity
+            self.__capacity = capacity
+            self.__idle = 0
+            self.__buffers = collections.defaultdict(collections.deque)
+
+    _shared_pool = _Class()
+
+    class _Result(object):
+        Class = _Class
+        shared = _shared_pool
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    shared = _private.shared
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    _default_minimum = 16 * 1024
+    _default_initial = 64 * 1024
+    _default_maximum = 8 * 1024 * 1024
+    _shrink_ratio = 4
+    _shrink_after = 4
+
+    class _Class(object):
+        @property
+        def size(self): return self.__size
+
+        @property
+        def minimum(self): return self.__minimum
+
+        @property
+        def maximum(self): return self.__maximum
+
+        def limit(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            return min(size, self.__size)
+
+        def observe(self, requested: int, received: int):
+            assert isinstance(requested, int)
+            assert isinstance(received, int)
+            assert 0 <= received <= requested
+            if requested < self.__size:
+                self.__short = 0
+                return
+            if requested <= received:
+                self.__short = 0
+                self.__size = min(self.__maximum, 2 * self.__size)
+                return
+            if _shrink_ratio * received > requested:
+                self.__short = 0
+                return
+            self.__short += 1
+            if _shrink_after > self.__short: return
+            self.__short = 0
+            self.__size = max(self.__minimum, self.__size // 2)
+
+        def __init__(self, minimum: int = None, initial: int = None, maximum: int = None):
+            super().__init__()
+            if minimum is None: minimum = _default_minimum
+            if maximum is None: maximum = _default_maximum
+            assert isinstance(minimum, int)
+            assert isinstance(maximum, int)
+            assert 0 < minimum
+            maximum = max(minimum, maximum)
+            if initial is None: initial = _default_initial
+            assert isinstance(initial, int)
+            self.__minimum = minimum
+            self.__maximum = maximum
+            self.__size = min(maximum, max(minimum, initial))
+            self.__short = 0
+
+    class _Result(object):
+        Class = _Class
+
+    return _Result
+
+
+_private = _private()
+try: Class = _private.Class
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
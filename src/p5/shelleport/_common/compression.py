@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import bz2
+    import lzma
+    import time
+    import zlib
+    import typing
+
+    _min_size = 512
+    _min_gain = +9.0e-1
+    _probe_size = 16 * 1024
+    _max_backoff = 64
+    _smoothing = +2.5e-1
+
+    class _Codec(object):
+        def __init__(
+            self, compress: typing.Callable[[bytes, int], bytes], decompressor: typing.Callable[[], typing.Any],
+            levels: typing.Tuple[int, int], initial: int
+        ):
+            super().__init__()
+            assert callable(compress)
+            assert callable(decompressor)
+            _minimum, _maximum = levels
+            assert _minimum <= initial <= _maximum
+            self.compress = compress
+            self.decompressor = decompressor
+            self.levels = levels
+            self.initial = initial
+
+    _codecs = {
+        "zlib": _Codec(
+            compress = lambda data, level: zlib.compress(data, level),
+            decompressor = zlib.decompressobj, levels = (1, 9), initial = 6
+        ),
+        "lzma": _Codec(
+            compress = lambda data, level: lzma.compress(data, preset = level),
+            decompressor = lzma.LZMADecompressor, levels = (0, 6), initial = 1
+        ),
+        "bz2": _Codec(
+            compress = lambda data, level: bz2.compress(data, compresslevel = level),
+            decompressor = bz2.BZ2Decompressor, levels = (1, 9), initial = 9
+        )
+    }
+
+    def _validate_codec(value: str):
+        assert isinstance(value, str)
+        assert value in _codecs, f"unsupported compression: {value}"
+        return value
+
+    def _decompress(codec: str, data: typing.Union[bytes, memoryview], limit: int):
+        assert isinstance(data, (bytes, memoryview))
+        assert data
+        assert isinstance(limit, int)
+        assert 0 < limit
+        _decompressor = _codecs[_validate_codec(value = codec)].decompressor()
+        _data = _decompressor.decompress(data, limit)
+        assert _decompressor.eof, "truncated or oversized compressed blob"
+        assert not _decompressor.unused_data, "trailing data after compressed blob"
+        assert _data, "empty compressed blob"
+        return _data
+
+    def _incompressible(data: bytes):
+        if 4 * _probe_size > len(data): return False
+        return _min_gain * _probe_size < len(zlib.compress(data[:_probe_size], 1))
+
+    class _Channel(object):
+        @property
+        def codec(self): return self.__codec
+
+        @property
+        def level(self): return self.__level
+
+        def statistics(self): return {
+            "codec": self.__codec,
+            "level": self.__level,
+            "input": self.__input,
+            "output": self.__output,
+            "skipped": self.__skipped
+        }
+
+        def prepare(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            self.__elapsed = None
+            if _min_size > size: return False
+            if 0 < self.__skip:
+                self.__skip -= 1
+                self.__skipped += size
+                return False
+            return True
+
+        def __call__(self, data: typing.Union[bytes, memoryview]):
+            assert isinstance(data, (bytes, memoryview))
+            _time = time.monotonic()
+            _result = None
+            if not _incompressible(data = data):
+                _result = _codecs[self.__codec].compress(data, self.__level)
+                if _min_gain * len(data) < len(_result): _result = None
+            self.__elapsed = time.monotonic() - _time
+            if _result is None:
+                self.__skip = self.__backoff
+                self.__backoff = min(_max_backoff, 2 * self.__backoff)
+                self.__skipped += len(data)
+                return None
+            self.__backoff = 1
+            self.__input += len(data)
+            self.__output += len(_result)
+            return _result
+
+        def account(self, seconds: float):
+            assert isinstance(seconds, float)
+            _elapsed = self.__elapsed
+            if _elapsed is None: return
+            self.__elapsed = None
+            if self.__compress_time is None: self.__compress_time, self.__write_time = _elapsed, seconds
+            else:
+                self.__compress_time += _smoothing * (_elapsed - self.__compress_time)
+                self.__write_time += _smoothing * (seconds - self.__write_time)
+            _minimum, _maximum = _codecs[self.__codec].levels
+            if self.__write_time > 2 * self.__compress_time: self.__level = min(_maximum, 1 + self.__level)
+            elif self.__compress_time > self.__write_time: self.__level = max(_minimum, self.__level - 1)
+
+        def __init__(self, codec: str):
+            super().__init__()
+            self.__codec = _validate_codec(value = codec)
+            self.__level = _codecs[codec].initial
+            self.__skip = 0
+            self.__backoff = 1
+            self.__elapsed = None
+            self.__compress_time = None
+            self.__write_time = None
+            self.__input = 0
+            self.__output = 0
+            self.__skipped = 0
+
+    class _Result(object):
+        codecs = tuple(_codecs.keys())
+        Channel = _Channel
+        decompress = _decompress
+        validate_codec = _validate_codec
+
+    return _Result
+
+
+_private = _private()
+try:
+    codecs = _private.codecs
+    Channel = _private.Channel
+    decompress = _private.decompress
+    validate_codec = _private.validate_codec
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make_channel(*args, **kwargs): return Channel(*args, **kwargs)
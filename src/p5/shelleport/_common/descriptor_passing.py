@@ -0,0 +1,78 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import socket
+    import typing
+    import asyncio
+
+    _marker = b"\x00"
+    _timeout = +1.0e+1
+
+    def _close_all(descriptors: typing.Iterable[int]):
+        _exception = None
+        for _descriptor in descriptors:
+            try: os.close(_descriptor)
+            except OSError as _error: _exception = _error
+        if _exception is not None: raise _exception
+
+    def _send(descriptor: int, descriptors: typing.Iterable[int]):
+        assert isinstance(descriptor, int)
+        descriptors = tuple(descriptors)
+        for _descriptor in descriptors: assert isinstance(_descriptor, int)
+        assert descriptors
+        with socket.socket(fileno = os.dup(descriptor)) as _socket:
+            assert socket.AF_UNIX == _socket.family, "descriptor passing requires a unix socket"
+            assert len(_marker) == socket.send_fds(_socket, (_marker, ), descriptors)
+
+    def _try_receive(connection: socket.socket, count: int):
+        try: _data, _descriptors, _flags, _address = socket.recv_fds(connection, len(_marker), count)
+        except BlockingIOError: return None
+        try:
+            if not _data: raise ConnectionResetError("unexpected end of stream")
+            assert _marker == _data, "descriptor marker expected"
+            assert 0 == (_flags & getattr(socket, "MSG_CTRUNC", 0)), "descriptors truncated"
+            assert count == len(_descriptors), f"{count} descriptors expected"
+        except BaseException:
+            _close_all(descriptors = _descriptors)
+            raise
+        return tuple(_descriptors)
+
+    async def _receive(descriptor: int, count: int):
+        assert isinstance(descriptor, int)
+        assert isinstance(count, int)
+        assert 0 < count
+        _loop = asyncio.get_running_loop()
+        _event = asyncio.Event()
+        with socket.socket(fileno = os.dup(descriptor)) as _socket:
+            assert socket.AF_UNIX == _socket.family, "descriptor passing requires a unix socket"
+
+            async def _coroutine():
+                while True:
+                    _result = _try_receive(connection = _socket, count = count)
+                    if _result is not None: return _result
+                    _event.clear()
+                    await _event.wait()
+
+            _loop.add_reader(_socket.fileno(), _event.set)
+            try: return await asyncio.wait_for(_coroutine(), timeout = _timeout)
+            finally: _loop.remove_reader(_socket.fileno())
+
+    class _Result(object):
+        send = _send
+        receive = _receive
+        close_all = _close_all
+
+    return _Result
+
+
+_private = _private()
+try:
+    send = _private.send
+    receive = _private.receive
+    close_all = _private.close_all
+finally: del _private
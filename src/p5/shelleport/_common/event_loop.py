@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import sys
+    import typing
+    import importlib
+
+    _environment_key = "SHELLEPORT_LOOP"
+    _implementations = ("asyncio", "uvloop", "auto")
+    _modules = {"uvloop": "uvloop"}
+
+    def _import(name: str):
+        try: return importlib.import_module(_modules[name])
+        except ImportError: return None
+
+    def _resolve(value: typing.Optional[str] = None):
+        if value is None: value = os.environ.get(_environment_key) or "asyncio"
+        assert value in _implementations, f"unsupported event loop: {value}"
+        if "asyncio" == value: return value
+        if "auto" != value:
+            if _import(name = value) is not None: return value
+            print(f"event loop `{value}` is not available, falling back to asyncio", file = sys.stderr, flush = True)
+            return "asyncio"
+        for _name in _modules.keys():
+            if _import(name = _name) is not None: return _name
+        return "asyncio"
+
+    def _run(coroutine: typing.Coroutine, loop: typing.Optional[str] = None):
+        import asyncio
+
+        try: loop = _resolve(value = loop)
+        except BaseException:
+            coroutine.close()
+            raise
+        if "asyncio" == loop: return asyncio.run(coroutine)
+        _module = _import(name = loop)
+        assert _module is not None
+        if hasattr(asyncio, "Runner"):
+            with asyncio.Runner(loop_factory = _module.new_event_loop) as _runner: return _runner.run(coroutine)
+        asyncio.set_event_loop_policy(_module.EventLoopPolicy())
+        return asyncio.run(coroutine)
+
+    class _Result(object):
+        run = _run
+        resolve = _resolve
+        environment_key = _environment_key
+        implementations = _implementations
+
+    return _Result
+
+
+_private = _private()
+try:
+    run = _private.run
+    resolve = _private.resolve
+    environment_key = _private.environment_key
+    implementations = _private.implementations
+finally: del _private
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import asyncio
+
+    from . import protocol_options as _protocol_options_module
+
+    _default_window = _protocol_options_module.default_window
+    _validate_window = _protocol_options_module.validate_window
+    _update_ratio = 4
+
+    class _Credit(object):
+        @property
+        def window(self): return self.__window
+
+        @property
+        def available(self): return self.__available
+
+        def grant(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            self.__available += size
+            assert self.__window >= self.__available, "flow control credit exceeds window"
+            if 0 < self.__available: self.__event.set()
+
+        async def acquire(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            while 0 >= self.__available:
+                self.__event.clear()
+                await self.__event.wait()
+            self.__available -= size
+
+        def __init__(self, window: int):
+            super().__init__()
+            self.__window = _validate_window(value = window)
+            self.__available = window
+            self.__event = asyncio.Event()
+
+    class _Window(object):
+        @property
+        def size(self): return self.__size
+
+        @property
+        def outstanding(self): return self.__outstanding
+
+        def receive(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            assert self.__size > self.__outstanding, "flow control window exceeded"
+            self.__outstanding += size
+
+        def release(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            self.__pending += size
+            assert self.__outstanding >= self.__pending
+            if self.__threshold > self.__pending: return 0
+            _credit = self.__pending
+            self.__pending = 0
+            self.__outstanding -= _credit
+            return _credit
+
+        def __init__(self, size: int):
+            super().__init__()
+            self.__size = _validate_window(value = size)
+            self.__threshold = max(1, size // _update_ratio)
+            self.__pending = 0
+            self.__outstanding = 0
+
+    class _Result(object):
+        Credit = _Credit
+        Window = _Window
+        default_window = _default_window
+        validate_window = _validate_window
+
+    return _Result
+
+
+_private = _private()
+try:
+    Credit = _private.Credit
+    Window = _private.Window
+    default_window = _private.default_window
+    validate_window = _private.validate_window
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make_credit(*args, **kwargs): return Credit(*args, **kwargs)
+
+
+# noinspection PyArgumentList
+def make_window(*args, **kwargs): return Window(*args, **kwargs)
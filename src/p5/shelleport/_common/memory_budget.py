@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import time
+    import typing
+    import asyncio
+
+    from . import metrics as _metrics_module
+
+    _metrics = _metrics_module.shared
+    _min_limit = 64 * 1024
+    _chunk_ratio = 4
+
+    _buffered_metric = _metrics.gauge(
+        name = "session_buffered_bytes", help = "data buffered by sessions (reserved reads, queued output and input)"
+    )
+    _stall_metric = _metrics.counter(
+        name = "session_memory_stall_seconds_total", help = "time session reads waited for the memory budget"
+    )
+
+    def _validate_limit(value: int):
+        assert isinstance(value, int)
+        assert _min_limit <= value, f"memory budget is too small: {value}"
+        return value
+
+    class _Class(object):
+        @property
+        def limit(self): return self.__limit
+
+        @property
+        def used(self): return self.__used
+
+        @property
+        def closed(self): return not self.__state
+
+        @property
+        def chunk(self):
+            if self.__limit is None: return None
+            return self.__limit // _chunk_ratio
+
+        def charge(self, size: int):
+            assert isinstance(size, int)
+            assert 0 <= size
+            assert self.__state, "budget closed"
+            self.__used += size
+            _buffered_metric.inc(size)
+
+        def release(self, size: int, acquired: bool = False):
+            assert isinstance(size, int)
+            assert isinstance(acquired, bool)
+            assert 0 <= size
+            if (0 == size) or not self.__state: return
+            assert self.__used >= size
+            if acquired:
+                assert self.__acquired >= size
+                self.__acquired -= size
+            self.__used -= size
+            _buffered_metric.dec(size)
+            self.__event.set()
+
+        async def acquire(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            if self.__limit is not None:
+                _time = None
+                while (0 < self.__acquired) and (self.__limit < self.__used + size):
+                    if _time is None: _time = time.monotonic()
+                    self.__event.clear()
+                    await self.__event.wait()
+                if _time is not None: _stall_metric.inc(time.monotonic() - _time)
+            self.charge(size = size)
+
+        def retain(self, size: int):
+            assert isinstance(size, int)
+            assert 0 <= size
+            if not self.__state: return
+            assert self.__used >= self.__acquired + size
+            self.__acquired += size
+
+        def close(self):
+            if not self.__state: return
+            self.__state = False
+            _buffered_metric.dec(self.__used)
+            self.__used = 0
+            self.__acquired = 0
+            self.__event.set()
+
+        def __enter__(self): return self
+
+        def __exit__(self, exception_type, exception_instance, exception_traceback): self.close()
+
+        def __init__(self, limit: typing.Optional[int] = None):
+            super().__init__()
+            if limit is not None: limit = _validate_limit(value = limit)
+            self.__limit = limit
+            self.__used = 0
+            self.__acquired = 0
+            self.__state = True
+            self.__event = asyncio.Event()
+
+    class _Result(object):
+        Class = _Class
+        validate_limit = _validate_limit
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    validate_limit = _private.validate_limit
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
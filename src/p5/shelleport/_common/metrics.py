@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import math
+    import typing
+    import threading
+
+    _prefix = "shelleport_"
+    _kinds = ("counter", "gauge", "histogram")
+    _latency_buckets = (
+        +5.0e-4, +1.0e-3, +2.5e-3, +5.0e-3, +1.0e-2, +2.5e-2, +5.0e-2, +1.0e-1, +2.5e-1, +5.0e-1, +1.0e+0, +2.5e+0
+    )
+    _duration_buckets = (
+        +1.0e-2, +1.0e-1, +5.0e-1, +1.0e+0, +5.0e+0, +1.5e+1, +6.0e+1, +3.0e+2, +9.0e+2, +3.6e+3, +1.44e+4
+    )
+    _sample_type_hint = typing.Tuple[typing.Dict[str, str], float]
+    _collector_type_hint = typing.Callable[[], typing.Iterable[typing.Tuple[str, str, str, typing.Iterable[_sample_type_hint]]]]
+
+    def _escape(value: str): return value.replace("\\", "\\\\").replace("\n", "\\n").replace("\"", "\\\"")
+
+    def _format_labels(labels: typing.Dict[str, str]):
+        if not labels: return ""
+        return "{" + ",".join(f"{_key}=\"{_escape(value = str(_value))}\"" for _key, _value in labels.items()) + "}"
+
+    def _format_value(value: float):
+        if math.isinf(value): return "+Inf" if 0 < value else "-Inf"
+        if isinstance(value, int): return str(value)
+        return repr(float(value))
+
+    def _format_header(name: str, kind: str, help: str):
+        yield f"# HELP {name} {_escape(value = help)}"
+        yield f"# TYPE {name} {kind}"
+
+    class _Value(object):
+        @property
+        def value(self): return self.__value
+
+        def inc(self, amount: float = 1):
+            with self.__lock: self.__value += amount
+
+        def dec(self, amount: float = 1):
+            with self.__lock: self.__value -= amount
+
+        def set(self, value: float):
+            with self.__lock: self.__value = value
+
+        def __init__(self, lock: threading.Lock):
+            super().__init__()
+            self.__lock = lock
+            self.__value = 0
+
+    class _Histogram(object):
+        def observe(self, value: float):
+            with self.__lock:
+                for _index, _bound in enumerate(self.__buckets):
+                    if value <= _bound:
+                        self.__counts[_index] += 1
+                        break
+                self.__sum += value
+                self.__count += 1
+
+        def generate_samples(self, name: str, labels: typing.Dict[str, str]):
+            with self.__lock: _counts, _sum, _count = tuple(self.__counts), self.__sum, self.__count
+            _cumulative = 0
+            for _bound, _value in zip(self.__buckets, _counts):
+                _cumulative += _value
+                yield f"{name}_bucket{_format_labels(labels = {**labels, 'le': _format_value(value = _bound)})} {_cumulative}"
+            yield f"{name}_bucket{_format_labels(labels = {**labels, 'le': '+Inf'})} {_count}"
+            yield f"{name}_sum{_format_labels(labels = labels)} {_format_value(value = _sum)}"
+            yield f"{name}_count{_format_labels(labels = labels)} {_count}"
+
+        def __init__(self, lock: threading.Lock, buckets: typing.Tuple[float, ...]):
+            super().__init__()
+            self.__lock = lock
+            self.__buckets = buckets
+            self.__counts = [0] * len(buckets)
+            self.__sum = 0.0
+            self.__count = 0
+
+    class _Family(object):
+        @property
+        def name(self): return self.__name
+
+        @property
+        def kind(self): return self.__kind
+
+        @property
+        def labels_names(self): return self.__labels
+
+        def labels(self, **labels):
+            assert labels.keys() == set(self.__labels), f"labels expected: {self.__labels}"
+            _key = tuple(str(labels[_name]) for _name in self.__labels)
+            with self.__lock:
+                _child = self.__children.get(_key)
+                if _child is None:
+                    if "histogram" == self.__kind: _child = _Histogram(lock = threading.Lock(), buckets = self.__buckets)
+                    else: _child = _Value(lock = threading.Lock())
+                    self.__children[_key] = _child
+            return _child
+
+        def inc(self, amount: float = 1): self.labels().inc(amount = amount)
+
+        def dec(self, amount: float = 1): self.labels().dec(amount = amount)
+
+        def set(self, value: float): self.labels().set(value = value)
+
+        def observe(self, value: float): self.labels().observe(value = value)
+
+        def generate_lines(self):
+            with self.__lock: _children = tuple(self.__children.items())
+            yield from _format_header(name = self.__name, kind = self.__kind, help = self.__help)
+            for _key, _child in _children:
+                _labels = dict(zip(self.__labels, _key))
+                if "histogram" == self.__kind: yield from _child.generate_samples(name = self.__name, labels = _labels)
+                else: yield f"{self.__name}{_format_labels(labels = _labels)} {_format_value(value = _child.value)}"
+
+        def __init__(
+            self, name: str, kind: str, help: str, labels: typing.Tuple[str, ...], buckets: typing.Tuple[float, ...]
+        ):
+            super().__init__()
+            self.__name = name
+            self.__kind = kind
+            self.__help = help
+            self.__labels = labels
+            self.__buckets = buckets
+            self.__lock = threading.Lock()
+            self.__children = dict()
+
+    class _Class(object):
+        @property
+        def prefix(self): return _prefix
+
+        def counter(self, name: str, help: str, labels: typing.Iterable[str] = tuple()):
+            return self.__family(name = name, kind = "counter", help = help, labels = labels)
+
+        def gauge(self, name: str, help: str, labels: typing.Iterable[str] = tuple()):
+            return self.__family(name = name, kind = "gauge", help = help, labels = labels)
+
+        def histogram(
+            self, name: str, help: str, labels: typing.Iterable[str] = tuple(),
+            buckets: typing.Iterable[float] = _latency_buckets
+        ): return self.__family(name = name, kind = "histogram", help = help, labels = labels, buckets = buckets)
+
+        def collector(self, delegate: _collector_type_hint):
+            assert callable(delegate)
+            with self.__lock: self.__collectors.append(delegate)
+            return lambda: self.__remove_collector(delegate = delegate)
+
+        def render(self):
+            with self.__lock: _families, _collectors = tuple(self.__families.values()), tuple(self.__collectors)
+            _lines = list()
+            for _family in _families: _lines.extend(_family.generate_lines())
+            for _collector in _collectors:
+                for _name, _kind, _help, _samples in _collector():
+                    assert _kind in _kinds
+                    _name = f"{_prefix}{_name}"
+                    _lines.extend(_format_header(name = _name, kind = _kind, help = _help))
+                    for _labels, _value in _samples: _lines.append(
+                        f"{_name}{_format_labels(labels = _labels)} {_format_value(value = _value)}"
+                    )
+            _lines.append("")
+            return "\n".join(_lines)
+
+        def __init__(self):
+            super().__init__()
+            self.__lock = threading.Lock()
+            self.__families = dict()
+            self.__collectors = list()
+
+        def __family(
+            self, name: str, kind: str, help: str, labels: typing.Iterable[str], buckets: typing.Iterable[float] = None
+        ):
+            assert isinstance(name, str)
+            assert name
+            assert kind in _kinds
+            assert isinstance(help, str)
+            labels = tuple(labels)
+            for _label in labels: assert isinstance(_label, str) and _label and ("le" != _label)
+            if buckets is not None:
+                buckets = tuple(sorted(float(_bound) for _bound in buckets))
+                assert buckets
+            name = f"{_prefix}{name}"
+            with self.__lock:
+                _family = self.__families.get(name)
+                if _family is None:
+                    _family = _Family(name = name, kind = kind, help = help, labels = labels, buckets = buckets)
+                    self.__families[name] = _family
+                else: assert (kind, labels) == (_family.kind, _family.labels_names), f"metric redefined: {name}"
+            return _family
+
+        def __remove_collector(self, delegate: _collector_type_hint):
+            with self.__lock: self.__collectors.remove(delegate)
+
+    _shared = _Class()
+
+    class _Result(object):
+        Class = _Class
+        shared = _shared
+        latency_buckets = _latency_buckets
+        duration_buckets = _duration_buckets
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    shared = _private.shared
+    latency_buckets = _private.latency_buckets
+    duration_buckets = _private.duration_buckets
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
@@ -7,7 +7,11 @@ if "__main__" != __name__:
         import importlib
 
         _this_module = sys.modules[__name__]
-        def _routine(*args, **kwargs): return importlib.import_module(*args, **kwargs)
+
+        def _routine(name: str, package: str = None):
+            if (package is not None) or name.startswith("."): return importlib.import_module(name, package)
+            __import__(name)
+            return sys.modules[name]
 
         class _Callable(_this_module.__class__):
             def __call__(self, *args, **kwargs): return _routine(*args, **kwargs)
@@ -5,11 +5,31 @@ if "__main__" != __name__:
     def _private():
         def _make_base():
             import sys
+            import types
             import typing
-            import inspect
 
             from . import import_module as _import_module
 
+            _var_positional_flag = 0x04
+            _var_keyword_flag = 0x08
+
+            def _describe_parameters(value: typing.Callable):
+                if not isinstance(value, types.FunctionType):
+                    import inspect
+                    return tuple(
+                        (_parameter.name, _parameter.kind.name.lower())
+                        for _parameter in inspect.signature(value).parameters.values()
+                    )
+                _code = value.__code__
+                _names = _code.co_varnames
+                _count = _code.co_argcount + _code.co_kwonlyargcount
+                _result = [(_name, "positional_or_keyword") for _name in _names[:_count]]
+                if _code.co_flags & _var_positional_flag:
+                    _result.insert(_code.co_argcount, (_names[_count], "var_positional"))
+                    _count += 1
+                if _code.co_flags & _var_keyword_flag: _result.append((_names[_count], "var_keyword"))
+                return tuple(_result)
+
             class _Types(object):
                 Factory = typing.Callable
                 ModuleName = str
@@ -34,15 +54,13 @@ if "__main__" != __name__:
                     if key is None:
                         if value is None: return None
                     else: assert isinstance(key, str) and bool(key) and (1 == len(key.split(".")))
-                    _parameters = inspect.signature(value).parameters
+                    _parameters = _describe_parameters(value = value)
                     _parameters_count = len(_parameters)
                     if 1 > _parameters_count: return lambda module, name: value()
                     if 2 > _parameters_count:
-                        _parameter = next(iter(_parameters.values()))
-                        if _parameter.VAR_KEYWORD == _parameter.kind:
-                            return lambda module, name: value(module = module, name = name)
-                        if _parameter.VAR_POSITIONAL == _parameter.kind: return lambda module, name: value(name)
-                        _parameter = _parameter.name
+                        (_parameter, _kind), = _parameters
+                        if "var_keyword" == _kind: return lambda module, name: value(module = module, name = name)
+                        if "var_positional" == _kind: return lambda module, name: value(name)
                         if "name" == _parameter: return lambda module, name: value(name = name)
                         if "module" == _parameter: return lambda module, name: value(module = module)
                         return lambda module, name: value()
@@ -113,10 +131,8 @@ if "__main__" != __name__:
             def _make_module_name():
                 try: return kwargs["module_name"]
                 except KeyError: pass
-                import inspect
-                _frame = inspect.stack()[2]
-                _module = inspect.getmodule(_frame[0])
-                return _module.__name__
+                import sys
+                return sys._getframe(2).f_globals["__name__"]
 
             # noinspection PyShadowingNames
             class _Result(Base):
@@ -127,10 +143,8 @@ if "__main__" != __name__:
 
         def _make_getter(**kwargs):
             if not ("module_name" in kwargs):
-                import inspect
-                _frame = inspect.stack()[2]
-                _module = inspect.getmodule(_frame[0])
-                kwargs["module_name"] = _module.__name__
+                import sys
+                kwargs["module_name"] = sys._getframe(2).f_globals["__name__"]
 
             _class = _make_class(**kwargs)
             _class.get.keys = _class.dictionary.keys() if isinstance(_class.dictionary, dict) else tuple()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import typing
+    import asyncio
+    import contextlib
+    import collections
+
+    from . import protocol as _protocol_module
+
+    _protocol = _protocol_module.make()
+    _finished_message = {"finished": True}
+
+    class _Queue(object):
+        async def push(self, message: dict):
+            assert isinstance(message, dict)
+            async with self.__condition:
+                if self.__state is not None: return
+                self.__items.append(message)
+                self.__condition.notify_all()
+
+        async def pop(self):
+            async with self.__condition:
+                while not self.__items:
+                    if self.__state is False: raise StopAsyncIteration()
+                    if isinstance(self.__state, BaseException): raise self.__state
+                    await self.__condition.wait()
+                return self.__items.popleft()
+
+        async def finish(self, exception: BaseException = None):
+            assert (exception is None) or isinstance(exception, BaseException)
+            async with self.__condition:
+                if self.__state is None: self.__state = False if exception is None else exception
+                self.__condition.notify_all()
+
+        async def close(self):
+            async with self.__condition:
+                self.__items.clear()
+                self.__state = False
+                self.__condition.notify_all()
+
+        def __init__(self):
+            super().__init__()
+            self.__state = None
+            self.__items = collections.deque()
+            self.__condition = asyncio.Condition()
+
+    class _Session(object):
+        @property
+        def identifier(self): return self.__identifier
+
+        async def write(self, message: dict):
+            assert isinstance(message, dict)
+            assert message
+            assert "session" not in message
+            await self.__writer({**message, "session": self.__identifier})
+
+        def __aiter__(self): return self
+
+        async def __anext__(self): return await self.__queue.pop()
+
+        def __init__(self, identifier: int, queue: _Queue, writer: typing.Callable[[dict], typing.Awaitable]):
+            super().__init__()
+            assert isinstance(identifier, int)
+            assert isinstance(queue, _Queue)
+            assert callable(writer)
+            self.__queue = queue
+            self.__writer = writer
+            self.__identifier = identifier
+
+    class _Class(object):
+        @property
+        def sessions(self): return tuple(self.__sessions.keys())
+
+        @contextlib.asynccontextmanager
+        async def open(self):
+            assert self.__acceptor is None, "sessions are opened by the peer"
+            assert self.__task is not None
+            assert not self.__task.done(), "connection closed"
+            assert _protocol.max_session > self.__last
+            self.__last += 1
+            _identifier = self.__last
+            _queue = _Queue()
+            self.__sessions[_identifier] = _queue
+            try: yield _Session(identifier = _identifier, queue = _queue, writer = self.__writer)
+            finally:
+                await _queue.close()
+                if self.__sessions.pop(_identifier, None) is not None: await self.__send_finished(identifier = _identifier)
+
+        async def wait(self):
+            assert self.__task is not None
+            await asyncio.wait((self.__task, ))
+
+        async def __aenter__(self):
+            assert self.__task is None
+            self.__task = asyncio.create_task(self.__dispatch())
+            return self
+
+        async def __aexit__(self, exception_type, exception_instance, exception_traceback):
+            self.__task.cancel()
+            await asyncio.gather(self.__task, return_exceptions = True)
+            _tasks = tuple(self.__tasks.values())
+            for _task in _tasks: _task.cancel()
+            await asyncio.gather(*_tasks, return_exceptions = True)
+            if (exception_instance is None) and (not self.__task.cancelled()):
+                _exception = self.__task.exception()
+                if _exception is not None: raise _exception
+
+        def __init__(
+            self,
+            reader: typing.AsyncIterator[dict],
+            writer: typing.Callable[[dict], typing.Awaitable],
+            acceptor: typing.Callable[[_Session], typing.Awaitable] = None
+        ):
+            super().__init__()
+            assert callable(writer)
+            if acceptor is not None: assert callable(acceptor)
+            self.__last = 0
+            self.__task = None
+            self.__tasks = dict()
+            self.__reader = reader
+            self.__writer = writer
+            self.__sessions = dict()
+            self.__acceptor = acceptor
+
+        async def __send_finished(self, identifier: int):
+            try: await self.__writer({**_finished_message, "session": identifier})
+            except (BrokenPipeError, ConnectionResetError): pass
+
+        async def __serve(self, identifier: int, queue: _Queue):
+            try: await self.__acceptor(_Session(identifier = identifier, queue = queue, writer = self.__writer))
+            finally:
+                await queue.close()
+                if self.__sessions.pop(identifier, None) is not None: await self.__send_finished(identifier = identifier)
+
+        def __accept(self, identifier: int):
+            assert self.__acceptor is not None, "unexpected session"
+            assert self.__last < identifier, "session identifier reused"
+            self.__last = identifier
+            _queue = _Queue()
+            self.__sessions[identifier] = _queue
+            _task = asyncio.create_task(self.__serve(identifier = identifier, queue = _queue))
+            self.__tasks[identifier] = _task
+            _task.add_done_callback(lambda _: self.__tasks.pop(identifier, None))
+            return _queue
+
+        async def __dispatch(self):
+            try:
+                async for _message in self.__reader:
+                    assert isinstance(_message, dict)
+                    _identifier = _message.pop("session")
+                    assert isinstance(_identifier, int)
+                    assert 0 < _identifier
+                    _queue = self.__sessions.get(_identifier)
+                    if _finished_message == _message:
+                        if _queue is None: continue
+                        del self.__sessions[_identifier]
+                        await _queue.finish()
+                        _task = self.__tasks.get(_identifier)
+                        if _task is not None: _task.cancel()
+                        continue
+                    if _queue is None:
+                        if (self.__acceptor is None) or (self.__last >= _identifier): continue
+                        _queue = self.__accept(identifier = _identifier)
+                    await _queue.push(message = _message)
+            finally:
+                for _queue in tuple(self.__sessions.values()): await _queue.finish(
+                    exception = ConnectionResetError("multiplexed connection closed")
+                )
+
+    class _Result(object):
+        Class = _Class
+        Session = _Session
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    Session = _private.Session
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import stat
+    import fcntl
+    import select
+    import struct
+    import typing
+    import asyncio
+    import termios
+
+    from . import protocol as _protocol_module
+    from . import asynchronous_tools as _asynchronous_tools_module
+
+    _protocol = _protocol_module.make()
+    _executors = _asynchronous_tools_module.executor_registry.shared
+
+    _kinds = _protocol.binary_kinds
+    _channels = _protocol.binary_channels
+    _header_size = _protocol.binary_header_size
+    _chunk_size = _protocol.ideal_chunk_size
+    _copy_size = 256 * 1024
+    _available = struct.Struct("i")
+    _splice = getattr(os, "splice", None)
+    _splice_flags = getattr(os, "SPLICE_F_MOVE", 0) | getattr(os, "SPLICE_F_MORE", 0)
+    _nonblocking_splice_flags = _splice_flags | getattr(os, "SPLICE_F_NONBLOCK", 0)
+
+    class _Cancelled(Exception): pass
+
+    def _poll(descriptors: typing.Dict[int, int], cancel: int):
+        _poller = select.poll()
+        for _descriptor, _events in descriptors.items(): _poller.register(_descriptor, _events)
+        _poller.register(cancel, select.POLLIN)
+        _result = _poller.poll()
+        for _descriptor, _events in _result:
+            if cancel == _descriptor: raise _Cancelled()
+        return _result
+
+    def _wait(descriptor: int, events: int, cancel: int): _poll(descriptors = {descriptor: events}, cancel = cancel)
+
+    def _count(descriptor: int):
+        return _available.unpack(fcntl.ioctl(descriptor, termios.FIONREAD, _available.pack(0)))[0]
+
+    def _write_all(destination: int, data: typing.Union[bytes, memoryview], cancel: int):
+        data = memoryview(data)
+        while data:
+            try: _size = os.write(destination, data)
+            except BlockingIOError:
+                _wait(descriptor = destination, events = select.POLLOUT, cancel = cancel)
+                continue
+            assert 0 < _size
+            data = data[_size:]
+
+    def _read_exact(source: int, size: int, cancel: int):
+        _chunks = list()
+        while 0 < size:
+            try: _chunk = os.read(source, size)
+            except BlockingIOError:
+                _wait(descriptor = source, events = select.POLLIN, cancel = cancel)
+                continue
+            if not _chunk: raise ConnectionResetError("unexpected end of raw stream")
+            _chunks.append(_chunk)
+            size -= len(_chunk)
+        return bytes().join(_chunks)
+
+    def _copy(source: int, destination: int, size: int, cancel: int):
+        while 0 < size:
+            _chunk = _read_exact(source = source, size = min(size, _copy_size), cancel = cancel)
+            _write_all(destination = destination, data = _chunk, cancel = cancel)
+            size -= len(_chunk)
+
+    def _splice_exact(source: int, destination: int, size: int, cancel: int):
+        while 0 < size:
+            try: _size = _splice(source, destination, size, flags = _splice_flags)
+            except BlockingIOError:
+                _wait(descriptor = source, events = select.POLLIN, cancel = cancel)
+                _wait(descriptor = destination, events = select.POLLOUT, cancel = cancel)
+                continue
+            if 0 == _size: raise ConnectionResetError("unexpected end of raw stream")
+            size -= _size
+
+    async def _wait_coroutine(descriptors: typing.Iterable[int], writable: bool = False):
+        _loop = asyncio.get_running_loop()
+        _future = _loop.create_future()
+        if writable: _add, _remove = _loop.add_writer, _loop.remove_writer
+        else: _add, _remove = _loop.add_reader, _loop.remove_reader
+
+        def _callback(descriptor: int):
+            if not _future.done(): _future.set_result(descriptor)
+
+        descriptors = tuple(descriptors)
+        try:
+            for _descriptor in descriptors: _add(_descriptor, _callback, _descriptor)
+            return await _future
+        finally:
+            for _descriptor in descriptors: _remove(_descriptor)
+
+    async def _write_coroutine(destination: int, data: typing.Union[bytes, memoryview]):
+        data = memoryview(data)
+        while data:
+            try: _size = os.write(destination, data)
+            except BlockingIOError:
+                await _wait_coroutine(descriptors = (destination, ), writable = True)
+                continue
+            assert 0 < _size
+            data = data[_size:]
+
+    async def _forward_coroutine(source: int, destination: int, size: int):
+        while 0 < size:
+            if _splice is None:
+                _chunk = os.read(source, min(size, _copy_size))
+                if _chunk: await _write_coroutine(destination = destination, data = _chunk)
+                _size = len(_chunk)
+            else:
+                try: _size = _splice(source, destination, size, flags = _nonblocking_splice_flags)
+                except BlockingIOError:
+                    await _wait_coroutine(descriptors = (destination, ), writable = True)
+                    continue
+            if 0 == _size: raise ConnectionResetError("unexpected end of raw stream")
+            size -= _size
+
+    class _Route(object):
+        def __call__(self, source: int, size: int, cancel: int):
+            if self.__mode is None: return _copy(source = source, destination = self.__descriptor, size = size, cancel = cancel)
+            if self.__mode is True: return _splice_exact(
+                source = source, destination = self.__descriptor, size = size, cancel = cancel
+            )
+            _reader, _writer = self.__mode
+            while 0 < size:
+                try: _size = _splice(source, _writer, size, flags = _splice_flags)
+                except BlockingIOError:
+                    _wait(descriptor = source, events = select.POLLIN, cancel = cancel)
+                    continue
+                if 0 == _size: raise ConnectionResetError("unexpected end of raw stream")
+                _splice_exact(source = _reader, destination = self.__descriptor, size = _size, cancel = cancel)
+                size -= _size
+
+        def close(self):
+            if not isinstance(self.__mode, tuple): return
+            for _descriptor in self.__mode: os.close(_descriptor)
+            self.__mode = None
+
+        def __init__(self, descriptor: int):
+            super().__init__()
+            self.__descriptor = descriptor
+            _mode = os.fstat(descriptor).st_mode
+            if _splice is None: self.__mode = None
+            elif stat.S_ISFIFO(_mode): self.__mode = True
+            elif (not stat.S_ISREG(_mode)) and (not stat.S_ISSOCK(_mode)): self.__mode = None
+            elif os.O_APPEND & fcntl.fcntl(descriptor, fcntl.F_GETFL): self.__mode = None
+            else: self.__mode = os.pipe()
+
+    def _receive(source: int, destinations: typing.Dict[str, int], cancel: int):
+        _routes = dict()
+        try:
+            for _channel, _descriptor in destinations.items(): _routes[_channel] = _Route(descriptor = _descriptor)
+            while True:
+                _header = _read_exact(source = source, size = _header_size, cancel = cancel)
+                _kind, _channel, _flags, _session, _size = _protocol.parse_binary_header(value = _header)
+                assert 0 == _flags, "compression is not allowed in raw passthrough"
+                assert 0 == _session
+                if _kinds.keep_alive == _kind: continue
+                if _kinds.json == _kind:
+                    assert 0 < _size <= _chunk_size
+                    return _protocol.parse_binary_message(value = _header + _read_exact(
+                        source = source, size = _size, cancel = cancel
+                    ))
+                assert _kinds.data == _kind, "unexpected raw frame"
+                assert 0 < _size <= _chunk_size
+                try: _route = _routes[_channels[_channel]]
+                except (IndexError, KeyError): raise ValueError(f"unexpected raw channel: {_channel}")
+                _route(source = source, size = _size, cancel = cancel)
+        finally:
+            for _route in _routes.values(): _route.close()
+
+    async def _run(delegate: typing.Callable, **kwargs):
+        _cancel_reader, _cancel_writer = os.pipe()
+        try:
+            _future = asyncio.ensure_future(_executors.get(name = "passthrough")(delegate, cancel = _cancel_reader, **kwargs))
+            try: return await asyncio.shield(_future)
+            except asyncio.CancelledError:
+                os.write(_cancel_writer, b"\x00")
+                await asyncio.gather(_future, return_exceptions = True)
+                raise
+        finally:
+            os.close(_cancel_writer)
+            os.close(_cancel_reader)
+
+    async def _send_coroutine(sources: typing.Dict[str, int], destination: int):
+        assert isinstance(sources, dict)
+        for _channel, _descriptor in sources.items():
+            assert _channel in _channels
+            assert isinstance(_descriptor, int)
+        assert isinstance(destination, int)
+        _sources = {_descriptor: _channels.index(_channel) for _channel, _descriptor in sources.items()}
+        destination = os.dup(destination)
+        try:
+            while _sources:
+                _ready = tuple(_descriptor for _descriptor in _sources if 0 < _count(descriptor = _descriptor))
+                if not _ready:
+                    _descriptor = await _wait_coroutine(descriptors = _sources.keys())
+                    if 0 == _count(descriptor = _descriptor): del _sources[_descriptor]
+                    continue
+                for _descriptor in _ready:
+                    _size = min(_chunk_size, _count(descriptor = _descriptor))
+                    await _write_coroutine(destination = destination, data = _protocol.serialize_binary_header(
+                        kind = _kinds.data, channel = _sources[_descriptor], size = _size
+                    ))
+                    await _forward_coroutine(source = _descriptor, destination = destination, size = _size)
+        finally: os.close(destination)
+
+    async def _receive_coroutine(source: int, destinations: typing.Dict[str, int]):
+        assert isinstance(source, int)
+        assert isinstance(destinations, dict)
+        for _channel, _descriptor in destinations.items():
+            assert _channel in _channels
+            assert isinstance(_descriptor, int)
+        return await _run(_receive, source = source, destinations = destinations)
+
+    class _Result(object):
+        send = _send_coroutine
+        receive = _receive_coroutine
+
+    return _Result
+
+
+_private = _private()
+try:
+    send = _private.send
+    receive = _private.receive
+finally: del _private
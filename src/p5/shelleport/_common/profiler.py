@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import sys
+    import time
+    import typing
+    import asyncio
+    import cProfile
+    import threading
+    import itertools
+    import contextvars
+    import collections
+
+    _kinds = ("sampling", "deterministic")
+    _current = contextvars.ContextVar(f"{__name__}.current", default = None)
+    _default_interval = +5.0e-3
+
+    class _Context(object):
+        active = None
+
+    def _validate_interval(value: float):
+        assert isinstance(value, (int, float))
+        value = float(value)
+        assert 0 < value
+        return value
+
+    def _collapse_stack(frame):
+        _stack = list()
+        while frame is not None:
+            _code = frame.f_code
+            _stack.append(f"{_code.co_name} ({_code.co_filename}:{_code.co_firstlineno})")
+            frame = frame.f_back
+        _stack.reverse()
+        return ";".join(_stack)
+
+    class _Session(object):
+        @property
+        def identifier(self): return self.__identifier
+
+        @property
+        def sampling(self): return self.__profile is None
+
+        def resume(self):
+            _previous, _Context.active = _Context.active, self
+            if self.__profile is not None: self.__profile.enable()
+            return _previous
+
+        def pause(self, previous: typing.Optional["_Session"]):
+            if self.__profile is not None: self.__profile.disable()
+            _Context.active = previous
+
+        def sample(self, frame):
+            _stack = _collapse_stack(frame = frame)
+            with self.__lock: self.__samples[_stack] += 1
+
+        def dump(self, directory: str):
+            _path = os.path.join(directory, self.__identifier)
+            if self.__profile is not None: return self.__profile.dump_stats(f"{_path}.pstats")
+            with self.__lock: _samples = sorted(self.__samples.items())
+            with open(f"{_path}.collapsed", "w") as _stream:
+                for _stack, _count in _samples: _stream.write(f"{_stack} {_count}\n")
+
+        def __init__(self, identifier: str, deterministic: bool):
+            super().__init__()
+            assert isinstance(identifier, str)
+            assert isinstance(deterministic, bool)
+            assert identifier
+            self.__identifier = identifier
+            self.__profile = cProfile.Profile() if deterministic else None
+            self.__lock = threading.Lock()
+            self.__samples = collections.Counter()
+
+    class _Stepper(object):
+        def __await__(self):
+            _coroutine = self.__coroutine
+            _value, _exception = None, None
+            while True:
+                _previous = self.__session.resume()
+                try:
+                    if _exception is None: _future = _coroutine.send(_value)
+                    else: _future = _coroutine.throw(_exception)
+                except StopIteration as _stop: return _stop.value
+                finally: self.__session.pause(previous = _previous)
+                try: _value, _exception = (yield _future), None
+                except GeneratorExit:
+                    _coroutine.close()
+                    raise
+                except BaseException as _error: _value, _exception = None, _error
+
+        def __init__(self, coroutine: typing.Coroutine, session: _Session):
+            super().__init__()
+            assert isinstance(session, _Session)
+            self.__coroutine = coroutine
+            self.__session = session
+
+    async def _step(coroutine: typing.Coroutine, session: _Session):
+        return await _Stepper(coroutine = coroutine, session = session)
+
+    class _Class(object):
+        @property
+        def directory(self): return self.__directory
+
+        @property
+        def kind(self): return self.__kind
+
+        @property
+        def every(self): return self.__every
+
+        @property
+        def interval(self): return self.__interval
+
+        def install(self, loop: asyncio.AbstractEventLoop = None):
+            if loop is None: loop = asyncio.get_running_loop()
+            assert loop.get_task_factory() is None, "task factory is already installed"
+            loop.set_task_factory(self.__task_factory)
+
+        async def __call__(self, coroutine: typing.Coroutine):
+            _sequence = next(self.__sequence)
+            if 0 != _sequence % self.__every: return await coroutine
+            _session = _Session(
+                identifier = f"{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}-{_sequence}",
+                deterministic = "deterministic" == self.__kind
+            )
+            _token = _current.set(_session)
+            try:
+                if _session.sampling: self.__start_sampling()
+                try: return await _step(coroutine = coroutine, session = _session)
+                finally:
+                    if _session.sampling: self.__stop_sampling()
+            finally:
+                _current.reset(_token)
+                await asyncio.to_thread(lambda: _session.dump(directory = self.__directory))
+
+        def __init__(self, directory: str, kind: str = None, every: int = None, interval: float = None):
+            super().__init__()
+            assert isinstance(directory, str)
+            assert directory
+            if kind is None: kind = _kinds[0]
+            assert kind in _kinds
+            if every is None: every = 1
+            assert isinstance(every, int)
+            assert 0 < every
+            os.makedirs(directory, exist_ok = True)
+            self.__directory = directory
+            self.__kind = kind
+            self.__every = every
+            self.__interval = _default_interval if interval is None else _validate_interval(value = interval)
+            self.__sequence = itertools.count()
+            self.__lock = threading.Lock()
+            self.__sampler = None
+            self.__sampling = 0
+
+        @staticmethod
+        def __task_factory(loop: asyncio.AbstractEventLoop, coroutine: typing.Coroutine, **kwargs):
+            _session = _current.get()
+            if _session is not None: coroutine = _step(coroutine = coroutine, session = _session)
+            return asyncio.Task(coroutine, loop = loop, **kwargs)
+
+        def __start_sampling(self):
+            with self.__lock:
+                self.__sampling += 1
+                if self.__sampler is not None: return
+                _stop = threading.Event()
+                _thread = threading.Thread(
+                    target = self.__sample_routine, kwargs = {"thread": threading.get_ident(), "stop": _stop}, daemon = True
+                )
+                self.__sampler = _stop
+            _thread.start()
+
+        def __stop_sampling(self):
+            with self.__lock:
+                self.__sampling -= 1
+                assert 0 <= self.__sampling
+                if 0 < self.__sampling: return
+                _stop, self.__sampler = self.__sampler, None
+            _stop.set()
+
+        def __sample_routine(self, thread: int, stop: threading.Event):
+            while not stop.wait(self.__interval):
+                _session = _Context.active
+                if (_session is None) or not _session.sampling: continue
+                _frame = sys._current_frames().get(thread)
+                if _frame is None: break
+                _session.sample(frame = _frame)
+
+    class _Result(object):
+        Class = _Class
+        kinds = _kinds
+        default_interval = _default_interval
+        validate_interval = _validate_interval
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    kinds = _private.kinds
+    default_interval = _private.default_interval
+    validate_interval = _private.validate_interval
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
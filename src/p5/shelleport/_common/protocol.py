@@ -7,110 +7,172 @@ assert "__main__" != __name__
 def _private():
     import time
     import json
+    import struct
     import typing
     import asyncio
     import contextlib
 
+    from . import metrics as _metrics_module
+    from . import compression as _compression_module
+    from . import memory_budget as _memory_budget_module
+    from . import protocol_options as _protocol_options_module
     from . import asynchronous_tools as _asynchronous_tools_module
 
-    _Asynchronizer = _asynchronous_tools_module.Asynchronizer
-
-    _make_thread_pool = _asynchronous_tools_module.thread_pool.make
-    _make_asynchronizer = _asynchronous_tools_module.asynchronizer.make
+    _decompress = _compression_module.decompress
+    _make_compression_channel = _compression_module.make_channel
+    _executors = _asynchronous_tools_module.executor_registry.shared
     _make_iteration_controller = _asynchronous_tools_module.iteration_controller.make
+    _get_timers = _asynchronous_tools_module.timer_heap.get
+    _metrics = _metrics_module.shared
+    _MemoryBudget = _memory_budget_module.Class
 
     _magic_text = f"{__name__}:magic"
     _zero_byte = b"\x00"
-    _chunk_timeout = +9.0e+0
+    _default_heartbeat = _protocol_options_module.default_heartbeat
+    _watchdog_ratio = 3
 
     if isinstance(asyncio.TimeoutError, TimeoutError): _KeepAliveTimeoutError = TimeoutError
     else: _KeepAliveTimeoutError = asyncio.TimeoutError
 
+    _view_threshold = 64 * 1024
+    _batch_size = 256 * 1024
+    _high_water = 1024 * 1024
+    _default_latency = _protocol_options_module.default_latency
+    _inline_parse_limit = 64 * 1024
+    _inline_compress_limit = 16 * 1024
+    _initial_capacity = 64 * 1024
+    _read_chunk_size = 256 * 1024
+    _retained_capacity = 1024 * 1024
+    _shrink_ratio = 4
+    _shrink_after = 8
+
     class _ReadBuffer(object):
         @property
-        def size(self): return self.__size
+        def size(self): return self.__end - self.__start
+
+        @property
+        def capacity(self): return len(self.__storage)
+
+        def prepare(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            _size = self.size
+            self.__high = max(self.__high, _size + size)
+            if self.__exported:
+                if self.__shared(): return self.__relocate(capacity = max(_initial_capacity, _size + size))
+                self.__exported = False
+            if len(self.__storage) >= self.__end + size: return
+            if (self.__start < _size) or (len(self.__storage) < _size + size): return self.__relocate(capacity = max(
+                _size + size, 2 * len(self.__storage)
+            ))
+            _view = memoryview(self.__storage)
+            try: _view[:_size] = _view[self.__start:self.__end]
+            finally: _view.release()
+            self.__start, self.__end = 0, _size
+
+        def reserve(self, size: int):
+            self.prepare(size = size)
+            return memoryview(self.__storage)[self.__end:self.__end + size]
+
+        def commit(self, size: int):
+            assert isinstance(size, int)
+            assert 0 <= size
+            assert not self.__exported
+            assert len(self.__storage) >= self.__end + size
+            self.__end += size
 
         def push(self, chunk: bytes):
-            assert isinstance(chunk, bytes)
-            assert chunk
-            self.__current.append(chunk)
-            self.__size += len(chunk)
+            assert isinstance(chunk, (bytes, bytearray, memoryview))
+            _size = len(chunk)
+            assert 0 < _size
+            self.prepare(size = _size)
+            self.__storage[self.__end:self.__end + _size] = chunk
+            self.__end += _size
+
+        def peek(self, size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            assert self.size >= size
+            return bytes(memoryview(self.__storage)[self.__start:self.__start + size])
+
+        def pop_bytes(self, size: int):
+            _chunk = self.peek(size = size)
+            self.__consume(size = size)
+            return _chunk
 
         def pop_blob(self, size: int):
             assert isinstance(size, int)
             assert 0 < size
-            assert self.__size >= size
-            assert self.__current
-            assert not self.__prefix
-            _size = size
-            _chunks = []
-            _temporary = self.__current.copy()
-            while 0 < _size:
-                _chunks.append(_temporary.pop(0))
-                _size -= len(_chunks[-1])
-            assert _chunks
-            if 0 > _size:
-                _temporary.insert(0, _chunks[-1][_size:])
-                _chunks[-1] = _chunks[-1][:_size]
-            else: assert 0 == _size
-            if 1 < len(_chunks): _chunks = bytes().join(_chunks)
-            else: _chunks, = _chunks
-            assert _chunks
-            assert size == len(_chunks)
-            self.__current = _temporary
-            self.__size -= size
-            return _chunks
+            assert self.size >= size
+            if _view_threshold > size: return self.pop_bytes(size = size)
+            _view = memoryview(self.__storage)[self.__start:self.__start + size].toreadonly()
+            self.__exported = True
+            self.__consume(size = size)
+            return _view
 
         def pop_message(self):
-            assert self.__current
-            assert 0 < self.__size
-            _zero = None
-            _chunks = []
-            _temporary = self.__current.copy()
-            while _temporary:
-                _chunks.append(_temporary.pop(0))
-                try: _zero = _chunks[-1].index(_zero_byte)
-                except ValueError: continue
-                break
-            assert _chunks
-            if _zero is None:
-                assert not _temporary
-                self.__prefix.extend(self.__current)
-                self.__current.clear()
+            assert 0 < self.size
+            _zero = self.__storage.find(_zero_byte, self.__start + self.__scanned, self.__end)
+            if 0 > _zero:
+                self.__scanned = self.size
                 return None
-            _chunks = tuple(self.__pop_message_generator(chunks = _chunks, zero = _zero))
-            if _chunks[-1]: _temporary.insert(0, _chunks[-1])
-            _chunks = bytes().join(_chunks[:-1])
-            _size = 1 + len(_chunks)
-            assert 1 < _size
-            assert self.__size >= _size
-            self.__prefix.clear()
-            self.__current = _temporary
-            self.__size -= _size
-            return _chunks
+            assert self.__start < _zero
+            _message = bytes(memoryview(self.__storage)[self.__start:_zero])
+            self.__consume(size = 1 + _zero - self.__start)
+            return _message
+
+        def close(self):
+            _read_buffer_metric.dec(len(self.__storage))
+            self.__storage = bytearray()
+            self.__start, self.__end, self.__scanned = 0, 0, 0
+            self.__exported = False
 
         def __init__(self):
             super().__init__()
-            self.__size = 0
-            self.__prefix = []
-            self.__current = []
-
-        def __pop_message_generator(self, chunks: typing.Iterable[bytes], zero: int):
-            assert isinstance(zero, int)
-            assert 0 <= zero
-            yield from self.__prefix
-            _previous = None
-            for _current in chunks:
-                assert isinstance(_current, bytes)
-                assert _current
-                if _previous is not None: yield _previous
-                _previous = _current
-            assert _previous is not None
-            if 0 < zero:
-                _current = _previous[:zero]
-                assert zero == len(_current)
-                yield _current
-            yield _previous[1 + zero:]
+            self.__end = 0
+            self.__start = 0
+            self.__scanned = 0
+            self.__storage = bytearray(_initial_capacity)
+            self.__exported = False
+            self.__high = 0
+            self.__idle = 0
+            _read_buffer_metric.inc(_initial_capacity)
+
+        def __consume(self, size: int):
+            assert 0 < size
+            assert self.size >= size
+            self.__start += size
+            self.__scanned = max(0, self.__scanned - size)
+            if self.__start != self.__end: return
+            if self.__shrinkable(): return self.__relocate(capacity = _initial_capacity)
+            if not self.__exported: self.__start, self.__end = 0, 0
+
+        def __shrinkable(self):
+            _capacity = len(self.__storage)
+            _high, self.__high = self.__high, 0
+            if (_retained_capacity >= _capacity) or (_shrink_ratio * _high >= _capacity):
+                self.__idle = 0
+                return False
+            self.__idle += 1
+            if _shrink_after > self.__idle: return False
+            self.__idle = 0
+            return True
+
+        def __shared(self):
+            try: _byte = self.__storage.pop()
+            except BufferError: return True
+            self.__storage.append(_byte)
+            return False
+
+        def __relocate(self, capacity: int):
+            _size = self.size
+            assert capacity >= _size
+            _storage = bytearray(capacity)
+            _storage[:_size] = memoryview(self.__storage)[self.__start:self.__end]
+            _read_buffer_metric.inc(capacity - len(self.__storage))
+            self.__storage = _storage
+            self.__start, self.__end = 0, _size
+            self.__exported = False
 
     def _serialize_message(message: dict):
         assert isinstance(message, dict)
@@ -125,7 +187,7 @@ def _private():
         try: _blob = message["blob"]
         except KeyError: _blob = None
         else:
-            assert isinstance(_blob, bytes)
+            assert isinstance(_blob, (bytes, memoryview))
             assert _blob
             message["blob"] = len(_blob)
 
@@ -141,13 +203,6 @@ def _private():
     _min_message_size = len(_keep_alive_message)
     assert _min_message_size <= _max_message_size
 
-    @contextlib.asynccontextmanager
-    async def _open_asynchronizer():
-        with _make_thread_pool(max_workers = 1) as _thread_pool:
-            def _spawn(delegate: typing.Callable): return _thread_pool(delegate)
-            _thread_pool.open()
-            yield await _thread_pool(_make_asynchronizer, executor = _spawn)
-
     def _parse_message(value: bytes):
         assert isinstance(value, bytes)
         _size = 1 + len(value)
@@ -163,151 +218,633 @@ def _private():
         assert _magic == _magic_text
         return value
 
-    def _pop_messages(buffer: _ReadBuffer):
+    def _generate_serialized_chunks(message: dict):
+        for message in _serialize_message(message = message):
+            yield message
+            yield _zero_byte
+
+    _binary_magic = 0xb5
+    _binary_header = struct.Struct("!BBBBII")
+    _max_session = 0xffffffff
+    _max_credit = 0xffffffff
+    _binary_channels = ("stdin", "stdout", "stderr")
+    _session_end_keys = {"result", "exception", "finished"}
+    _directions = ("in", "out")
+    _message_kinds = ("keep_alive", "data", "credit", "close", "control")
+
+    _frames_metric = _metrics.counter(
+        name = "protocol_frames_total", help = "protocol messages by direction and kind", labels = ("direction", "kind")
+    )
+    _channel_bytes_metric = _metrics.counter(
+        name = "protocol_channel_bytes_total", help = "channel payload bytes by direction and channel",
+        labels = ("direction", "channel")
+    )
+    _wire_bytes_metric = _metrics.counter(
+        name = "protocol_wire_bytes_total", help = "bytes read from and written to peers", labels = ("direction", )
+    )
+    _compression_bytes_metric = _metrics.counter(
+        name = "protocol_compression_bytes_total", help = "compressed channel data before and after compression",
+        labels = ("stage", )
+    )
+    _write_queue_metric = _metrics.gauge(name = "protocol_write_queue_bytes", help = "serialized bytes waiting for peers")
+    _read_buffer_metric = _metrics.gauge(name = "protocol_read_buffer_bytes", help = "capacity of peer read buffers")
+    _frames = {
+        (_direction, _kind): _frames_metric.labels(direction = _direction, kind = _kind)
+        for _direction in _directions for _kind in _message_kinds
+    }
+    _channel_bytes = {
+        (_direction, _channel): _channel_bytes_metric.labels(direction = _direction, channel = _channel)
+        for _direction in _directions for _channel in _binary_channels
+    }
+    _wire_bytes = {_direction: _wire_bytes_metric.labels(direction = _direction) for _direction in _directions}
+    _compression_bytes = {_stage: _compression_bytes_metric.labels(stage = _stage) for _stage in ("input", "output")}
+
+    def _account_message(direction: str, message: dict):
+        if not message: _kind = "keep_alive"
+        elif "blob" in message: _kind = "data"
+        elif "credit" in message: _kind = "credit"
+        elif "channel" in message: _kind = "close"
+        else: _kind = "control"
+        _frames[direction, _kind].inc()
+        if "data" == _kind: _channel_bytes[direction, message["channel"]].inc(len(message["blob"]))
+
+    class _BinaryKind(object):
+        keep_alive = 0
+        data = 1
+        close = 2
+        json = 3
+        credit = 4
+
+    class _BinaryFlag(object):
+        compressed = 0x01
+
+    def _validate_session(value: int):
+        assert isinstance(value, int)
+        assert 0 < value <= _max_session
+        return value
+
+    def _serialize_binary_header(kind: int, channel: int = 0, session: int = 0, size: int = 0, flags: int = 0):
+        return _binary_header.pack(_binary_magic, kind, channel, flags, session, size)
+
+    def _serialize_binary_message(message: dict):
+        assert isinstance(message, dict)
+        if not message: return _serialize_binary_header(kind = _BinaryKind.keep_alive),
+        message = message.copy()
+        try: _session = _validate_session(value = message.pop("session"))
+        except KeyError: _session = 0
+        else: assert message
+        if (message.get("channel") in _binary_channels) and (not (message.keys() - {"channel", "blob", "compressed"})):
+            _channel = _binary_channels.index(message.pop("channel"))
+            _flags = _BinaryFlag.compressed if message.pop("compressed", False) else 0
+            try: _blob = message.pop("blob")
+            except KeyError:
+                assert 0 == _flags
+                return _serialize_binary_header(kind = _BinaryKind.close, channel = _channel, session = _session),
+            assert isinstance(_blob, (bytes, memoryview))
+            assert _blob
+            assert _max_message_size >= len(_blob)
+            return _serialize_binary_header(
+                kind = _BinaryKind.data, channel = _channel, session = _session, size = len(_blob), flags = _flags
+            ), _blob
+        if (message.get("channel") in _binary_channels) and ({"channel", "credit"} == message.keys()):
+            _credit = message["credit"]
+            assert isinstance(_credit, int)
+            assert 0 < _credit <= _max_credit
+            return _serialize_binary_header(
+                kind = _BinaryKind.credit, channel = _binary_channels.index(message["channel"]),
+                session = _session, size = _credit
+            ),
+        assert "blob" not in message
+        assert "magic" not in message
+        _blob = json.dumps(message).encode("utf-8")
+        assert _max_message_size >= _binary_header.size + len(_blob)
+        return _serialize_binary_header(kind = _BinaryKind.json, session = _session, size = len(_blob)), _blob
+
+    def _pop_binary_message(buffer: _ReadBuffer):
         assert isinstance(buffer, _ReadBuffer)
-        while 0 < buffer.size:
-            _message = buffer.pop_message()
-            if _message is None: return
-            _message = _parse_message(value = _message)
-            assert isinstance(_message, dict)
-            if _message: yield _message
-
-    async def _read_blob(size: int, buffer: _ReadBuffer, reader: typing.Callable, asynchronizer: _Asynchronizer):
+        if _binary_header.size > buffer.size: return None
+        _kind, _channel, _flags, _session, _size = _parse_binary_header(value = buffer.peek(size = _binary_header.size))
+        if 0 != _flags: assert _BinaryKind.data == _kind
+        if _BinaryKind.credit != _kind: assert _max_message_size >= _size
+        if _BinaryKind.json == _kind:
+            assert 0 == _channel
+            assert 0 < _size
+            _size += _binary_header.size
+            assert _max_message_size >= _size
+            if _size > buffer.size: return None
+            return buffer.pop_bytes(size = _size)
+        buffer.pop_bytes(size = _binary_header.size)
+        if _BinaryKind.keep_alive == _kind:
+            assert 0 == _channel
+            assert 0 == _session
+            assert 0 == _size
+            return dict()
+        assert len(_binary_channels) > _channel
+        _message = {"channel": _binary_channels[_channel]}
+        if 0 != _session: _message["session"] = _session
+        if _BinaryKind.close == _kind: assert 0 == _size
+        elif _BinaryKind.credit == _kind:
+            assert 0 < _size
+            _message["credit"] = _size
+        else:
+            assert _BinaryKind.data == _kind
+            assert 0 < _size
+            _message["blob"] = _size
+            if 0 != _flags: _message["compressed"] = True
+        return _message
+
+    def _parse_binary_header(value: bytes):
+        assert isinstance(value, bytes)
+        _magic, _kind, _channel, _flags, _session, _size = _binary_header.unpack(value)
+        assert _binary_magic == _magic
+        assert 0 == (_flags & ~_BinaryFlag.compressed)
+        return _kind, _channel, _flags, _session, _size
+
+    def _parse_binary_message(value: bytes):
+        assert isinstance(value, bytes)
+        _session = _binary_header.unpack_from(value)[-2]
+        value = json.loads(value[_binary_header.size:].decode("utf-8"))
+        assert isinstance(value, dict)
+        assert value
+        assert "blob" not in value
+        assert "session" not in value
+        if 0 != _session: value["session"] = _session
+        return value
+
+    class _JsonFraming(object):
+        trailer = _zero_byte
+        keep_alive = (_keep_alive_message, )
+
+        @staticmethod
+        def serialize(message: dict): return tuple(_generate_serialized_chunks(message = message))
+
+        @staticmethod
+        def pop(buffer: _ReadBuffer): return buffer.pop_message()
+
+        @staticmethod
+        def parse(value: bytes): return _parse_message(value = value)
+
+    class _BinaryFraming(object):
+        trailer = bytes()
+        keep_alive = _serialize_binary_message(message = {})
+
+        @staticmethod
+        def serialize(message: dict): return _serialize_binary_message(message = message)
+
+        @staticmethod
+        def pop(buffer: _ReadBuffer): return _pop_binary_message(buffer = buffer)
+
+        @staticmethod
+        def parse(value: bytes): return _parse_binary_message(value = value)
+
+    _framings = {"json": _JsonFraming, "binary": _BinaryFraming}
+    assert _protocol_options_module.framings == tuple(_framings.keys())
+
+    def _make_framing_getter(framing: typing.Optional[typing.Callable[[], str]]):
+        if framing is None: return lambda: _JsonFraming
+        assert callable(framing)
+        return lambda: _framings[framing()]
+
+    _validate_latency = _protocol_options_module.validate_latency
+
+    def _make_compression_getter(compression: typing.Optional[typing.Callable[[], typing.Optional[str]]]):
+        if compression is None: return lambda: None
+        assert callable(compression)
+        return compression
+
+    def _make_heartbeat_getter(heartbeat: typing.Optional[typing.Callable[[], typing.Optional[float]]]):
+        if heartbeat is None: return lambda: _default_heartbeat
+        assert callable(heartbeat)
+
+        def _result():
+            _value = heartbeat()
+            if _value is None: return _default_heartbeat
+            assert isinstance(_value, float)
+            return _value if 0 < _value else None
+
+        return _result
+
+    class _BudgetCharge(object):
+        def update(self, size: int):
+            assert isinstance(size, int)
+            assert 0 <= size
+            _budget = None if self.__budget_getter is None else self.__budget_getter()
+            if _budget is not None:
+                assert isinstance(_budget, _MemoryBudget)
+                if _budget.closed: _budget = None
+            if _budget is not self.__budget:
+                if self.__budget is not None: self.__budget.release(size = self.__charged)
+                self.__budget = _budget
+                self.__charged = 0
+            if _budget is None: return
+            if size > self.__charged: _budget.charge(size = size - self.__charged)
+            elif size < self.__charged: _budget.release(size = self.__charged - size)
+            self.__charged = size
+
+        def clear(self):
+            if self.__budget is not None: self.__budget.release(size = self.__charged)
+            self.__budget = None
+            self.__charged = 0
+
+        def __init__(self, budget: typing.Callable[[], typing.Optional[_MemoryBudget]] = None):
+            super().__init__()
+            if budget is not None: assert callable(budget)
+            self.__budget_getter = budget
+            self.__budget = None
+            self.__charged = 0
+
+    class _Watchdog(object):
+        async def __call__(self, awaitable: typing.Awaitable):
+            _interval = self.__heartbeat()
+            if _interval is None: return await awaitable
+            assert self.__task is None
+            self.__task = asyncio.current_task()
+            self.__started = self.__loop.time()
+            self.__expired = False
+            self.__timer.arm(delay = _watchdog_ratio * _interval)
+            try: return await awaitable
+            except asyncio.CancelledError:
+                if not self.__expired: raise
+                _uncancel = getattr(self.__task, "uncancel", None)
+                if (_uncancel is not None) and (0 < _uncancel()): raise
+                raise _KeepAliveTimeoutError() from None
+            finally:
+                self.__task = None
+                self.__timer.disarm()
+
+        def __init__(self, heartbeat: typing.Callable[[], typing.Optional[float]]):
+            super().__init__()
+            assert callable(heartbeat)
+            _timers = _get_timers()
+            self.__heartbeat = heartbeat
+            self.__loop = _timers.loop
+            self.__timer = _timers.make_timer(callback = self.__on_timer)
+            self.__task = None
+            self.__started = None
+            self.__expired = False
+
+        def __on_timer(self):
+            if self.__task is None: return
+            _interval = self.__heartbeat()
+            if _interval is None: return
+            _remaining = self.__started + _watchdog_ratio * _interval - self.__loop.time()
+            if 0 < _remaining: return self.__timer.arm(delay = _remaining)
+            self.__expired = True
+            self.__task.cancel()
+
+    async def _pop_message(buffer: _ReadBuffer, framing: typing.Callable):
+        assert isinstance(buffer, _ReadBuffer)
+        _framing = framing()
+        _message = _framing.pop(buffer = buffer)
+        if isinstance(_message, bytes):
+            if _inline_parse_limit < len(_message): _message = await _executors.get(name = "codec")(_framing.parse, _message)
+            else: _message = _framing.parse(_message)
+        if _message is not None: assert isinstance(_message, dict)
+        return _message, _framing
+
+    async def _read_blob(size: int, trailer: bytes, buffer: _ReadBuffer, fill: typing.Callable):
         assert isinstance(size, int)
         assert 0 < size
+        assert isinstance(trailer, bytes)
         assert isinstance(buffer, _ReadBuffer)
-        assert isinstance(asynchronizer, _Asynchronizer)
-        size = size + 1
-        _chunks = []
+        _size = size + len(trailer)
         _buffer_size = buffer.size
-        if 0 < _buffer_size:
-            _size = min(size, _buffer_size)
-            await asynchronizer(lambda: _chunks.append(buffer.pop_blob(size = _size)))
-            assert isinstance(_chunks[0], bytes)
-            assert _chunks[0]
-            assert _size == len(_chunks[0])
-            size -= _size
-            _buffer_size -= _size
+        if _size > _buffer_size: buffer.prepare(size = _size - _buffer_size)
+        while _size > _buffer_size:
+            _received = await fill(size = _size - _buffer_size)
+            assert 0 < _received, "unexpected end of stream"
+            _buffer_size += _received
             assert _buffer_size == buffer.size
-            if 0 < _buffer_size: assert 0 == size
-            else:
-                assert 0 <= size
-                assert 0 == _buffer_size
-        while 0 < size:
-            _chunk = await reader(size = size)
-            assert isinstance(_chunk, bytes)
-            assert _chunk
-            _chunk_size = len(_chunk)
-            assert 0 < _chunk_size
-            assert size >= _chunk_size
-            size -= _chunk_size
-            _chunks.append(_chunk)
-        assert _chunks
-        assert 0 == _chunks[-1][-1]
-        if 1 == len(_chunks): return _chunks[0][:-1]
-        _chunks[-1] = _chunks[-1][:-1]
-        return bytes().join(_chunks)
+        _blob = buffer.pop_blob(size = size)
+        if trailer: assert trailer == buffer.pop_bytes(size = len(trailer))
+        return _blob
 
-    def _generate_serialized_chunks(message: dict):
-        for message in _serialize_message(message = message):
-            yield message
-            yield _zero_byte
+    async def _decompress_blob(blob: typing.Union[bytes, memoryview], codec: typing.Optional[str]):
+        assert codec is not None, "compression is not negotiated"
+        if _inline_parse_limit < len(blob): return await _executors.get(name = "codec")(
+            _decompress, codec = codec, data = blob, limit = _max_message_size
+        )
+        return _decompress(codec = codec, data = blob, limit = _max_message_size)
 
     @contextlib.asynccontextmanager
-    async def _open_reader(source: typing.Callable):
-        async with _open_asynchronizer() as _asynchronizer:
-            _buffer = await _asynchronizer(_ReadBuffer)
-
-            async def _generator():
-                while True:
-                    _size = await _asynchronizer(lambda: _max_message_size - _buffer.size)
-                    assert await _asynchronizer(lambda: 0 < _size)
-                    _chunk = await asyncio.wait_for(source(size = _size), timeout = _chunk_timeout)
-                    assert await _asynchronizer(isinstance, _chunk, bytes)
-                    if not _chunk: break
-                    await _asynchronizer(_buffer.push, chunk = _chunk)
-                    async for _message in _asynchronizer(_pop_messages(buffer = _buffer)):
-                        try: _blob = await _asynchronizer(_message.pop, "blob")
-                        except KeyError: pass
-                        else:
-                            assert await _asynchronizer(lambda: isinstance(_blob, int) and (0 < _blob))
-                            _message["blob"] = await _read_blob(
-                                size = _blob, buffer = _buffer, reader = source, asynchronizer = _asynchronizer
-                            )
-                            assert await _asynchronizer(lambda: _blob == len(_message["blob"]))
-                        yield _message
-                    assert await _asynchronizer(lambda: _max_message_size > _buffer.size)
-
-            async with await _asynchronizer(_make_iteration_controller, factory = _generator) as _generator:
+    async def _open_reader(
+        source: typing.Callable, framing: typing.Callable[[], str] = None,
+        compression: typing.Callable[[], typing.Optional[str]] = None,
+        heartbeat: typing.Callable[[], typing.Optional[float]] = None,
+        source_into: typing.Callable[[], typing.Optional[typing.Callable[[memoryview], typing.Awaitable[int]]]] = None,
+        budget: typing.Callable[[], typing.Optional[_MemoryBudget]] = None
+    ):
+        framing = _make_framing_getter(framing = framing)
+        compression = _make_compression_getter(compression = compression)
+        if source_into is not None: assert callable(source_into)
+        _watchdog = _Watchdog(heartbeat = _make_heartbeat_getter(heartbeat = heartbeat))
+        _buffer = _ReadBuffer()
+        _charge = _BudgetCharge(budget = budget)
+
+        async def _fill(size: int):
+            assert isinstance(size, int)
+            assert 0 < size
+            _source_into = None if source_into is None else source_into()
+            if _source_into is None:
+                _chunk = await _watchdog(source(size = size))
+                assert isinstance(_chunk, bytes)
+                assert size >= len(_chunk)
+                if _chunk: _buffer.push(chunk = _chunk)
+                _received = len(_chunk)
+            else:
+                size = min(size, max(_read_chunk_size, _buffer.capacity - _buffer.size))
+                with _buffer.reserve(size = size) as _view: _received = await _watchdog(_source_into(_view))
+                assert isinstance(_received, int)
+                assert 0 <= _received <= size
+                _buffer.commit(size = _received)
+            _wire_bytes["in"].inc(_received)
+            _charge.update(size = _buffer.size)
+            return _received
+
+        async def _generator():
+            while True:
+                _size = _max_message_size - _buffer.size
+                assert 0 < _size
+                if 0 == await _fill(size = _size):
+                    assert 0 == _buffer.size, "unexpected end of stream"
+                    break
+                while 0 < _buffer.size:
+                    _message, _framing = await _pop_message(buffer = _buffer, framing = framing)
+                    if _message is None: break
+                    if not _message:
+                        _account_message(direction = "in", message = _message)
+                        continue
+                    _compressed = _message.pop("compressed", False)
+                    assert isinstance(_compressed, bool)
+                    try: _blob = _message.pop("blob")
+                    except KeyError: assert not _compressed
+                    else:
+                        assert isinstance(_blob, int) and (0 < _blob)
+                        _message["blob"] = await _read_blob(
+                            size = _blob, trailer = _framing.trailer, buffer = _buffer, fill = _fill
+                        )
+                        assert _blob == len(_message["blob"])
+                        if _compressed: _message["blob"] = await _decompress_blob(
+                            blob = _message["blob"], codec = compression()
+                        )
+                    _charge.update(size = _buffer.size)
+                    _account_message(direction = "in", message = _message)
+                    yield _message
+                    del _message
+                assert _max_message_size > _buffer.size
+
+        try:
+            async with _make_iteration_controller(factory = _generator) as _generator:
                 await _generator.open()
                 yield _generator.make_iterator()
-
-            assert await _asynchronizer(lambda: 0 == _buffer.size)
+        finally:
+            _charge.clear()
+            _buffer.close()
 
     @contextlib.asynccontextmanager
-    async def _open_writer(destination: typing.Callable[[typing.Iterable[bytes]], typing.Awaitable[None]]):
-        _barrier_step = _chunk_timeout / +3.0e+0
+    async def _open_writer(
+        destination: typing.Callable[[typing.Iterable[bytes]], typing.Awaitable[None]],
+        framing: typing.Callable[[], str] = None,
+        compression: typing.Callable[[], typing.Optional[str]] = None,
+        latency: float = None, heartbeat: typing.Callable[[], typing.Optional[float]] = None,
+        budget: typing.Callable[[], typing.Optional[_MemoryBudget]] = None
+    ):
+        framing = _make_framing_getter(framing = framing)
+        compression = _make_compression_getter(compression = compression)
+        heartbeat = _make_heartbeat_getter(heartbeat = heartbeat)
+        latency = _default_latency if latency is None else _validate_latency(value = latency)
+        _timers = _get_timers()
+        _charge = _BudgetCharge(budget = budget)
 
         class _Context(object):
-            lock = asyncio.Condition()
-            barrier = None
-
-        async def _keep_alive_coroutine():
-            async with _Context.lock:
+            state = True
+            held = False
+            chunks = list()
+            pending = list()
+            size = 0
+            since = None
+            wake = asyncio.Event()
+            drained = asyncio.Event()
+
+        def _enqueue(chunks: typing.Iterable[bytes], channel = None):
+            _time = time.monotonic()
+            _size = 0
+            for _chunk in chunks:
+                _Context.chunks.append(_chunk)
+                _size += len(_chunk)
+            _Context.size += _size
+            _write_queue_metric.inc(_size)
+            _charge.update(size = _Context.size)
+            if _Context.since is None: _Context.since = _time
+            if channel is not None: _Context.pending.append((channel, _time))
+            _Context.wake.set()
+
+        async def _wait_wake(timeout: float):
+            _Context.wake.clear()
+            try: await asyncio.wait_for(_Context.wake.wait(), timeout = timeout)
+            except _KeepAliveTimeoutError: return False
+            return True
+
+        async def _flush_coroutine():
+            try:
                 while True:
-                    if _Context.barrier is False: return
-                    if _Context.barrier is None:
-                        await _Context.lock.wait()
+                    if _Context.held and (_Context.state is True):
+                        await _wait_wake(timeout = None)
                         continue
-                    assert isinstance(_Context.barrier, float)
-                    _time = time.monotonic()
-                    if _Context.barrier > _time:
-                        try: await asyncio.wait_for(_Context.lock.wait(), timeout = _Context.barrier - _time)
-                        except _KeepAliveTimeoutError: pass
+                    if not _Context.chunks:
+                        if _Context.state is not True: return
+                        await _wait_wake(timeout = None)
                         continue
-                    await destination((_keep_alive_message, ))
-                    _Context.barrier = _barrier_step + time.monotonic()
-
-        _keep_alive_task = asyncio.create_task(_keep_alive_coroutine())
-
-        async with _open_asynchronizer() as _asynchronizer:
-            async def _coroutine(message: dict):
-                assert isinstance(message, dict)
-                assert message
-                message = await _asynchronizer(lambda: tuple(_generate_serialized_chunks(message = message)))
-                async with _Context.lock:
-                    assert (_Context.barrier is None) or isinstance(_Context.barrier, float), "writer closed"
-                    try:
-                        assert not _keep_alive_task.done()
-                        await destination(message)
-                        _Context.barrier = _barrier_step + time.monotonic()
-                    except BaseException:
-                        _Context.barrier = False
-                        raise
-                    finally: _Context.lock.notify_all()
-
-            try: yield _coroutine
+                    _delay = _Context.since + latency - time.monotonic()
+                    if (0 < _delay) and (_batch_size > _Context.size) and (_Context.state is True):
+                        await _wait_wake(timeout = _delay)
+                        continue
+                    _chunks, _pending, _size = _Context.chunks, _Context.pending, _Context.size
+                    _Context.chunks, _Context.pending, _Context.since = list(), list(), None
+                    await destination(_chunks)
+                    _Context.size -= _size
+                    _write_queue_metric.dec(_size)
+                    _charge.update(size = _Context.size)
+                    _wire_bytes["out"].inc(_size)
+                    _time = time.monotonic()
+                    for _channel, _enqueued in _pending: _channel.account(seconds = _time - _enqueued)
+                    _Context.drained.set()
+            except BaseException as _exception:
+                _Context.state = _exception
+                raise
+            finally: _Context.drained.set()
+
+        def _on_heartbeat():
+            if _Context.state is not True: return
+            _interval = heartbeat()
+            if _interval is None: return
+            if not (_Context.held or _Context.chunks):
+                _enqueue(chunks = framing().keep_alive)
+                _frames["out", "keep_alive"].inc()
+            _heartbeat_timer.arm(delay = _interval)
+
+        _heartbeat_timer = _timers.make_timer(callback = _on_heartbeat)
+        _flush_task = asyncio.create_task(_flush_coroutine())
+
+        _asynchronizer = _executors.make_asynchronizer(name = "codec")
+        _compression_channels = dict()
+
+        def _prepare_compression(message: dict):
+            _codec = compression()
+            if _codec is None: return None
+            _session = message.get("session", 0)
+            try: _key = _session, message["channel"]
+            except KeyError:
+                if message.keys() & _session_end_keys:
+                    for _channel in _binary_channels: _compression_channels.pop((_session, _channel), None)
+                return None
+            try: _blob = message["blob"]
+            except KeyError:
+                if "credit" not in message: _compression_channels.pop(_key, None)
+                return None
+            _channel = _compression_channels.get(_key)
+            if (_channel is None) or (_codec != _channel.codec):
+                _channel = _make_compression_channel(codec = _codec)
+                _compression_channels[_key] = _channel
+            if not _channel.prepare(size = len(_blob)): return None
+            return _channel
+
+        def _serialize(message: dict, channel):
+            if channel is not None:
+                _blob = channel(data = message["blob"])
+                if _blob is not None:
+                    _compression_bytes["input"].inc(len(message["blob"]))
+                    _compression_bytes["output"].inc(len(_blob))
+                    message = {**message, "blob": _blob, "compressed": True}
+            return framing().serialize(message = message)
+
+        def _check_state():
+            if isinstance(_Context.state, BaseException): raise _Context.state
+            assert _Context.state is True, "writer closed"
+
+        async def _coroutine(message: dict):
+            assert isinstance(message, dict)
+            assert message
+            _account_message(direction = "out", message = message)
+            _channel = _prepare_compression(message = message)
+            if (_channel is None) or (_inline_compress_limit > len(message.get("blob", b""))):
+                message = _serialize(message = message, channel = _channel)
+            else: message = await _asynchronizer(lambda: _serialize(message = message, channel = _channel))
+            _check_state()
+            _enqueue(chunks = message, channel = _channel)
+            _interval = heartbeat()
+            if _interval is not None: _heartbeat_timer.arm(delay = _interval)
+            while _high_water < _Context.size:
+                _Context.drained.clear()
+                await _Context.drained.wait()
+                _check_state()
+
+        def _arm_heartbeat():
+            _check_state()
+            _interval = heartbeat()
+            if _interval is not None: _heartbeat_timer.arm(delay = _interval)
+
+        @contextlib.asynccontextmanager
+        async def _hold():
+            assert not _Context.held, "writer is held already"
+            while 0 < _Context.size:
+                _Context.drained.clear()
+                await _Context.drained.wait()
+                _check_state()
+            _check_state()
+            _Context.held = True
+            try: yield
             finally:
-                async with _Context.lock:
-                    _Context.barrier = False
-                    _Context.lock.notify_all()
-                await asyncio.gather(_keep_alive_task, return_exceptions = True)
+                _Context.held = False
+                _Context.wake.set()
+
+        class _Writer(object):
+            @staticmethod
+            def hold(): return _hold()
+
+            @staticmethod
+            def arm_heartbeat(): return _arm_heartbeat()
+
+            async def __call__(self, message: dict): return await _coroutine(message = message)
+
+        try: yield _Writer()
+        finally:
+            _heartbeat_timer.disarm()
+            if _Context.state is True: _Context.state = False
+            _Context.wake.set()
+            await asyncio.gather(_flush_task, return_exceptions = True)
+            _write_queue_metric.dec(_Context.size)
+            _charge.clear()
 
     class _Class(object):
         @property
         def zero_byte(self): return _zero_byte
 
+        @property
+        def framings(self): return _protocol_options_module.framings
+
+        @property
+        def compressions(self): return _protocol_options_module.compressions
+
         @property
         def ideal_chunk_size(self): return _ideal_chunk_size
 
+        @property
+        def max_session(self): return _max_session
+
+        @property
+        def binary_kinds(self): return _BinaryKind
+
+        @property
+        def binary_channels(self): return _binary_channels
+
+        @property
+        def binary_header_size(self): return _binary_header.size
+
         @staticmethod
         def serialize_message(message: dict): return _serialize_message(message = message)
 
         @staticmethod
-        def open_reader(source: typing.Callable): return _open_reader(source = source)
+        def parse_message(value: bytes): return _parse_message(value = value)
+
+        @staticmethod
+        def make_read_buffer(): return _ReadBuffer()
+
+        @staticmethod
+        def serialize_binary_header(kind: int, channel: int = 0, size: int = 0):
+            return _serialize_binary_header(kind = kind, channel = channel, size = size)
+
+        @staticmethod
+        def parse_binary_header(value: bytes): return _parse_binary_header(value = value)
+
+        @staticmethod
+        def parse_binary_message(value: bytes): return _parse_binary_message(value = value)
+
+        @staticmethod
+        def open_reader(
+            source: typing.Callable, framing: typing.Callable[[], str] = None,
+            compression: typing.Callable[[], typing.Optional[str]] = None,
+            heartbeat: typing.Callable[[], typing.Optional[float]] = None,
+            source_into: typing.Callable[[], typing.Optional[typing.Callable[[memoryview], typing.Awaitable[int]]]] = None,
+            budget: typing.Callable[[], typing.Optional[_MemoryBudget]] = None
+        ): return _open_reader(
+            source = source, framing = framing, compression = compression, heartbeat = heartbeat, source_into = source_into,
+            budget = budget
+        )
+
+        @staticmethod
+        def open_writer(
+            destination: typing.Callable, framing: typing.Callable[[], str] = None,
+            compression: typing.Callable[[], typing.Optional[str]] = None, latency: float = None,
+            heartbeat: typing.Callable[[], typing.Optional[float]] = None,
+            budget: typing.Callable[[], typing.Optional[_MemoryBudget]] = None
+        ): return _open_writer(
+            destination = destination, framing = framing, compression = compression, latency = latency,
+            heartbeat = heartbeat, budget = budget
+        )
 
         @staticmethod
-        def open_writer(destination: typing.Callable): return _open_writer(destination = destination)
+        def validate_latency(value: float): return _validate_latency(value = value)
 
     class _Result(object):
         Class = _Class
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    from . import compression as _compression_module
+
+    _framings = ("json", "binary")
+    _compressions = _compression_module.codecs
+    _default_latency = +0.0e+0
+    _max_latency = +1.0e+0
+    _default_window = 4 * 1024 * 1024
+    _max_window = 0xffffffff
+    _default_heartbeat = +3.0e+0
+    _min_heartbeat = +2.5e-1
+    _max_heartbeat = +6.0e+2
+
+    def _validate_latency(value: float):
+        assert isinstance(value, float)
+        assert 0 <= value <= _max_latency, f"invalid latency budget: {value}"
+        return value
+
+    def _validate_window(value: int):
+        assert isinstance(value, int)
+        assert 0 < value <= _max_window, f"invalid window: {value}"
+        return value
+
+    def _validate_heartbeat(value: float):
+        assert isinstance(value, float)
+        assert (0 == value) or (_min_heartbeat <= value <= _max_heartbeat), f"invalid heartbeat interval: {value}"
+        return value
+
+    class _Result(object):
+        framings = _framings
+        compressions = _compressions
+        default_latency = _default_latency
+        default_window = _default_window
+        validate_latency = _validate_latency
+        validate_window = _validate_window
+        default_heartbeat = _default_heartbeat
+        validate_heartbeat = _validate_heartbeat
+
+    return _Result
+
+
+_private = _private()
+try:
+    framings = _private.framings
+    compressions = _private.compressions
+    default_latency = _private.default_latency
+    default_window = _private.default_window
+    validate_latency = _private.validate_latency
+    validate_window = _private.validate_window
+    default_heartbeat = _private.default_heartbeat
+    validate_heartbeat = _private.validate_heartbeat
+finally: del _private
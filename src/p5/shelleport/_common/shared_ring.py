@@ -0,0 +1,238 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import mmap
+    import fcntl
+    import struct
+    import platform
+    import typing
+    import asyncio
+    import contextlib
+
+    from . import descriptor_passing as _descriptor_passing_module
+
+    _send_descriptors = _descriptor_passing_module.send
+    _receive_descriptors = _descriptor_passing_module.receive
+    _close_descriptors = _descriptor_passing_module.close_all
+
+    _capacity = 4 * 1024 * 1024
+    _capacity_limit = 64 * 1024 * 1024
+    _header_size = 64
+    _counter = struct.Struct("=Q")
+    _head_offset = 0
+    _tail_offset = 8
+    _closed_offset = 16
+    _required_seals = getattr(fcntl, "F_SEAL_SHRINK", 0) | getattr(fcntl, "F_SEAL_GROW", 0)
+    # head/tail are published with plain stores and python has no memory fences,
+    # so the ring relies on the total store order of x86 to keep them behind the data copy
+    _ordered_machines = frozenset(("x86_64", "amd64", "i386", "i686"))
+    _supported = all((
+        all(hasattr(os, _name) for _name in ("memfd_create", "eventfd")), hasattr(fcntl, "F_ADD_SEALS"),
+        platform.machine().lower() in _ordered_machines
+    ))
+
+    class _Ring(object):
+        @property
+        def capacity(self): return self.__capacity
+
+        @property
+        def closed(self): return 0 != self.__load(offset = _closed_offset)
+
+        def used(self):
+            _used = self.__load(offset = _head_offset) - self.__load(offset = _tail_offset)
+            if not (0 <= _used <= self.__capacity): raise ConnectionError("shared ring is corrupted")
+            return _used
+
+        def push(self, data: memoryview):
+            _head = self.__load(offset = _head_offset)
+            _size = min(len(data), self.__capacity - self.used())
+            if 0 >= _size: return 0
+            self.__copy_in(position = _head % self.__capacity, data = data[:_size])
+            self.__store(offset = _head_offset, value = _head + _size)
+            return _size
+
+        def pop_into(self, view: memoryview):
+            _tail = self.__load(offset = _tail_offset)
+            _size = min(len(view), self.used())
+            if 0 >= _size: return 0
+            self.__copy_out(position = _tail % self.__capacity, view = view[:_size])
+            self.__store(offset = _tail_offset, value = _tail + _size)
+            return _size
+
+        def close(self): self.__store(offset = _closed_offset, value = 1)
+
+        def release(self): self.__memory.release()
+
+        def __init__(self, memory: mmap.mmap, offset: int, capacity: int):
+            super().__init__()
+            self.__memory = memoryview(memory)
+            self.__offset = offset
+            self.__data = offset + _header_size
+            self.__capacity = capacity
+
+        def __load(self, offset: int): return _counter.unpack_from(self.__memory, self.__offset + offset)[0]
+
+        def __store(self, offset: int, value: int): _counter.pack_into(self.__memory, self.__offset + offset, value)
+
+        def __copy_in(self, position: int, data: memoryview):
+            _first = min(len(data), self.__capacity - position)
+            _start = self.__data + position
+            self.__memory[_start:_start + _first] = data[:_first]
+            if len(data) > _first: self.__memory[self.__data:self.__data + len(data) - _first] = data[_first:]
+
+        def __copy_out(self, position: int, view: memoryview):
+            _first = min(len(view), self.__capacity - position)
+            _start = self.__data + position
+            view[:_first] = self.__memory[_start:_start + _first]
+            if len(view) > _first: view[_first:] = self.__memory[self.__data:self.__data + len(view) - _first]
+
+    class _Endpoint(object):
+        async def read_into(self, view: memoryview):
+            assert isinstance(view, memoryview)
+            assert 0 < len(view)
+            while True:
+                self.__readable.clear()
+                _closed = self.__dead or self.__inbound.closed
+                if 0 < self.__inbound.used(): break
+                if _closed: return 0
+                await self.__readable.wait()
+            _size = self.__inbound.pop_into(view = view)
+            self.__signal()
+            return _size
+
+        async def write(self, data: typing.Iterable[bytes]):
+            for _chunk in data:
+                _chunk = memoryview(_chunk)
+                while _chunk:
+                    self.__writable.clear()
+                    if self.__dead: raise BrokenPipeError("shared ring peer is gone")
+                    _size = self.__outbound.push(data = _chunk)
+                    if 0 < _size:
+                        _chunk = _chunk[_size:]
+                        self.__signal()
+                        continue
+                    await self.__writable.wait()
+
+        def close(self):
+            self.__outbound.close()
+            self.__signal()
+
+        def __init__(self, inbound: _Ring, outbound: _Ring, wake: int, notify: int):
+            super().__init__()
+            self.__inbound = inbound
+            self.__outbound = outbound
+            self.__wake = wake
+            self.__notify = notify
+            self.__dead = False
+            self.__readable = asyncio.Event()
+            self.__writable = asyncio.Event()
+
+        def on_wake(self):
+            try: os.eventfd_read(self.__wake)
+            except BlockingIOError: pass
+            self.__readable.set()
+            self.__writable.set()
+
+        def on_hangup(self):
+            self.__dead = True
+            self.__readable.set()
+            self.__writable.set()
+
+        def __signal(self):
+            try: os.eventfd_write(self.__notify, 1)
+            except BlockingIOError: pass
+
+    def _create_descriptors():
+        _memory = os.memfd_create("shelleport-ring", os.MFD_CLOEXEC | os.MFD_ALLOW_SEALING)
+        _descriptors = [_memory]
+        try:
+            os.ftruncate(_memory, 2 * (_header_size + _capacity))
+            fcntl.fcntl(_memory, fcntl.F_ADD_SEALS, _required_seals | fcntl.F_SEAL_SEAL)
+            for _index in range(2): _descriptors.append(os.eventfd(0, os.EFD_CLOEXEC | os.EFD_NONBLOCK))
+        except BaseException:
+            _close_descriptors(descriptors = _descriptors)
+            raise
+        return tuple(_descriptors)
+
+    def _map(descriptor: int):
+        if _required_seals != (_required_seals & fcntl.fcntl(descriptor, fcntl.F_GET_SEALS)):
+            raise ConnectionError("unsealed ring memory")
+        _size = os.fstat(descriptor).st_size
+        _capacity = _size // 2 - _header_size
+        if (0 != _size % 2) or not (0 < _capacity <= _capacity_limit): raise ConnectionError(f"invalid ring size: {_size}")
+        return mmap.mmap(descriptor, _size), _capacity
+
+    async def _watch_coroutine(reader: asyncio.StreamReader):
+        while await reader.read(_header_size): pass
+
+    @contextlib.asynccontextmanager
+    async def _open_endpoint(
+        descriptors: typing.Tuple[int, int, int], outbound: int, reader: asyncio.StreamReader
+    ):
+        _loop = asyncio.get_running_loop()
+        _memory_descriptor, *_wakes = descriptors
+        try:
+            for _descriptor in _wakes: await asyncio.to_thread(os.set_blocking, _descriptor, False)
+            _memory, _size = await asyncio.to_thread(_map, _memory_descriptor)
+        except BaseException:
+            await asyncio.to_thread(_close_descriptors, descriptors = descriptors)
+            raise
+        _rings = [
+            _Ring(memory = _memory, offset = _index * (_header_size + _size), capacity = _size) for _index in range(2)
+        ]
+        try:
+            _endpoint = _Endpoint(
+                inbound = _rings[1 - outbound], outbound = _rings[outbound],
+                wake = _wakes[outbound], notify = _wakes[1 - outbound]
+            )
+            _watch_task = asyncio.create_task(_watch_coroutine(reader = reader))
+            _watch_task.add_done_callback(lambda _task: _endpoint.on_hangup())
+            _loop.add_reader(_wakes[outbound], _endpoint.on_wake)
+            try: yield _endpoint
+            finally:
+                _loop.remove_reader(_wakes[outbound])
+                _watch_task.cancel()
+                await asyncio.gather(_watch_task, return_exceptions = True)
+                _endpoint.close()
+        finally:
+            for _ring in _rings: _ring.release()
+            _memory.close()
+            await asyncio.to_thread(_close_descriptors, descriptors = descriptors)
+
+    @contextlib.asynccontextmanager
+    async def _open_client(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        assert _supported, "shared memory transport is not supported"
+        _descriptors = await asyncio.to_thread(_create_descriptors)
+        try: await asyncio.to_thread(
+            _send_descriptors, descriptor = writer.get_extra_info("socket").fileno(), descriptors = _descriptors
+        )
+        except BaseException:
+            await asyncio.to_thread(_close_descriptors, descriptors = _descriptors)
+            raise
+        async with _open_endpoint(descriptors = _descriptors, outbound = 0, reader = reader) as _endpoint: yield _endpoint
+
+    @contextlib.asynccontextmanager
+    async def _open_server(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        assert _supported, "shared memory transport is not supported"
+        _descriptors = await _receive_descriptors(descriptor = writer.get_extra_info("socket").fileno(), count = 3)
+        async with _open_endpoint(descriptors = _descriptors, outbound = 1, reader = reader) as _endpoint: yield _endpoint
+
+    class _Result(object):
+        supported = _supported
+        open_client = _open_client
+        open_server = _open_server
+
+    return _Result
+
+
+_private = _private()
+try:
+    supported = _private.supported
+    open_client = _private.open_client
+    open_server = _private.open_server
+finally: del _private
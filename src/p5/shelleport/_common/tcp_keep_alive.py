@@ -0,0 +1,38 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import socket
+
+    _idle = 30
+    _interval = 10
+    _count = 3
+    _families = frozenset(filter(None, (socket.AF_INET, getattr(socket, "AF_INET6", None))))
+    _options = tuple(
+        (_option, _value) for _option, _value in (
+            (getattr(socket, "TCP_KEEPIDLE", None), _idle),
+            (getattr(socket, "TCP_KEEPINTVL", None), _interval),
+            (getattr(socket, "TCP_KEEPCNT", None), _count)
+        ) if _option is not None
+    )
+
+    def _enable(value: socket.socket):
+        if value.family not in _families: return False
+        value.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+        for _option, _value in _options:
+            try: value.setsockopt(socket.IPPROTO_TCP, _option, _value)
+            except OSError: pass
+        return True
+
+    class _Result(object):
+        enable = _enable
+
+    return _Result
+
+
+_private = _private()
+try: enable = _private.enable
+finally: del _private
@@ -7,45 +7,59 @@ assert "__main__" != __name__
 def _private():
     import sys
     import atexit
+    import typing
 
     from . import _cli_parser as _cli_parser_module
 
     from .. import _modes as _modes_module
     from .. import _common as _common_module
 
-    _platform_info = _common_module.platform_info.make()
-
-    def _generate_modes():
-        for _module in (
-            _modes_module.client,
-            _modes_module.server
-        ): yield _module.make()
+    _Mode = _common_module.Mode
 
-    _modes = {_action.name: _action for _action in _generate_modes()}
+    _platform_info = _common_module.platform_info.make()
 
-    def _make_cli_parser():
+    _modes = {
+        "client": lambda: _modes_module.client.make(),
+        "server": lambda: _modes_module.server.make(),
+        "bench": lambda: _modes_module.bench.make()
+    }
+
+    def _select_mode(arguments: typing.List[str]):
+        if not arguments: return None
+        _factory = _modes.get(arguments[0])
+        if _factory is None: return None
+        _mode = _factory()
+        assert arguments[0] == _mode.name
+        return _mode
+
+    def _make_cli_parser(mode: typing.Optional[_Mode]):
         _root = _cli_parser_module.make()
         _subparsers = _root.subparsers
-        for _name, _action in _modes.items(): _action.setup_cli(parser = _subparsers.add_parser(_name))
+        for _name in _modes.keys():
+            _parser = _subparsers.add_parser(_name)
+            if (mode is not None) and (_name == mode.name): mode.setup_cli(parser = _parser)
         return _root
 
     def _routine():
-        _cli_parser = _make_cli_parser()
-        _help_message = _cli_parser.help()
+        _mode = _select_mode(arguments = sys.argv[1:])
+        _cli_parser = _make_cli_parser(mode = _mode)
 
         try:
             _parsed_cli = _cli_parser.parse()
-            _modes[_parsed_cli["action"]].validate_cli(arguments = _parsed_cli)
+            assert (_mode is not None) and (_parsed_cli["action"] == _mode.name)
+            _mode.validate_cli(arguments = _parsed_cli)
 
         except BaseException as _exception:
             if all((
                 _platform_info.tty,
                 (not isinstance(_exception, SystemExit)) or (0 != _exception.code)
-            )): atexit.register(lambda: print(_help_message, flush = True, file = sys.stderr))
+            )):
+                _help_message = _cli_parser.help()
+                atexit.register(lambda: print(_help_message, flush = True, file = sys.stderr))
             raise
 
         del _cli_parser
-        _modes[_parsed_cli["action"]](cli = _parsed_cli)
+        _mode(cli = _parsed_cli)
 
     class _Result(object):
         routine = _routine
@@ -11,6 +11,7 @@ def _private():
 
     class _Result(object):
         lazy_getter = _make_lazy_getter(dictionary = {
+            "Bench": lambda module: module.bench.Class,
             "Client": lambda module: module.client.Class,
             "Server": lambda module: module.server.Class
         })
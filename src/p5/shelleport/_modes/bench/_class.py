@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import typing
+    import argparse
+
+    from . import _logic as _logic_module
+    from ... import _common as _common_module
+
+    _name = __package__.split(".")[-1]
+    _name = _name.replace("_", "-")
+
+    _routine = _logic_module.routine
+    _transports = _logic_module.transports
+    _directions = _logic_module.directions
+    _protocol = _common_module.protocol.make()
+    _default_window = _common_module.flow_control.default_window
+    _validate_window = _common_module.flow_control.validate_window
+    _make_cli_validator = _common_module.cli_validator.make
+    _loop_implementations = _common_module.event_loop.implementations
+    _loop_environment_key = _common_module.event_loop.environment_key
+
+    class _Class(_common_module.Mode):
+        @property
+        def name(self) -> str: return _name
+
+        def setup_cli(self, parser: argparse.ArgumentParser):
+            assert isinstance(parser, argparse.ArgumentParser)
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-t", "--transport", required = False, choices = _transports,
+                help = "temporary server address type (`unix` as default, `tcp` for loopback)",
+                dest = f"{self.name}/transport", metavar = "TRANSPORT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):
+                if value is None: return "unix"
+                assert value in _transports
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-n", "--sessions", required = False, help = "total number of sessions (64 as default)",
+                dest = f"{self.name}/sessions", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return 64
+                value = int(value)
+                assert 1 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-c", "--concurrency", required = False, help = "concurrent sessions (4 as default)",
+                dest = f"{self.name}/concurrency", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return 4
+                value = int(value)
+                assert 1 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-s", "--payload", required = False, help = "payload bytes per session (16 MiB as default)",
+                dest = f"{self.name}/payload", metavar = "BYTES"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return 16 * 1024 * 1024
+                value = int(value)
+                assert 0 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-d", "--direction", required = False, choices = _directions,
+                help = "payload direction (`download` as default, `upload` or `echo`)",
+                dest = f"{self.name}/direction", metavar = "DIRECTION"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return "download"
+                assert value in _directions
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-f", "--framing", required = False, choices = _protocol.framings,
+                help = "protocol framing (`binary` as default)",
+                dest = f"{self.name}/framing", metavar = "FRAMING"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return "binary"
+                assert value in _protocol.framings
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-z", "--compression", required = False, choices = _protocol.compressions,
+                help = "compress channel data (disabled as default)",
+                dest = f"{self.name}/compression", metavar = "CODEC"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _protocol.compressions
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--window", required = False,
+                help = f"flow control window in bytes for both sides ({_default_window} as default)",
+                dest = f"{self.name}/window", metavar = "BYTES"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return _default_window
+                return _validate_window(value = int(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--write-latency", required = False,
+                help = "seconds small writes may wait to be coalesced on both sides (0 as default)",
+                dest = f"{self.name}/write-latency", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _protocol.validate_latency(value = float(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-w", "--warm", required = False, help = "pre-spawned server shells (0 as default)",
+                dest = f"{self.name}/warm", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return 0
+                value = int(value)
+                assert 0 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--loop", required = False, choices = _loop_implementations,
+                help = f"event loop implementation on both sides (`${_loop_environment_key}` or `asyncio` as default)",
+                dest = f"{self.name}/loop", metavar = "LOOP"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _loop_implementations
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-b", "--baseline", required = False, help = "previous report to compare against",
+                dest = f"{self.name}/baseline", metavar = "PATH"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert isinstance(value, str)
+                assert value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-o", "--output", required = False, help = "report path (standard output as default)",
+                dest = f"{self.name}/output", metavar = "PATH"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert isinstance(value, str)
+                assert value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                nargs = "*", help = "shell arguments (a command matching the direction as default)",
+                dest = f"{self.name}/arguments", metavar = "-- ARGUMENTS"
+            ).dest)
+            def _routine(value: typing.List[str]):  # noqa: F811
+                if value is None: return tuple()
+                assert isinstance(value, list)
+                for _item in value: assert isinstance(_item, str)
+                return tuple(value)
+
+        def validate_cli(self, arguments: dict):
+            assert isinstance(arguments, dict)
+            self.__cli_validator(arguments, allow_unknown = True)
+
+        def __call__(self, cli: dict):
+            assert isinstance(cli, dict)
+            _routine(
+                transport = cli[f"{self.name}/transport"], sessions = cli[f"{self.name}/sessions"],
+                concurrency = cli[f"{self.name}/concurrency"], payload = cli[f"{self.name}/payload"],
+                direction = cli[f"{self.name}/direction"], arguments = cli[f"{self.name}/arguments"],
+                framing = cli[f"{self.name}/framing"], compression = cli[f"{self.name}/compression"],
+                window = cli[f"{self.name}/window"], latency = cli[f"{self.name}/write-latency"],
+                warm = cli[f"{self.name}/warm"], baseline = cli[f"{self.name}/baseline"],
+                output = cli[f"{self.name}/output"], loop = cli[f"{self.name}/loop"]
+            )
+
+        def __init__(self):
+            super().__init__()
+            self.__cli_validator = _make_cli_validator()
+
+    class _Result(object):
+        Class = _Class
+
+    return _Result
+
+
+_private = _private()
+try: Class = _private.Class
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
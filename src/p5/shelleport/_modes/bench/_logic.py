@@ -0,0 +1,330 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import sys
+    import json
+    import time
+    import socket
+    import signal
+    import typing
+    import asyncio
+    import platform
+    import datetime
+    import resource
+    import tempfile
+    import traceback
+    import subprocess
+    import urllib.parse
+
+    from ..client import _logic as _client_logic_module
+    from ... import _common as _common_module
+
+    _executors = _common_module.asynchronous_tools.executor_registry.shared
+    _make_credit = _common_module.flow_control.make_credit
+    _make_window = _common_module.flow_control.make_window
+    _make_task_group = _common_module.asynchronous_tools.task_group.make
+    _run = _common_module.event_loop.run
+    _resolve_loop = _common_module.event_loop.resolve
+
+    _negotiate = _client_logic_module.negotiate
+    _open_protocol = _client_logic_module.open_protocol
+    _make_start_request = _client_logic_module.make_start_request
+
+    _format_version = 1
+    _chunk = bytes(64 * 1024)
+    _ready_timeout = +1.0e+1
+    _ready_step = +5.0e-2
+    _stop_timeout = +1.0e+1
+    _error_limit = 8
+    _loopback = "127.0.0.1"
+    _root_package = __name__.rsplit("._modes.", 1)[0]
+    _transports = ("unix", "tcp")
+    _directions = ("download", "upload", "echo")
+    _percentiles = (50, 90, 99)
+    _gibibyte = 1024 * 1024 * 1024
+
+    def _make_arguments(direction: str, payload: int):
+        assert direction in _directions
+        if "download" == direction: return "-c", f"head -c {payload} /dev/zero"
+        if "upload" == direction: return "-c", "cat > /dev/null"
+        return "-c", "cat"
+
+    def _make_peer(transport: str, directory: str):
+        assert transport in _transports
+        if "unix" == transport: return {"type": "unix", "path": os.path.join(directory, "server.sock")}
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as _socket:
+            _socket.bind((_loopback, 0))
+            _port = _socket.getsockname()[1]
+        return {"type": "tcp", "host": _loopback, "port": _port}
+
+    def _format_peer(peer: dict):
+        if "unix" == peer["type"]: return f"unix://{urllib.parse.quote(peer['path'])}"
+        return f"tcp://{peer['host']}:{peer['port']}"
+
+    def _spawn_server(peer: dict, window: int, latency: typing.Optional[float], warm: int, loop: str):
+        _options = ("--listen", _format_peer(peer = peer), "--window", str(window), "--loop", loop)
+        if latency is not None: _options = (*_options, "--write-latency", str(latency))
+        if 0 < warm: _options = (*_options, "--warm", str(warm))
+        return subprocess.Popen(
+            (sys.executable, "-m", _root_package, "server", *_options),
+            stdin = subprocess.DEVNULL, stdout = subprocess.DEVNULL, stderr = subprocess.DEVNULL
+        )
+
+    def _probe(peer: dict):
+        if "unix" == peer["type"]: _socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        else: _socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        with _socket:
+            try: _socket.connect(peer["path"] if "unix" == peer["type"] else (peer["host"], peer["port"]))
+            except (FileNotFoundError, ConnectionRefusedError): return False
+        return True
+
+    def _wait_ready(peer: dict, process: subprocess.Popen):
+        _deadline = _ready_timeout + time.monotonic()
+        while not _probe(peer = peer):
+            assert process.poll() is None, f"benchmark server exited with {process.returncode}"
+            assert time.monotonic() < _deadline, "benchmark server is not ready"
+            time.sleep(_ready_step)
+
+    def _stop_server(process: subprocess.Popen):
+        if process.poll() is not None: return
+        process.send_signal(signal.SIGINT)
+        try: process.wait(timeout = _stop_timeout)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+
+    def _cpu_seconds(usage: resource.struct_rusage): return usage.ru_utime + usage.ru_stime
+
+    def _peak_rss(usage: resource.struct_rusage):
+        if "darwin" == sys.platform: return usage.ru_maxrss
+        return 1024 * usage.ru_maxrss
+
+    def _summarize(values: typing.List[float]):
+        if not values: return None
+        values = sorted(values)
+        _result = {f"p{_rank}": values[min(len(values) - 1, (len(values) * _rank - 1) // 100)] for _rank in _percentiles}
+        _result["max"] = values[-1]
+        return _result
+
+    async def _session_coroutine(
+        peer: dict, request: dict, framing: str, compression: typing.Optional[str], latency: typing.Optional[float],
+        upload: int
+    ):
+        class _Context(object):
+            first = None
+            sent = 0
+            received = 0
+            stdin = True
+
+        _started = time.perf_counter()
+        async with _open_protocol(peer = peer, latency = latency) as (_reader, _writer, _framing, _socket, _):
+            _credit = _make_credit(window = await _negotiate(
+                reader = _reader, writer = _writer, request = request,
+                framing = framing, compression = compression, holder = _framing
+            ))
+            _accepted = time.perf_counter()
+            _windows = {_key: _make_window(size = request["window"]) for _key in ("stdout", "stderr")}
+
+            async def _write_coroutine():
+                _remaining = upload
+                while (0 < _remaining) and _Context.stdin:
+                    _blob = _chunk if len(_chunk) <= _remaining else _chunk[:_remaining]
+                    await _credit.acquire(size = len(_blob))
+                    if not _Context.stdin: break
+                    await _writer({"channel": "stdin", "blob": _blob})
+                    _Context.sent += len(_blob)
+                    _remaining -= len(_blob)
+                await _writer({"channel": "stdin"})
+
+            async def _read_coroutine():
+                async for _message in _reader:
+                    if "credit" in _message:
+                        _credit.grant(size = _message["credit"])
+                        continue
+                    try: _exception = _message.pop("exception")
+                    except KeyError: pass
+                    else: raise RuntimeError(f"remote exception received: {_exception}")
+                    try: _result = _message.pop("result")
+                    except KeyError: pass
+                    else:
+                        assert isinstance(_result, int)
+                        return _result
+                    _channel = _message["channel"]
+                    try: _blob = _message["blob"]
+                    except KeyError:
+                        if "stdin" == _channel: _Context.stdin = False
+                        continue
+                    if _Context.first is None: _Context.first = time.perf_counter()
+                    _Context.received += len(_blob)
+                    _windows[_channel].receive(size = len(_blob))
+                    _release = _windows[_channel].release(size = len(_blob))
+                    if 0 < _release: await _writer({"channel": _channel, "credit": _release})
+                raise ConnectionResetError("unexpected peer disconnect")
+
+            async with _make_task_group(lazy = True) as _task_group:
+                try:
+                    _read_task = _task_group.spawn(awaitable = _read_coroutine())
+                    _write_task = _task_group.spawn(awaitable = _write_coroutine())
+                    await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
+                    if _write_task.done(): await _write_task
+                    _result = await _read_task
+                finally: _task_group.cancel()
+
+        _finished = time.perf_counter()
+        return {
+            "result": _result, "start": _accepted - _started,
+            "first_byte": None if _Context.first is None else _Context.first - _started,
+            "duration": _finished - _started, "sent": _Context.sent, "received": _Context.received
+        }
+
+    async def _drive_coroutine(sessions: int, concurrency: int, delegate: typing.Callable[[], typing.Awaitable[dict]]):
+        class _Context(object):
+            started = 0
+            results = list()
+            errors = list()
+
+        async def _worker_coroutine():
+            while sessions > _Context.started:
+                _Context.started += 1
+                try: _Context.results.append(await delegate())
+                except (asyncio.CancelledError, KeyboardInterrupt): raise
+                except BaseException:
+                    if _error_limit > len(_Context.errors): _Context.errors.append(traceback.format_exc())
+                    _Context.results.append(None)
+
+        async with _make_task_group(lazy = True) as _task_group:
+            for _ in range(min(sessions, concurrency)): _task_group.spawn(awaitable = _worker_coroutine())
+        return _Context.results, _Context.errors
+
+    async def _coroutine(
+        transport: str, sessions: int, concurrency: int, payload: int, direction: str, arguments: typing.Iterable[str],
+        framing: str, compression: typing.Optional[str], window: int, latency: typing.Optional[float], warm: int,
+        loop: str
+    ):
+        asyncio.get_running_loop().set_default_executor(_executors.get())
+        _request = _make_start_request(export = tuple(), arguments = arguments, window = window)
+        _upload = 0 if "download" == direction else payload
+
+        with tempfile.TemporaryDirectory() as _directory:
+            _peer = _make_peer(transport = transport, directory = _directory)
+            _server_usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            _process = _spawn_server(peer = _peer, window = window, latency = latency, warm = warm, loop = loop)
+            try:
+                await asyncio.to_thread(_wait_ready, peer = _peer, process = _process)
+                _driver_usage = resource.getrusage(resource.RUSAGE_SELF)
+                _time = time.perf_counter()
+                _results, _errors = await _drive_coroutine(
+                    sessions = sessions, concurrency = concurrency, delegate = lambda: _session_coroutine(
+                        peer = _peer, request = _request, framing = framing, compression = compression,
+                        latency = latency, upload = _upload
+                    )
+                )
+                _wall = time.perf_counter() - _time
+                _driver_cpu = _cpu_seconds(usage = resource.getrusage(resource.RUSAGE_SELF))
+                _driver_cpu -= _cpu_seconds(usage = _driver_usage)
+            finally: await asyncio.to_thread(_stop_server, process = _process)
+            _usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+            _server_cpu = _cpu_seconds(usage = _usage) - _cpu_seconds(usage = _server_usage)
+
+        _completed = [_item for _item in _results if (_item is not None) and (0 == _item["result"])]
+        _bytes = sum(_item["sent"] + _item["received"] for _item in _results if _item is not None)
+        _volume = _bytes / _gibibyte
+        return {
+            "sessions": len(_results),
+            "failures": len(_results) - len(_completed),
+            "bytes": _bytes,
+            "wall_seconds": _wall,
+            "throughput": _bytes / _wall,
+            "sessions_per_second": len(_results) / _wall,
+            "start_latency": _summarize(values = [_item["start"] for _item in _completed]),
+            "first_byte_latency": _summarize(values = [
+                _item["first_byte"] for _item in _completed if _item["first_byte"] is not None
+            ]),
+            "session_duration": _summarize(values = [_item["duration"] for _item in _completed]),
+            "server_cpu_seconds": _server_cpu,
+            "driver_cpu_seconds": _driver_cpu,
+            "server_cpu_per_gib": (_server_cpu / _volume) if 0 < _bytes else None,
+            "driver_cpu_per_gib": (_driver_cpu / _volume) if 0 < _bytes else None,
+            "server_peak_rss": _peak_rss(usage = _usage)
+        }, _errors
+
+    def _flatten(value: dict, prefix: str = ""):
+        for _key, _value in value.items():
+            if isinstance(_value, dict): yield from _flatten(value = _value, prefix = f"{prefix}{_key}.")
+            elif isinstance(_value, (int, float)) and (not isinstance(_value, bool)): yield f"{prefix}{_key}", _value
+
+    def _load_baseline(path: typing.Optional[str]):
+        if path is None: return None
+        with open(path, "r") as _stream: _baseline = json.load(_stream)
+        assert isinstance(_baseline, dict)
+        assert _format_version == _baseline.get("version"), "unsupported baseline format"
+        return _baseline
+
+    def _compare(results: dict, baseline: dict):
+        _baseline = dict(_flatten(value = baseline["results"]))
+        _comparison = dict()
+        for _key, _value in _flatten(value = results):
+            _previous = _baseline.get(_key)
+            if not _previous: continue
+            _comparison[_key] = {"baseline": _previous, "ratio": _value / _previous}
+        return _comparison
+
+    def _print_summary(results: dict, comparison: typing.Optional[dict]):
+        for _key, _value in _flatten(value = results):
+            _line = f"{_key:<32} {_value:18.6f}"
+            if (comparison is not None) and (_key in comparison): _line = f"{_line} {comparison[_key]['ratio']:8.3f}x"
+            print(_line, file = sys.stderr, flush = True)
+
+    def _routine(
+        baseline: typing.Optional[str], output: typing.Optional[str], loop: typing.Optional[str] = None, **kwargs
+    ):
+        _baseline = _load_baseline(path = baseline)
+        if not kwargs["arguments"]: kwargs["arguments"] = _make_arguments(
+            direction = kwargs["direction"], payload = kwargs["payload"]
+        )
+        kwargs["loop"] = _resolve_loop(value = loop)
+        _results, _errors = _run(_coroutine(**kwargs), loop = kwargs["loop"])
+        for _error in _errors: print(_error, file = sys.stderr, flush = True)
+        _report = {
+            "version": _format_version,
+            "time": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "implementation": platform.python_implementation(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+            "configuration": {**kwargs, "arguments": list(kwargs["arguments"])},
+            "results": _results
+        }
+        _comparison = None
+        if _baseline is not None:
+            _comparison = _compare(results = _results, baseline = _baseline)
+            _report["comparison"] = _comparison
+            if _baseline.get("configuration") != _report["configuration"]: print(
+                "baseline configuration differs", file = sys.stderr, flush = True
+            )
+        _print_summary(results = _results, comparison = _comparison)
+        _report = json.dumps(_report, indent = 2, sort_keys = True)
+        if output is None: print(_report, flush = True)
+        else:
+            with open(output, "w") as _stream: print(_report, file = _stream)
+        if 0 < _results["failures"]: exit(1)
+
+    class _Result(object):
+        routine = _routine
+        transports = _transports
+        directions = _directions
+
+    return _Result
+
+
+_private = _private()
+try:
+    routine = _private.routine
+    transports = _private.transports
+    directions = _private.directions
+finally: del _private
@@ -9,16 +9,24 @@ def _private():
     import typing
     import argparse
 
-    from . import _logic as _logic_module
+    from . import _preconnect as _preconnect_module
     from ... import _common as _common_module
 
     _name = __package__.split(".")[-1]
     _name = _name.replace("_", "-")
 
+    _protocol_options = _common_module.protocol_options
     _parse_address = _common_module.parse_address
+    _default_window = _protocol_options.default_window
+    _validate_window = _protocol_options.validate_window
     _make_cli_validator = _common_module.cli_validator.make
+    _loop_implementations = _common_module.event_loop.implementations
+    _loop_environment_key = _common_module.event_loop.environment_key
 
-    _routine = _logic_module.routine
+    _start_preconnect = _preconnect_module.start
+    _import_module = _common_module.module_helpers.import_module
+
+    def _import_routine(name: str): return _import_module(name = f"{__package__}.{name}").routine
 
     class _Class(_common_module.Mode):
         @property
@@ -48,6 +56,143 @@ def _private():
                     except Exception: raise ValueError(_variable)
                 return tuple(value)
 
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-f", "--framing", required = False, choices = _protocol_options.framings,
+                help = "protocol framing (`json` as default and for legacy servers, `binary` as default for raw passthrough)",
+                dest = f"{self.name}/framing", metavar = "FRAMING"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _protocol_options.framings
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-z", "--compression", required = False, choices = _protocol_options.compressions,
+                help = "compress channel data (disabled as default)",
+                dest = f"{self.name}/compression", metavar = "CODEC"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _protocol_options.compressions
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--window", required = False,
+                help = f"stdout/stderr flow control window in bytes (off as default, {_default_window} when multiplexing)",
+                dest = f"{self.name}/window", metavar = "BYTES"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _validate_window(value = int(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--write-latency", required = False,
+                help = "seconds small writes may wait to be coalesced (0 as default)",
+                dest = f"{self.name}/write-latency", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _protocol_options.validate_latency(value = float(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--heartbeat", required = False,
+                help = (
+                    f"keep-alive interval to negotiate ({_protocol_options.default_heartbeat} as default,"
+                    " 0 relies on tcp keepalive and stream end only)"
+                ),
+                dest = f"{self.name}/heartbeat", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _protocol_options.validate_heartbeat(value = float(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-m", "--multiplex", action = "store_true", help = "run the session over a multiplexed connection",
+                dest = f"{self.name}/multiplex"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-r", "--raw", action = "store_true",
+                help = "splice remote stdout/stderr straight to local descriptors (stdin is not forwarded)",
+                dest = f"{self.name}/raw"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-d", "--pass-stdio", action = "store_true",
+                help = "hand local stdio descriptors to the remote command (unix peers only)",
+                dest = f"{self.name}/pass-stdio"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--shared-memory", action = "store_true",
+                help = "carry the protocol over shared memory rings (unix peers only, falls back to the socket)",
+                dest = f"{self.name}/shared-memory"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-c", "--control", required = False, help = "control master socket path (started on demand)",
+                dest = f"{self.name}/control", metavar = "PATH"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert isinstance(value, str)
+                assert value
+                assert 1 == len(f"{value}\r\n".splitlines())
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--control-master", action = "store_true", help = "serve the control socket (normally started on demand)",
+                dest = f"{self.name}/control-master"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--control-persist", required = False, help = "control master idle lifetime in seconds (300 as default)",
+                dest = f"{self.name}/control-persist", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return +3.0e+2
+                value = float(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--loop", required = False, choices = _loop_implementations,
+                help = f"event loop implementation (`${_loop_environment_key}` or `asyncio` as default)",
+                dest = f"{self.name}/loop", metavar = "LOOP"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _loop_implementations
+                return value
+
             # noinspection PyShadowingNames
             @self.__cli_validator.decorator(key = parser.add_argument(
                 nargs = 1, help = "peer address",
@@ -74,13 +219,57 @@ def _private():
         def validate_cli(self, arguments: dict):
             assert isinstance(arguments, dict)
             self.__cli_validator(arguments, allow_unknown = True)
+            if arguments[f"{self.name}/framing"] is None:
+                arguments[f"{self.name}/framing"] = "binary" if arguments[f"{self.name}/raw"] else "json"
+            if arguments[f"{self.name}/control-master"]:
+                assert arguments[f"{self.name}/control"] is not None, "control master requires control socket path"
+            if arguments[f"{self.name}/raw"]:
+                assert arguments[f"{self.name}/control"] is None, "raw passthrough excludes control master"
+                assert not arguments[f"{self.name}/multiplex"], "raw passthrough excludes multiplexing"
+                assert arguments[f"{self.name}/compression"] is None, "raw passthrough excludes compression"
+                assert "binary" == arguments[f"{self.name}/framing"], "raw passthrough requires binary framing"
+            if arguments[f"{self.name}/pass-stdio"]:
+                assert "unix" == arguments[f"{self.name}/peer"]["type"], "descriptor passing requires a unix peer"
+                assert arguments[f"{self.name}/control"] is None, "descriptor passing excludes control master"
+                assert not arguments[f"{self.name}/multiplex"], "descriptor passing excludes multiplexing"
+                assert not arguments[f"{self.name}/raw"], "descriptor passing excludes raw passthrough"
+            if arguments[f"{self.name}/shared-memory"]:
+                assert "unix" == arguments[f"{self.name}/peer"]["type"], "shared memory transport requires a unix peer"
+                assert arguments[f"{self.name}/control"] is None, "shared memory transport excludes control master"
+                assert not arguments[f"{self.name}/raw"], "shared memory transport excludes raw passthrough"
+                assert not arguments[f"{self.name}/pass-stdio"], "shared memory transport excludes descriptor passing"
 
         def __call__(self, cli: dict):
             assert isinstance(cli, dict)
             _peer = cli[f"{self.name}/peer"]
             _export = cli[f"{self.name}/export"]
+            _framing = cli[f"{self.name}/framing"]
+            _compression = cli[f"{self.name}/compression"]
             _arguments = cli[f"{self.name}/arguments"]
-            _routine(peer = _peer, export = _export, arguments = _arguments)
+            _control = cli[f"{self.name}/control"]
+            _multiplex = cli[f"{self.name}/multiplex"]
+            _window = cli[f"{self.name}/window"]
+            _latency = cli[f"{self.name}/write-latency"]
+            _heartbeat = cli[f"{self.name}/heartbeat"]
+            _loop = cli[f"{self.name}/loop"]
+            if _control is None:
+                _start_preconnect(peer = _peer)
+                return _import_routine(name = "_logic")(
+                    peer = _peer, export = _export, arguments = _arguments, framing = _framing,
+                    compression = _compression, multiplex = _multiplex, window = _window, latency = _latency,
+                    raw = cli[f"{self.name}/raw"], descriptors = cli[f"{self.name}/pass-stdio"],
+                    ring = cli[f"{self.name}/shared-memory"], loop = _loop, heartbeat = _heartbeat
+                )
+            _persist = cli[f"{self.name}/control-persist"]
+            if cli[f"{self.name}/control-master"]: return _import_routine(name = "_master")(
+                control = _control, peer = _peer, framing = _framing, compression = _compression, latency = _latency,
+                persist = _persist, loop = _loop, heartbeat = _heartbeat
+            )
+            _import_routine(name = "_control")(
+                control = _control, peer = _peer, export = _export, arguments = _arguments, framing = _framing,
+                compression = _compression, latency = _latency, persist = _persist, window = _window, loop = _loop,
+                heartbeat = _heartbeat
+            )
 
         def __init__(self):
             super().__init__()
@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import sys
+    import json
+    import time
+    import socket
+    import typing
+    import subprocess
+    import urllib.parse
+
+    from . import _logic as _logic_module
+    from . import _master as _master_module
+    from ... import _common as _common_module
+
+    _make_start_request = _logic_module.make_start_request
+    _busy_exit_code = _logic_module.busy_exit_code
+    _default_window = _common_module.protocol_options.default_window
+
+    _request_header = _master_module.request_header
+    _ready_message = _master_module.ready_message
+    _connect_timeout = +1.0e+1
+    _connect_step = +5.0e-2
+    _root_package = __name__.rsplit("._modes.", 1)[0]
+
+    def _connect(path: str):
+        _socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try: _socket.connect(path)
+        except (FileNotFoundError, ConnectionRefusedError):
+            _socket.close()
+            return None
+        except BaseException:
+            _socket.close()
+            raise
+        return _socket
+
+    def _format_peer(peer: dict):
+        if "unix" == peer["type"]: return f"unix://{urllib.parse.quote(peer['path'])}"
+        assert "tcp" == peer["type"]
+        _host = peer["host"]
+        if ":" in _host: _host = f"[{_host}]"
+        return f"tcp://{_host}:{peer['port']}"
+
+    def _spawn_master(
+        control: str, peer: dict, framing: str, compression: typing.Optional[str], latency: typing.Optional[float],
+        persist: float, loop: typing.Optional[str] = None, heartbeat: typing.Optional[float] = None
+    ):
+        _options = ("--framing", framing)
+        if compression is not None: _options = (*_options, "--compression", compression)
+        if latency is not None: _options = (*_options, "--write-latency", str(latency))
+        if heartbeat is not None: _options = (*_options, "--heartbeat", str(heartbeat))
+        if loop is not None: _options = (*_options, "--loop", loop)
+        _process = subprocess.Popen(
+            (
+                sys.executable, "-m", _root_package, "client",
+                "--control", control, "--control-master", "--control-persist", str(persist),
+                *_options, _format_peer(peer = peer)
+            ),
+            stdin = subprocess.DEVNULL, stdout = subprocess.PIPE, stderr = subprocess.DEVNULL, start_new_session = True
+        )
+        with _process.stdout as _stream: _output = _stream.read()
+        if _ready_message == _output: return None
+        try: _process.wait(timeout = _connect_timeout)
+        except subprocess.TimeoutExpired: pass
+        return _output.decode("utf-8", errors = "replace")
+
+    def _open_master(
+        control: str, peer: dict, framing: str, compression: typing.Optional[str], latency: typing.Optional[float],
+        persist: float, loop: typing.Optional[str] = None, heartbeat: typing.Optional[float] = None
+    ):
+        _socket = _connect(path = control)
+        if _socket is not None: return _socket
+        _output = _spawn_master(
+            control = control, peer = peer, framing = framing, compression = compression, latency = latency,
+            persist = persist, loop = loop, heartbeat = heartbeat
+        )
+        _deadline = _connect_timeout + time.monotonic()
+        while True:
+            _socket = _connect(path = control)
+            if _socket is not None: return _socket
+            if (_output is not None) or (time.monotonic() > _deadline): break
+            time.sleep(_connect_step)
+        if _output: print(_output, file = sys.stderr, flush = True)
+        raise ConnectionError(f"failed to start control master: {control}")
+
+    def _receive_response(connection: socket.socket):
+        _chunks = list()
+        while True:
+            _chunk = connection.recv(64 * 1024)
+            if not _chunk: break
+            _chunks.append(_chunk)
+        _data = bytes().join(_chunks)
+        if not _data: raise ConnectionResetError("control master closed the connection")
+        _size, = _request_header.unpack_from(_data)
+        assert len(_data) == _request_header.size + _size
+        _response = json.loads(_data[_request_header.size:].decode("utf-8"))
+        assert isinstance(_response, dict)
+        return _response
+
+    def _routine(
+        control: str, peer: dict, export: typing.Iterable[str], arguments: typing.Iterable[str],
+        framing: str, compression: typing.Optional[str], latency: typing.Optional[float], persist: float,
+        window: typing.Optional[int], loop: typing.Optional[str] = None, heartbeat: typing.Optional[float] = None
+    ):
+        if window is None: window = _default_window
+        _request = json.dumps({
+            "peer": peer, "request": _make_start_request(export = export, arguments = arguments, window = window)
+        }).encode("utf-8")
+        with _open_master(
+            control = control, peer = peer, framing = framing, compression = compression, latency = latency,
+            persist = persist, loop = loop, heartbeat = heartbeat
+        ) as _connection:
+            _descriptors = (sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno())
+            socket.send_fds(_connection, (_request_header.pack(len(_request)), ), _descriptors)
+            _connection.sendall(_request)
+            _response = _receive_response(connection = _connection)
+        if {"busy": True} == _response:
+            print("server is busy", file = sys.stderr, flush = True)
+            exit(_busy_exit_code)
+        try: _exception = _response.pop("exception")
+        except KeyError: pass
+        else:
+            assert isinstance(_exception, str)
+            print(_exception, file = sys.stderr, flush = True)
+            raise RuntimeError("control master exception received")
+        _result = _response.pop("result")
+        assert isinstance(_result, int)
+        assert not _response
+        exit(_result)
+
+    class _Result(object):
+        routine = _routine
+
+    return _Result
+
+
+_private = _private()
+try: routine = _private.routine
+finally: del _private
@@ -7,22 +7,45 @@ assert "__main__" != __name__
 def _private():
     import os
     import sys
+    import signal
     import typing
     import asyncio
     import contextlib
 
     from . import _channel as _channel_module
+    from . import _preconnect as _preconnect_module
     from ... import _common as _common_module
 
     _Channel = _channel_module.Class
+    _Credit = _common_module.flow_control.Credit
+    _Window = _common_module.flow_control.Window
+    _Multiplexer = _common_module.multiplexer.Class
     _IterationController = _common_module.asynchronous_tools.IterationController
 
     _protocol = _common_module.protocol.make()
+    _make_credit = _common_module.flow_control.make_credit
+    _make_window = _common_module.flow_control.make_window
+    _validate_window = _common_module.flow_control.validate_window
+    _default_window = _common_module.flow_control.default_window
+    _validate_heartbeat = _common_module.protocol_options.validate_heartbeat
+    _enable_keep_alive = _common_module.tcp_keep_alive.enable
     _make_channel = _channel_module.make
+    _make_multiplexer = _common_module.multiplexer.make
     _make_task_group = _common_module.asynchronous_tools.task_group.make
-    _make_thread_pool = _common_module.asynchronous_tools.thread_pool.make
-
-    def _make_start_request(export: typing.Iterable[str], arguments: typing.Iterable[str]):
+    _executors = _common_module.asynchronous_tools.executor_registry.shared
+    _passthrough = _common_module.passthrough
+    _send_descriptors = _common_module.descriptor_passing.send
+    _open_ring_client = _common_module.shared_ring.open_client
+    _ring_supported = _common_module.shared_ring.supported
+    _run = _common_module.event_loop.run
+    _take_preconnected = _preconnect_module.take
+    _busy_exit_code = getattr(os, "EX_TEMPFAIL", 75)
+
+    class _BusyError(ConnectionRefusedError): pass
+
+    def _make_start_request(
+        export: typing.Iterable[str], arguments: typing.Iterable[str], window: typing.Optional[int] = None
+    ):
         _environment = dict()
         for _value in export:
             assert isinstance(_value, str)
@@ -38,18 +61,40 @@ def _private():
             if _value is None: _value = os.environ[_key]
             _environment[_key] = _value
         for _argument in arguments: assert isinstance(_argument, str)
-        return {"environment": _environment, "arguments": arguments}
+        _request = {"environment": _environment, "arguments": arguments}
+        if window is not None: _request["window"] = _validate_window(value = window)
+        return _request
+
+    def _with_options(
+        request: dict, framing: str, compression: typing.Optional[str], heartbeat: typing.Optional[float] = None,
+        ring: bool = False
+    ):
+        assert isinstance(request, dict)
+        assert framing in _protocol.framings
+        if "json" != framing: request = {**request, "framing": framing}
+        if heartbeat is not None: request = {**request, "heartbeat": _validate_heartbeat(value = heartbeat)}
+        if ring: request = {**request, "shared-memory": True}
+        if compression is None: return request
+        assert compression in _protocol.compressions
+        return {**request, "compression": compression}
 
     @contextlib.asynccontextmanager
     async def _open_peer(peer: dict):
         assert isinstance(peer, dict)
-        _action = {
+        _socket = await asyncio.to_thread(lambda: _take_preconnected(peer = peer))
+        if _socket is not None: _action = {
+            "unix": lambda: asyncio.open_unix_connection(sock = _socket),
+            "tcp": lambda: asyncio.open_connection(sock = _socket)
+        }[peer["type"]]
+        else: _action = {
             "unix": lambda: asyncio.open_unix_connection(path = peer["path"]),
             "tcp": lambda: asyncio.open_connection(host = peer["host"], port = peer["port"])
         }[peer["type"]]
         try: _reader, _writer = await _action()
         except Exception: raise ConnectionError(peer)
-        try: yield _reader, _writer
+        try:
+            if "tcp" == peer["type"]: _enable_keep_alive(value = _writer.get_extra_info("socket"))
+            yield _reader, _writer
         finally: _writer.close()
 
     def _do_all(actions: typing.Iterable[typing.Callable]):
@@ -66,6 +111,12 @@ def _private():
 
         while _iteration(): pass
 
+    @contextlib.asynccontextmanager
+    async def _open_channel(*args, **kwargs):
+        async with _make_channel(*args, **kwargs) as _channel:
+            await _channel.open()
+            yield _channel
+
     @contextlib.asynccontextmanager
     async def _open_stdio():
         _descriptors = set()
@@ -84,38 +135,101 @@ def _private():
             _descriptors.add(_descriptor)
             yield lambda: os.close(_descriptor)
 
-        @contextlib.asynccontextmanager
-        async def _open_channel(*args, **kwargs):
-            async with _make_channel(*args, **kwargs) as _channel:
-                await _channel.open()
-                yield _channel
+        _thread_pool = _executors.get(name = "io")
 
-        with _make_thread_pool(max_workers = 1) as _thread_pool:
-            async def _make_cleaner(streams: typing.Iterable[typing.IO]):
-                _actions = await _thread_pool(lambda: tuple(_catch_streams(streams = streams)))
-                return lambda: _thread_pool(_do_all, actions = _actions)
+        async def _make_cleaner(streams: typing.Iterable[typing.IO]):
+            _actions = await _thread_pool(lambda: tuple(_catch_streams(streams = streams)))
+            return lambda: _thread_pool(_do_all, actions = _actions)
 
-            _thread_pool.open()
+        _stdin_cleaner = await _make_cleaner(streams = (sys.stdin.buffer, sys.stdin))
+        _stdout_cleaner = await _make_cleaner(streams = (sys.stdout.buffer, sys.stdout))
 
-            _stdin_cleaner = await _make_cleaner(streams = (sys.stdin.buffer, sys.stdin))
-            _stdout_cleaner = await _make_cleaner(streams = (sys.stdout.buffer, sys.stdout))
+        async with (
+            _open_channel(stream = sys.stdin, mode = "r", cleaner = _stdin_cleaner) as _stdin,
+            _open_channel(stream = sys.stdout, mode = "w", cleaner = _stdout_cleaner) as _stdout,
+            _open_channel(stream = sys.stderr, mode = "w") as _stderr
+        ): yield _stdin, _stdout, _stderr
 
-            async with (
-                _open_channel(stream = sys.stdin, mode = "r", cleaner = _stdin_cleaner) as _stdin,
-                _open_channel(stream = sys.stdout, mode = "w", cleaner = _stdout_cleaner) as _stdout,
-                _open_channel(stream = sys.stderr, mode = "w") as _stderr
-            ): yield _stdin, _stdout, _stderr
-
-    def _check_accepted_response(value: dict):
-        assert isinstance(value, dict)
-        assert value
+    @contextlib.asynccontextmanager
+    async def _open_descriptors(stdin: int, stdout: int, stderr: int):
+        _thread_pool = _executors.get(name = "io")
+
+        def _make_cleaner(descriptor: int):
+            assert isinstance(descriptor, int)
+            assert 0 <= descriptor
+            return lambda: _thread_pool(os.close, descriptor)
+
+        async with (
+            _open_channel(stream = stdin, mode = "r", cleaner = _make_cleaner(descriptor = stdin)) as _stdin,
+            _open_channel(stream = stdout, mode = "w", cleaner = _make_cleaner(descriptor = stdout)) as _stdout,
+            _open_channel(stream = stderr, mode = "w", cleaner = _make_cleaner(descriptor = stderr)) as _stderr
+        ): yield _stdin, _stdout, _stderr
+
+    def _check_accepted_response(
+        value: dict, framing: str = "json", multiplex: bool = False, compression: typing.Optional[str] = None,
+        window: bool = False, raw: bool = False, descriptors: bool = False, heartbeat: typing.Optional[float] = None,
+        ring: bool = False
+    ):
+        if not isinstance(value, dict): raise ConnectionError("unexpected handshake reply")
+        if {"busy": True} == value: raise _BusyError("server is busy")
+        _exception = value.get("exception")
+        if isinstance(_exception, str): raise ConnectionRefusedError(f"request rejected by server:\n{_exception}")
         value = value.copy()
-        assert value.pop("accepted") is True
-        assert not value
+
+        def _expect(key: str, expected):
+            if value.pop(key, None) != expected: raise ConnectionError(f"unexpected handshake reply: {key}")
+
+        _expect(key = "accepted", expected = True)
+        if multiplex: _expect(key = "multiplex", expected = True)
+        if "json" != framing: _expect(key = "framing", expected = framing)
+        if compression is not None: _expect(key = "compression", expected = compression)
+        if heartbeat is not None: _expect(key = "heartbeat", expected = heartbeat)
+        if raw: _expect(key = "raw", expected = True)
+        if descriptors: _expect(key = "descriptors", expected = True)
+        if window: window = value.pop("window", None)
+        else: window = None
+        if window is not None: window = _validate_window(value = window)
+        if ring: ring = value.pop("shared-memory", False)
+        if not isinstance(ring, bool): raise ConnectionError("unexpected handshake reply: shared-memory")
+        if value: raise ConnectionError(f"unexpected handshake reply: {', '.join(sorted(value.keys()))}")
+        return window, ring
+
+    async def _negotiate(
+        reader: typing.AsyncIterator[dict], writer: typing.Callable, request: dict,
+        framing: str = "json", compression: typing.Optional[str] = None, holder: typing.Optional[type] = None,
+        handshake: typing.Optional[typing.Callable[[], typing.Awaitable]] = None, heartbeat: typing.Optional[float] = None,
+        ring: typing.Optional[typing.Callable[[], typing.Awaitable]] = None
+    ):
+        if (holder is not None) and (heartbeat is not None): holder.heartbeat = heartbeat
+        await writer(message = _with_options(
+            request = request, framing = framing, compression = compression, heartbeat = heartbeat,
+            ring = ring is not None
+        ))
+        if holder is not None: holder.writer = framing
+
+        async def _receive():
+            _response = await _IterationController.anext(target = reader)
+            return await asyncio.to_thread(lambda: _check_accepted_response(
+                value = _response, framing = framing, multiplex = "multiplex" in request, compression = compression,
+                window = "window" in request, raw = request.get("raw", False),
+                descriptors = request.get("descriptors", False), heartbeat = heartbeat, ring = ring is not None
+            ))
+
+        if (handshake is None) and (ring is None): _window, _ = await _receive()
+        else:
+            async with writer.hold():
+                _window, _ring = await _receive()
+                if _ring: await ring()
+                if handshake is not None: await handshake()
+        if holder is not None:
+            holder.reader = framing
+            holder.compression = compression
+        return _window
 
     async def _read_coroutine(
         reader: typing.AsyncIterable[dict], writer: typing.Callable,
-        stdin: _Channel, stdout: _Channel, stderr: _Channel
+        stdin: _Channel, stdout: _Channel, stderr: _Channel,
+        credit: typing.Optional[_Credit] = None, windows: typing.Optional[typing.Dict[str, _Window]] = None
     ):
         _result = None
         _closed = set()
@@ -136,9 +250,22 @@ def _private():
                 yield _item
             async for _item in reader: raise OverflowError(f"unexpected message: {_item}")
 
+        async def _return_credit(key: str, size: int):
+            if windows is None: return
+            _credit = windows[key].release(size = size)
+            if 0 >= _credit: return
+            try: await writer({"channel": key, "credit": _credit})
+            except (BrokenPipeError, ConnectionResetError): pass
+
         async for _message in _generator():
             assert isinstance(_message, dict)
             assert _message, "empty message"
+            if "credit" in _message:
+                assert {"channel", "credit"} == _message.keys(), "invalid message"
+                assert credit is not None, "flow control is not negotiated"
+                assert "stdin" == _message["channel"]
+                credit.grant(size = _message["credit"])
+                continue
             try: _exception = _message.pop("exception")
             except KeyError: pass
             else:
@@ -165,33 +292,37 @@ def _private():
                 _closed.add(_channel_key)
                 if _channel.state: await _channel.close()
                 continue
-            assert isinstance(_blob, bytes)
+            assert isinstance(_blob, (bytes, memoryview))
             assert _blob
             assert _channel is not stdin
-            if not _channel.state: continue
-            try: await _channel(data = _blob)
-            except BrokenPipeError: await writer({"channel": _channel_key})
+            if windows is not None: windows[_channel_key].receive(size = len(_blob))
+            if _channel.state:
+                try: await _channel(data = _blob)
+                except BrokenPipeError: await writer({"channel": _channel_key})
+            await _return_credit(key = _channel_key, size = len(_blob))
 
         if _exception is not None:
             assert isinstance(_exception, str)
             assert _exception
-            print(_exception, file = sys.stderr, flush = True)
+            if stderr.state: await stderr(data = f"{_exception}\n".encode("utf-8"))
+            else: print(_exception, file = sys.stderr, flush = True)
             try: raise RuntimeError("remote exception received")
             finally: assert _result is None
 
         assert isinstance(_result, int), "unexpected peer disconnect"
         return _result
 
-    async def _write_coroutine(peer: typing.Callable, stdin: _Channel):
+    async def _write_coroutine(peer: typing.Callable, stdin: _Channel, credit: typing.Optional[_Credit] = None):
         assert isinstance(stdin, _Channel)
 
         _peer_state = True
 
         try:
             while True:
-                _blob = await stdin()
+                _blob = await stdin(size = None if credit is None else credit.window)
                 assert isinstance(_blob, bytes)
                 if not _blob: break
+                if credit is not None: await credit.acquire(size = len(_blob))
                 _peer_state = False
                 try: await peer({"channel": "stdin", "blob": _blob})
                 except (BrokenPipeError, ConnectionResetError): break
@@ -205,60 +336,242 @@ def _private():
 
             finally: await stdin.close()
 
-    async def _coroutine(peer: dict, export: typing.Iterable[str], arguments: typing.Iterable[str]):
-        _start_request = await asyncio.to_thread(lambda: _make_start_request(export = export, arguments = arguments))
-        async with _open_peer(peer = peer) as (_peer_reader, _peer_writer):
+    async def _session_coroutine(
+        reader: typing.AsyncIterator[dict], writer: typing.Callable,
+        stdin: _Channel, stdout: _Channel, stderr: _Channel,
+        window: typing.Optional[int] = None, credit: typing.Optional[int] = None
+    ):
+        _result = None
+        _windows = None
+        if window is not None: _windows = {_key: _make_window(size = window) for _key in ("stdout", "stderr")}
+        if credit is not None: credit = _make_credit(window = credit)
+
+        async with _make_task_group(lazy = True) as _task_group:
+            try:
+                _read_task = _task_group.spawn(awaitable = _read_coroutine(
+                    reader = reader, writer = writer, stdin = stdin, stdout = stdout, stderr = stderr,
+                    credit = credit, windows = _windows
+                ))
+                _write_task = _task_group.spawn(awaitable = _write_coroutine(peer = writer, stdin = stdin, credit = credit))
+                await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
+                if _write_task.done(): await _write_task
+                _result = await _read_task
+            finally: _task_group.cancel()
+
+        assert isinstance(_result, int)
+        return _result
+
+    def _parse_final_message(message: dict):
+        assert isinstance(message, dict)
+        message = message.copy()
+        try: _exception = message.pop("exception")
+        except KeyError: pass
+        else:
+            assert not message
+            assert isinstance(_exception, str)
+            print(_exception, file = sys.stderr, flush = True)
+            raise RuntimeError("remote exception received")
+        _result = message.pop("result")
+        assert isinstance(_result, int)
+        assert not message, f"unexpected message: {message}"
+        return _result
+
+    async def _raw_session_coroutine(writer: typing.Callable, open_socket: typing.Callable):
+        async with open_socket() as _descriptor:
+            await writer({"raw": True})
+            try: _message = await _passthrough.receive(source = _descriptor, destinations = {
+                "stdout": sys.stdout.fileno(), "stderr": sys.stderr.fileno()
+            })
+            except BrokenPipeError: return 128 + signal.SIGPIPE
+        return _parse_final_message(message = _message)
+
+    async def _stdio_session_coroutine(reader: typing.AsyncIterator[dict]):
+        async for _message in reader: return _parse_final_message(message = _message)
+        raise ConnectionResetError("unexpected peer disconnect")
+
+    async def _pass_stdio(open_socket: typing.Callable):
+        _stdio = (sys.stdin.fileno(), sys.stdout.fileno(), sys.stderr.fileno())
+        async with open_socket() as _descriptor: await asyncio.to_thread(lambda: _send_descriptors(
+            descriptor = _descriptor, descriptors = _stdio
+        ))
+
+    @contextlib.asynccontextmanager
+    async def _open_protocol(peer: dict, latency: typing.Optional[float] = None, ring: bool = False):
+        class _Framing(object):
+            reader = "json"
+            writer = "json"
+            compression = None
+            heartbeat = None
+
+        class _Context(object):
+            ring = None
+
+        if ring: assert "unix" == peer["type"], "shared memory transport requires a unix peer"
+
+        async with (
+            _open_peer(peer = peer) as (_peer_reader, _peer_writer),
+            contextlib.AsyncExitStack() as _stack
+        ):
             async def _protocol_reader_source(size: int):
                 assert isinstance(size, int)
                 assert 0 < size
                 return await _peer_reader.read(size)
 
+            def _get_protocol_reader_into():
+                if _Context.ring is None: return None
+                return _Context.ring.read_into
+
             async def _protocol_writer_destination(data: typing.Iterable[bytes]):
-                for data in data:
-                    assert isinstance(data, bytes)
-                    assert data
-                    _peer_writer.write(data)
+                for _chunk in data:
+                    assert isinstance(_chunk, bytes)
+                    assert _chunk
+                if _Context.ring is not None: return await _Context.ring.write(data)
+                _peer_writer.writelines(data)
                 await _peer_writer.drain()
 
+            @contextlib.asynccontextmanager
+            async def _open_socket():
+                assert _Context.ring is None, "shared memory transport has no socket stream"
+                _transport = _peer_writer.transport
+                _transport.pause_reading()
+                try: yield _peer_writer.get_extra_info("socket").fileno()
+                finally: _transport.resume_reading()
+
+            async def _open_ring():
+                assert _Context.ring is None
+                _Context.ring = await _stack.enter_async_context(_open_ring_client(
+                    reader = _peer_reader, writer = _peer_writer
+                ))
+
             async with (
-                _open_stdio() as (_stdin, _stdout, _stderr),
-                _protocol.open_reader(source = _protocol_reader_source) as _protocol_reader,
-                _protocol.open_writer(destination = _protocol_writer_destination) as _protocol_writer
-            ):
-                await _protocol_writer(message = _start_request)
-                _response = await _IterationController.anext(target = _protocol_reader)
-                await asyncio.to_thread(lambda: _check_accepted_response(value = _response))
-
-                _result = None
-
-                async with _make_task_group(lazy = True) as _task_group:
-                    try:
-                        _read_task = _task_group.spawn(awaitable = _read_coroutine(
-                            reader = _protocol_reader, writer = _protocol_writer,
-                            stdin = _stdin, stdout = _stdout, stderr = _stderr
-                        ))
-                        _write_task = _task_group.spawn(awaitable = _write_coroutine(
-                            peer = _protocol_writer, stdin = _stdin
-                        ))
-                        await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
-                        if _write_task.done(): await _write_task
-                        _result = await _read_task
-                    finally: _task_group.cancel()
+                _protocol.open_reader(
+                    source = _protocol_reader_source, framing = lambda: _Framing.reader,
+                    compression = lambda: _Framing.compression, heartbeat = lambda: _Framing.heartbeat,
+                    source_into = _get_protocol_reader_into
+                ) as _protocol_reader,
+                _protocol.open_writer(
+                    destination = _protocol_writer_destination, framing = lambda: _Framing.writer,
+                    compression = lambda: _Framing.compression, latency = latency, heartbeat = lambda: _Framing.heartbeat
+                ) as _protocol_writer
+            ): yield _protocol_reader, _protocol_writer, _Framing, _open_socket, (
+                _open_ring if ring and _ring_supported else None
+            )
 
-                assert isinstance(_result, int)
-                return _result
+    @contextlib.asynccontextmanager
+    async def _open_multiplexer(
+        peer: dict, framing: str, compression: typing.Optional[str] = None, latency: typing.Optional[float] = None,
+        ring: bool = False, heartbeat: typing.Optional[float] = None
+    ):
+        async with _open_protocol(
+            peer = peer, latency = latency, ring = ring
+        ) as (_protocol_reader, _protocol_writer, _framing, _socket, _ring):
+            await _negotiate(
+                reader = _protocol_reader, writer = _protocol_writer, request = {"multiplex": True},
+                framing = framing, compression = compression, holder = _framing, heartbeat = heartbeat, ring = _ring
+            )
+            async with _make_multiplexer(reader = _protocol_reader, writer = _protocol_writer) as _multiplexer:
+                yield _multiplexer
+
+    async def _multiplexed_session_coroutine(
+        multiplexer: _Multiplexer, request: dict, stdin: _Channel, stdout: _Channel, stderr: _Channel
+    ):
+        assert isinstance(multiplexer, _Multiplexer)
+        async with multiplexer.open() as _session:
+            _credit = await _negotiate(reader = _session, writer = _session.write, request = request)
+            return await _session_coroutine(
+                reader = _session, writer = _session.write, stdin = stdin, stdout = stdout, stderr = stderr,
+                window = None if _credit is None else request["window"], credit = _credit
+            )
+
+    async def _coroutine(
+        peer: dict, export: typing.Iterable[str], arguments: typing.Iterable[str],
+        framing: str, compression: typing.Optional[str], multiplex: bool, window: typing.Optional[int],
+        latency: typing.Optional[float],
+        raw: bool = False, descriptors: bool = False, ring: bool = False, heartbeat: typing.Optional[float] = None
+    ):
+        asyncio.get_running_loop().set_default_executor(_executors.get())
+        if multiplex and (window is None): window = _default_window
+        _start_request = await asyncio.to_thread(lambda: _make_start_request(
+            export = export, arguments = arguments, window = window
+        ))
 
-    def _routine(*args, **kwargs):
-        _result = asyncio.run(_coroutine(*args, **kwargs))
+        if multiplex:
+            async with (
+                _open_multiplexer(
+                    peer = peer, framing = framing, compression = compression, latency = latency, ring = ring,
+                    heartbeat = heartbeat
+                ) as _multiplexer,
+                _open_stdio() as (_stdin, _stdout, _stderr)
+            ): return await _multiplexed_session_coroutine(
+                multiplexer = _multiplexer, request = _start_request, stdin = _stdin, stdout = _stdout, stderr = _stderr
+            )
+
+        if raw:
+            assert "binary" == framing, "raw passthrough requires binary framing"
+            assert compression is None, "raw passthrough excludes compression"
+            async with _open_protocol(peer = peer, latency = latency) as (_reader, _writer, _framing, _socket, _):
+                await _negotiate(
+                    reader = _reader, writer = _writer, request = {**_start_request, "raw": True},
+                    framing = framing, holder = _framing, heartbeat = heartbeat
+                )
+                return await _raw_session_coroutine(writer = _writer, open_socket = _socket)
+
+        if descriptors:
+            assert "unix" == peer["type"], "descriptor passing requires a unix peer"
+            async with _open_protocol(peer = peer, latency = latency) as (_reader, _writer, _framing, _socket, _):
+                await _negotiate(
+                    reader = _reader, writer = _writer, request = {**_start_request, "descriptors": True},
+                    framing = framing, compression = compression, holder = _framing,
+                    handshake = lambda: _pass_stdio(open_socket = _socket), heartbeat = heartbeat
+                )
+                return await _stdio_session_coroutine(reader = _reader)
+
+        async with (
+            _open_protocol(
+                peer = peer, latency = latency, ring = ring
+            ) as (_protocol_reader, _protocol_writer, _framing, _socket, _ring),
+            _open_stdio() as (_stdin, _stdout, _stderr)
+        ):
+            _credit = await _negotiate(
+                reader = _protocol_reader, writer = _protocol_writer, request = _start_request,
+                framing = framing, compression = compression, holder = _framing, heartbeat = heartbeat, ring = _ring
+            )
+            return await _session_coroutine(
+                reader = _protocol_reader, writer = _protocol_writer, stdin = _stdin, stdout = _stdout, stderr = _stderr,
+                window = None if _credit is None else window, credit = _credit
+            )
+
+    def _routine(*args, loop: typing.Optional[str] = None, **kwargs):
+        try: _result = _run(_coroutine(*args, **kwargs), loop = loop)
+        except _BusyError as _exception:
+            print(_exception, file = sys.stderr, flush = True)
+            _result = _busy_exit_code
         assert isinstance(_result, int)
         exit(_result)
 
     class _Result(object):
+        BusyError = _BusyError
+        busy_exit_code = _busy_exit_code
         routine = _routine
+        negotiate = _negotiate
+        open_protocol = _open_protocol
+        open_multiplexer = _open_multiplexer
+        open_descriptors = _open_descriptors
+        make_start_request = _make_start_request
+        multiplexed_session_coroutine = _multiplexed_session_coroutine
 
     return _Result
 
 
 _private = _private()
-try: routine = _private.routine
+try:
+    BusyError = _private.BusyError
+    busy_exit_code = _private.busy_exit_code
+    routine = _private.routine
+    negotiate = _private.negotiate
+    open_protocol = _private.open_protocol
+    open_multiplexer = _private.open_multiplexer
+    open_descriptors = _private.open_descriptors
+    make_start_request = _private.make_start_request
+    multiplexed_session_coroutine = _private.multiplexed_session_coroutine
 finally: del _private
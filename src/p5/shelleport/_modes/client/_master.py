@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import sys
+    import json
+    import errno
+    import socket
+    import struct
+    import typing
+    import asyncio
+    import traceback
+    import contextlib
+
+    from . import _logic as _logic_module
+    from ... import _common as _common_module
+
+    _executors = _common_module.asynchronous_tools.executor_registry.shared
+    _run = _common_module.event_loop.run
+    _open_multiplexer = _logic_module.open_multiplexer
+    _open_descriptors = _logic_module.open_descriptors
+    _session_coroutine = _logic_module.multiplexed_session_coroutine
+    _BusyError = _logic_module.BusyError
+
+    _length = struct.Struct("!I")
+    _credentials = struct.Struct("3i")
+    _request_timeout = +1.0e+1
+    _max_request_size = 1024 * 1024
+    _ready_message = b"ready\n"
+
+    def _receive_all(connection: socket.socket, size: int):
+        _chunks = list()
+        while 0 < size:
+            _chunk = connection.recv(size)
+            if not _chunk: raise ConnectionResetError("unexpected end of control request")
+            _chunks.append(_chunk)
+            size -= len(_chunk)
+        return bytes().join(_chunks)
+
+    def _check_credentials(connection: socket.socket):
+        try: _option = socket.SO_PEERCRED
+        except AttributeError: return
+        _pid, _uid, _gid = _credentials.unpack(connection.getsockopt(socket.SOL_SOCKET, _option, _credentials.size))
+        assert os.getuid() == _uid, "control client belongs to another user"
+
+    def _receive_request(connection: socket.socket):
+        connection.settimeout(_request_timeout)
+        try:
+            _check_credentials(connection = connection)
+            _data, _descriptors, _flags, _address = socket.recv_fds(connection, _length.size, 3)
+            try:
+                assert 3 == len(_descriptors), "stdio descriptors expected"
+                _data = _data + _receive_all(connection = connection, size = _length.size - len(_data))
+                _size, = _length.unpack(_data)
+                assert 0 < _size <= _max_request_size
+                _request = json.loads(_receive_all(connection = connection, size = _size).decode("utf-8"))
+                assert isinstance(_request, dict)
+            except BaseException:
+                for _descriptor in _descriptors: os.close(_descriptor)
+                raise
+        finally: connection.setblocking(False)
+        return _request, tuple(_descriptors)
+
+    def _send_response(connection: socket.socket, response: dict):
+        connection.setblocking(True)
+        _data = json.dumps(response).encode("utf-8")
+        connection.sendall(_length.pack(len(_data)) + _data)
+
+    def _unlink(path: str, identity: typing.Tuple[int, int]):
+        try: _stat = os.stat(path)
+        except FileNotFoundError: return
+        if identity == (_stat.st_dev, _stat.st_ino): os.unlink(path)
+
+    @contextlib.contextmanager
+    def _open_listener(path: str):
+        assert isinstance(path, str)
+        assert path
+        _socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _umask = os.umask(0o177)
+            try:
+                try: _socket.bind(path)
+                except OSError as _exception:
+                    if errno.EADDRINUSE != _exception.errno: raise
+                    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as _probe:
+                        try: _probe.connect(path)
+                        except ConnectionRefusedError: pass
+                        else: raise
+                    os.unlink(path)
+                    _socket.bind(path)
+            finally: os.umask(_umask)
+            _stat = os.stat(path)
+            try:
+                _socket.listen()
+                _socket.setblocking(False)
+                yield _socket
+            finally: _unlink(path = path, identity = (_stat.st_dev, _stat.st_ino))
+        finally: _socket.close()
+
+    def _detach():
+        _descriptor = os.open(os.devnull, os.O_RDWR)
+        try:
+            os.write(sys.stdout.fileno(), _ready_message)
+            for _target in (sys.stdin.fileno(), sys.stdout.fileno()): os.dup2(_descriptor, _target)
+        finally: os.close(_descriptor)
+
+    async def _serve_client(
+        connection: socket.socket, multiplexer, peer: dict, activity: typing.Callable[[int], None]
+    ):
+        _loop = asyncio.get_running_loop()
+        _thread_pool = _executors.get(name = "io")
+        activity(+1)
+        try:
+            try:
+                _request, _descriptors = await _thread_pool(_receive_request, connection)
+                try:
+                    assert peer == _request.pop("peer"), "control master serves another peer"
+                    _start_request = _request.pop("request")
+                    assert isinstance(_start_request, dict)
+                    assert not _request, f"unknown keys: {_request.keys()}"
+                except BaseException:
+                    for _descriptor in _descriptors: os.close(_descriptor)
+                    raise
+
+                async with _open_descriptors(*_descriptors) as (_stdin, _stdout, _stderr):
+                    _session_task = asyncio.create_task(_session_coroutine(
+                        multiplexer = multiplexer, request = _start_request, stdin = _stdin, stdout = _stdout, stderr = _stderr
+                    ))
+                    _hangup_task = asyncio.create_task(_loop.sock_recv(connection, 1))
+                    try: await asyncio.wait((_session_task, _hangup_task), return_when = asyncio.FIRST_COMPLETED)
+                    finally:
+                        _hangup_task.cancel()
+                        if not _session_task.done(): _session_task.cancel()
+                        await asyncio.gather(_hangup_task, return_exceptions = True)
+                    _result = await _session_task
+
+                _response = {"result": _result}
+
+            except (asyncio.CancelledError, BrokenPipeError, ConnectionResetError): raise
+            except _BusyError: _response = {"busy": True}
+            except BaseException: _response = {"exception": traceback.format_exc()}
+
+            await _thread_pool(_send_response, connection, _response)
+
+        finally:
+            connection.close()
+            activity(-1)
+
+    async def _coroutine(
+        control: str, peer: dict, framing: str, compression: typing.Optional[str], latency: typing.Optional[float],
+        persist: float, heartbeat: typing.Optional[float] = None
+    ):
+        assert isinstance(persist, float)
+        assert 0 < persist
+        asyncio.get_running_loop().set_default_executor(_executors.get())
+        _loop = asyncio.get_running_loop()
+
+        class _Context(object):
+            active = 0
+            last = _loop.time()
+
+        def _activity(delta: int):
+            _Context.active += delta
+            assert 0 <= _Context.active
+            _Context.last = _loop.time()
+
+        _tasks = set()
+
+        try:
+            async with _open_multiplexer(
+                peer = peer, framing = framing, compression = compression, latency = latency, heartbeat = heartbeat
+            ) as _multiplexer:
+                with _open_listener(path = control) as _listener:
+                    _detach()
+
+                    async def _accept_coroutine():
+                        while True:
+                            _connection, _address = await _loop.sock_accept(_listener)
+                            _task = asyncio.create_task(_serve_client(
+                                connection = _connection, multiplexer = _multiplexer, peer = peer, activity = _activity
+                            ))
+                            _tasks.add(_task)
+                            _task.add_done_callback(_tasks.discard)
+
+                    _accept_task = asyncio.create_task(_accept_coroutine())
+                    _closed_task = asyncio.create_task(_multiplexer.wait())
+                    try:
+                        while not _closed_task.done():
+                            _delay = persist
+                            if 0 == _Context.active:
+                                _delay = _Context.last + persist - _loop.time()
+                                if 0 >= _delay: break
+                            await asyncio.wait(
+                                (_closed_task, _accept_task), timeout = _delay, return_when = asyncio.FIRST_COMPLETED
+                            )
+                            if _accept_task.done(): await _accept_task
+                    finally:
+                        _accept_task.cancel()
+                        _closed_task.cancel()
+                        for _task in tuple(_tasks): _task.cancel()
+                        await asyncio.gather(_accept_task, _closed_task, *_tasks, return_exceptions = True)
+
+        except BaseException:
+            if sys.stdout.closed is False: print(traceback.format_exc(), flush = True)
+            raise
+
+    def _routine(*args, loop: typing.Optional[str] = None, **kwargs):
+        try: _run(_coroutine(*args, **kwargs), loop = loop)
+        except Exception: exit(1)
+
+    class _Result(object):
+        routine = _routine
+        ready_message = _ready_message
+        request_header = _length
+
+    return _Result
+
+
+_private = _private()
+try:
+    routine = _private.routine
+    ready_message = _private.ready_message
+    request_header = _private.request_header
+finally: del _private
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import time
+    import socket
+    import threading
+
+    _timeout = +1.0e+1
+    _max_age = +3.0e+0
+
+    class _Context(object):
+        pending = None
+
+    def _make_key(peer: dict): return tuple(sorted(peer.items()))
+
+    def _connect(peer: dict):
+        if "tcp" == peer["type"]:
+            _socket = socket.create_connection((peer["host"], peer["port"]), timeout = _timeout)
+        else:
+            assert "unix" == peer["type"]
+            _socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            try: _socket.connect(peer["path"])
+            except BaseException:
+                _socket.close()
+                raise
+        _socket.setblocking(False)
+        return _socket
+
+    def _start(peer: dict):
+        assert isinstance(peer, dict)
+        assert _Context.pending is None, "connection is already pending"
+        _result = dict()
+
+        def _target():
+            try: _result["socket"] = _connect(peer = peer)
+            except OSError: pass
+            else: _result["time"] = time.monotonic()
+
+        _thread = threading.Thread(target = _target, daemon = True)
+        _thread.start()
+        _Context.pending = _make_key(peer = peer), _thread, _result
+
+    def _take(peer: dict):
+        assert isinstance(peer, dict)
+        _pending, _Context.pending = _Context.pending, None
+        if _pending is None: return None
+        _key, _thread, _result = _pending
+        _thread.join()
+        _socket = _result.get("socket")
+        if _socket is None: return None
+        if (_make_key(peer = peer) == _key) and (_max_age > time.monotonic() - _result["time"]): return _socket
+        _socket.close()
+        return None
+
+    class _Result(object):
+        start = _start
+        take = _take
+
+    return _Result
+
+
+_private = _private()
+try:
+    start = _private.start
+    take = _private.take
+finally: del _private
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import asyncio
+    import collections
+
+    from ... import _common as _common_module
+
+    _metrics = _common_module.metrics.shared
+    _default_timeout = +1.0e+1
+
+    _waiting_metric = _metrics.gauge(name = "admission_waiting", help = "sessions waiting for an admission slot")
+    _rejected_metric = _metrics.counter(
+        name = "sessions_rejected_total", help = "sessions answered with a busy reply", labels = ("reason", )
+    )
+
+    if isinstance(asyncio.TimeoutError, TimeoutError): _WaitTimeoutError = TimeoutError
+    else: _WaitTimeoutError = asyncio.TimeoutError
+
+    class _Class(object):
+        @property
+        def sessions(self): return self.__sessions
+
+        @property
+        def queue(self): return self.__queue
+
+        @property
+        def timeout(self): return self.__timeout
+
+        @property
+        def active(self): return self.__active
+
+        @property
+        def waiting(self): return len(self.__waiters)
+
+        async def acquire(self):
+            if (self.__sessions > self.__active) and not self.__waiters:
+                self.__active += 1
+                return True
+            if self.__queue <= len(self.__waiters):
+                _rejected_metric.labels(reason = "full").inc()
+                return False
+            _future = asyncio.get_running_loop().create_future()
+            self.__waiters.append(_future)
+            _waiting_metric.inc()
+            try: await asyncio.wait_for(_future, timeout = self.__timeout)
+            except _WaitTimeoutError:
+                _rejected_metric.labels(reason = "timeout").inc()
+                return False
+            except BaseException:
+                if _future.done() and not _future.cancelled(): self.release()
+                raise
+            finally:
+                _waiting_metric.dec()
+                try: self.__waiters.remove(_future)
+                except ValueError: pass
+            return True
+
+        def release(self):
+            assert 0 < self.__active
+            while self.__waiters:
+                _future = self.__waiters.popleft()
+                if _future.done(): continue
+                _future.set_result(None)
+                return
+            self.__active -= 1
+
+        def __init__(self, sessions: int, queue: int = None, timeout: float = None):
+            super().__init__()
+            if queue is None: queue = 0
+            assert isinstance(sessions, int)
+            assert isinstance(queue, int)
+            assert 0 < sessions
+            assert 0 <= queue
+            if timeout is None: timeout = _default_timeout
+            assert isinstance(timeout, float)
+            assert 0 < timeout
+            self.__sessions = sessions
+            self.__queue = queue
+            self.__timeout = timeout
+            self.__active = 0
+            self.__waiters = collections.deque()
+
+    class _Result(object):
+        Class = _Class
+        default_timeout = _default_timeout
+
+    return _Result
+
+
+_private = _private()
+try:
+    Class = _private.Class
+    default_timeout = _private.default_timeout
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
@@ -11,6 +11,7 @@ def _private():
     import ipaddress
 
     from . import _logic as _logic_module
+    from . import _admission as _admission_module
     from . import _shell as _shell_module
     from ... import _common as _common_module
 
@@ -20,8 +21,18 @@ def _private():
     _Shell = _shell_module.Class
 
     _routine = _logic_module.routine
+    _default_admission_timeout = _admission_module.default_timeout
+    _protocol = _common_module.protocol.make()
     _parse_address = _common_module.parse_address
+    _profiler_kinds = _common_module.profiler.kinds
+    _default_profile_interval = _common_module.profiler.default_interval
+    _validate_profile_interval = _common_module.profiler.validate_interval
+    _default_window = _common_module.flow_control.default_window
+    _validate_window = _common_module.flow_control.validate_window
+    _validate_memory = _common_module.memory_budget.validate_limit
     _make_cli_validator = _common_module.cli_validator.make
+    _loop_implementations = _common_module.event_loop.implementations
+    _loop_environment_key = _common_module.event_loop.environment_key
     _unix_access_pattern = re.compile("^[0-1]?[0-7]{3}$")
 
     class _Class(_common_module.Mode):
@@ -66,6 +77,194 @@ def _private():
                 assert _unix_access_pattern.match(value) is not None
                 return int(value, base = 8)
 
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "-w", "--warm", required = False,
+                help = "number of pre-spawned default shells to keep ready (0 as default)",
+                dest = f"{self.name}/warm", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return 0
+                value = int(value)
+                assert 0 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--warm-idle", required = False,
+                help = "seconds a pre-spawned shell may stay idle before replacement (60 as default)",
+                dest = f"{self.name}/warm-idle", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return +6.0e+1
+                value = float(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--window", required = False,
+                help = f"stdin flow control window in bytes ({_default_window} as default)",
+                dest = f"{self.name}/window", metavar = "BYTES"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return _default_window
+                return _validate_window(value = int(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--session-memory", required = False,
+                help = "bytes a session may buffer across its reads, queues and pending writes (unlimited as default)",
+                dest = f"{self.name}/session-memory", metavar = "BYTES"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _validate_memory(value = int(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--write-latency", required = False,
+                help = "seconds small writes may wait to be coalesced (0 as default)",
+                dest = f"{self.name}/write-latency", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _protocol.validate_latency(value = float(value))
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--loop", required = False, choices = _loop_implementations,
+                help = f"event loop implementation (`${_loop_environment_key}` or `asyncio` as default)",
+                dest = f"{self.name}/loop", metavar = "LOOP"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _loop_implementations
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--workers", required = False,
+                help = "worker processes sharing the listener (single process as default)",
+                dest = f"{self.name}/workers", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = int(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--pin-workers", action = "store_true", help = "pin each worker process to one allowed CPU",
+                dest = f"{self.name}/pin-workers"
+            ).dest)
+            def _routine(value: bool):  # noqa: F811
+                assert isinstance(value, bool)
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--max-sessions", required = False, help = "concurrent shell sessions per process (unlimited as default)",
+                dest = f"{self.name}/max-sessions", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = int(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--admission-queue", required = False,
+                help = "sessions that may wait for a free slot before busy replies (0 as default)",
+                dest = f"{self.name}/admission-queue", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = int(value)
+                assert 0 <= value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--admission-timeout", required = False,
+                help = f"seconds a session may wait for a free slot ({_default_admission_timeout} as default)",
+                dest = f"{self.name}/admission-timeout", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = float(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--max-spawns", required = False,
+                help = "shell subprocesses starting at once per process (unlimited as default)",
+                dest = f"{self.name}/max-spawns", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = int(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--metrics", required = False,
+                help = "serve Prometheus text metrics on a unix socket (`PATH.INDEX` per worker)",
+                dest = f"{self.name}/metrics", metavar = "PATH"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = _parse_address(value = value, scheme = "unix")
+                assert "unix" == value["type"], "metrics are served on unix sockets only"
+                return value["path"]
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--profile", required = False, help = "write per-session profiles into a directory",
+                dest = f"{self.name}/profile", metavar = "DIRECTORY"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert isinstance(value, str)
+                assert value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--profiler", required = False, choices = _profiler_kinds,
+                help = "`sampling` (collapsed stacks, as default) or `deterministic` (cProfile pstats)",
+                dest = f"{self.name}/profiler", metavar = "KIND"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                assert value in _profiler_kinds
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--profile-every", required = False, help = "profile every n-th connection (1 as default)",
+                dest = f"{self.name}/profile-every", metavar = "COUNT"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                value = int(value)
+                assert 0 < value
+                return value
+
+            # noinspection PyShadowingNames
+            @self.__cli_validator.decorator(key = parser.add_argument(
+                "--profile-interval", required = False,
+                help = f"seconds between stack samples ({_default_profile_interval} as default)",
+                dest = f"{self.name}/profile-interval", metavar = "SECONDS"
+            ).dest)
+            def _routine(value: typing.Optional[str]):  # noqa: F811
+                if value is None: return None
+                return _validate_profile_interval(value = float(value))
+
             # noinspection PyShadowingNames
             @self.__cli_validator.decorator(key = parser.add_argument(
                 nargs = "*", help = "shell (and arguments)",
@@ -83,6 +282,17 @@ def _private():
             if _unix_socket_access is not None:
                 _listen = arguments[f"{self.name}/listen"]
                 assert (_listen is not None) and "unix" == _listen["mode"], "unix mode listen expected"
+            if arguments[f"{self.name}/workers"] is None:
+                assert not arguments[f"{self.name}/pin-workers"], "workers expected"
+            else: assert arguments[f"{self.name}/listen"] is not None, "workers require a listen address"
+            if arguments[f"{self.name}/max-sessions"] is None:
+                for _key in ("admission-queue", "admission-timeout"):
+                    assert arguments[f"{self.name}/{_key}"] is None, "session limit expected"
+            if arguments[f"{self.name}/profile"] is None:
+                for _key in ("profiler", "profile-every", "profile-interval"):
+                    assert arguments[f"{self.name}/{_key}"] is None, "profile directory expected"
+            elif "deterministic" == arguments[f"{self.name}/profiler"]:
+                assert arguments[f"{self.name}/profile-interval"] is None, "sampling profiler expected"
 
         def __call__(self, cli: dict):
             assert isinstance(cli, dict)
@@ -92,7 +302,30 @@ def _private():
             if _unix_socket_access is not None:
                 assert "unix" == _listen["mode"]
                 _listen["access"] = _unix_socket_access
-            _routine(shell = _shell, listen = _listen)
+            _warm = cli[f"{self.name}/warm"]
+            _warm = {"size": _warm, "max_idle": cli[f"{self.name}/warm-idle"]} if 0 < _warm else None
+            _session = {
+                "window": cli[f"{self.name}/window"], "latency": cli[f"{self.name}/write-latency"],
+                "memory": cli[f"{self.name}/session-memory"]
+            }
+            _profile = cli[f"{self.name}/profile"]
+            if _profile is not None:
+                _profile = {
+                    "directory": _profile, "kind": cli[f"{self.name}/profiler"],
+                    "every": cli[f"{self.name}/profile-every"], "interval": cli[f"{self.name}/profile-interval"]
+                }
+            _admission = cli[f"{self.name}/max-sessions"]
+            if _admission is not None:
+                _admission = {
+                    "sessions": _admission, "queue": cli[f"{self.name}/admission-queue"],
+                    "timeout": cli[f"{self.name}/admission-timeout"]
+                }
+            _routine(
+                shell = _shell, listen = _listen, warm = _warm, session = _session,
+                metrics = cli[f"{self.name}/metrics"], profile = _profile,
+                admission = _admission, spawns = cli[f"{self.name}/max-spawns"],
+                workers = cli[f"{self.name}/workers"], pin = cli[f"{self.name}/pin-workers"], loop = cli[f"{self.name}/loop"]
+            )
 
         def __init__(self):
             super().__init__()
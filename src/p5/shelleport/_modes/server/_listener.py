@@ -6,6 +6,8 @@ assert "__main__" != __name__
 
 def _private():
     import os
+    import stat
+    import socket
     import typing
     import asyncio
     import pathlib
@@ -24,9 +26,10 @@ def _private():
             return _result
 
         @_make_decorator(mode = "tcp")
-        def _routine(address: str, port: int):
+        def _routine(address: str, port: int, reuse_port: bool = False):
             assert isinstance(address, str)
             assert isinstance(port, int)
+            assert isinstance(reuse_port, bool)
             if address:
                 if "*" == address: address = None
                 else: address = str(ipaddress.ip_address(address = address))
@@ -34,7 +37,7 @@ def _private():
             assert (0 < port) and (65536 > port)
 
             def _result(delegate: _delegate_type_hint): return asyncio.start_server(
-                delegate, host = address, port = port
+                delegate, host = address, port = port, reuse_port = reuse_port or None
             )
 
             return _result
@@ -62,27 +65,73 @@ def _private():
 
             return _result
 
+        @_make_decorator(mode = "socket")
+        def _routine(listener: socket.socket):  # noqa: F811
+            assert isinstance(listener, socket.socket)
+
+            def _result(delegate: _delegate_type_hint):
+                if socket.AF_UNIX == listener.family: return asyncio.start_unix_server(delegate, sock = listener)
+                return asyncio.start_server(delegate, sock = listener)
+
+            return _result
+
         return _collector
 
     _launchers = _make_launchers()
     del _make_launchers
 
+    def _bind_unix(path: str, access: int = 0o600, backlog: int = 100):
+        assert isinstance(path, str)
+        assert isinstance(access, int)
+        assert (0 <= access) and (0o1777 >= access)
+        path = pathlib.Path(path).resolve()
+        os.makedirs(path.parent.as_posix(), exist_ok = True)
+        path = path.as_posix()
+        try:
+            if stat.S_ISSOCK(os.stat(path).st_mode): os.remove(path)
+        except FileNotFoundError: pass
+        _socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            _socket.bind(path)
+            os.chmod(path, access)
+            _socket.listen(backlog)
+            _socket.setblocking(False)
+        except BaseException:
+            _socket.close()
+            raise
+        return _socket
+
+    def _bind(config: typing.Dict[str, typing.Any]):
+        assert isinstance(config, dict)
+        config = config.copy()
+        _mode = config.pop("mode")
+        if "unix" == _mode: return {"mode": "socket", "listener": _bind_unix(**config)}
+        assert "tcp" == _mode
+        return {**config, "mode": _mode, "reuse_port": True}
+
     async def _coroutine(
         config: typing.Dict[str, typing.Any],
-        delegate: typing.Callable[[asyncio.StreamReader, asyncio.StreamWriter], typing.Awaitable]
+        delegate: typing.Callable[[asyncio.StreamReader, asyncio.StreamWriter], typing.Awaitable],
+        ready: typing.Optional[typing.Callable[[], None]] = None
     ):
         assert isinstance(config, dict)
+        if ready is not None: assert callable(ready)
         config = config.copy()
         _mode = config.pop("mode")
         assert isinstance(_mode, str)
-        async with await _launchers[_mode](**config)(delegate = delegate) as _server: await _server.serve_forever()
+        async with await _launchers[_mode](**config)(delegate = delegate) as _server:
+            if ready is not None: ready()
+            await _server.serve_forever()
 
     class _Result(object):
+        bind = _bind
         coroutine = _coroutine
 
     return _Result
 
 
 _private = _private()
-try: coroutine = _private.coroutine
+try:
+    bind = _private.bind
+    coroutine = _private.coroutine
 finally: del _private
@@ -7,45 +7,83 @@ assert "__main__" != __name__
 def _private():
     import os
     import sys
+    import socket
     import typing
     import asyncio
     import traceback
+    import contextlib
 
     from . import _shell as _shell_module
     from . import _session as _session_module
     from . import _listener as _listener_module
+    from . import _workers as _workers_module
+    from . import _admission as _admission_module
 
     from ... import _common as _common_module
 
     _Shell = _shell_module.Class
     _SessionPeer = _session_module.Peer
 
+    _executors = _common_module.asynchronous_tools.executor_registry.shared
     _make_session = _session_module.make
+    _receive_descriptors = _common_module.descriptor_passing.receive
+    _open_ring_server = _common_module.shared_ring.open_server
+    _ring_supported = _common_module.shared_ring.supported
+    _enable_keep_alive = _common_module.tcp_keep_alive.enable
+    _bind_listener = _listener_module.bind
     _listener_coroutine = _listener_module.coroutine
+    _supervise_workers = _workers_module.routine
     _open_stream_reader = _common_module.asynchronous_tools.non_blocking_io.open_reader
     _open_stream_writer = _common_module.asynchronous_tools.non_blocking_io.open_writer
+    _metrics = _common_module.metrics.shared
+    _make_profiler = _common_module.profiler.make
+    _make_admission = _admission_module.make
+    _run = _common_module.event_loop.run
+
+    _executor_metrics = (
+        ("limit", "executor_workers", "gauge", "executor worker limit"),
+        ("queued", "executor_queued", "gauge", "tasks waiting for an executor worker"),
+        ("running", "executor_running", "gauge", "tasks running on executor workers"),
+        ("submitted", "executor_submitted_total", "counter", "tasks submitted to executors"),
+        ("completed", "executor_completed_total", "counter", "executor tasks completed"),
+        ("failed", "executor_failed_total", "counter", "executor tasks failed"),
+        ("cancelled", "executor_cancelled_total", "counter", "executor tasks cancelled before start"),
+        ("wait_time_total", "executor_wait_seconds_total", "counter", "time tasks waited for an executor worker"),
+        ("wait_time_max", "executor_wait_seconds_max", "gauge", "longest wait for an executor worker"),
+        ("busy_time_total", "executor_busy_seconds_total", "counter", "time executor workers spent on tasks"),
+        ("utilisation", "executor_utilisation", "gauge", "busy share of executor worker time since start")
+    )
+    _pool_metrics = (
+        ("size", "shell_pool_size", "gauge", "pre-spawned shells to keep ready"),
+        ("idle", "shell_pool_idle", "gauge", "pre-spawned shells ready"),
+        ("hits", "shell_pool_hits_total", "counter", "sessions served by a pre-spawned shell"),
+        ("misses", "shell_pool_misses_total", "counter", "sessions that found no pre-spawned shell"),
+        ("spawned", "shell_pool_spawned_total", "counter", "pre-spawned shells started"),
+        ("evicted", "shell_pool_evicted_total", "counter", "pre-spawned shells dropped"),
+        ("failed", "shell_pool_failed_total", "counter", "pre-spawned shells failed to start")
+    )
 
     def _close_stdio():
-        _descriptor = sys.stdin.fileno()
-        sys.stdin.close()
-        sys.stdin.buffer.close()
-        os.close(_descriptor)
-        _descriptor = sys.stdout.fileno()
-        sys.stdout.close()
-        sys.stdout.buffer.close()
-        os.close(_descriptor)
-
-    async def _make_shell(command: typing.Optional[typing.Iterable[str]]):
+        _null = os.open(os.devnull, os.O_RDWR)
+        try:
+            for _stream in (sys.stdin, sys.stdout):
+                _descriptor = _stream.fileno()
+                _stream.close()
+                _stream.buffer.close()
+                os.dup2(_null, _descriptor)
+        finally: os.close(_null)
+
+    async def _make_shell(command: typing.Optional[typing.Iterable[str]], spawns: typing.Optional[int] = None):
         if command is None: command = await _Shell.get_default_command()
-        return await asyncio.to_thread(lambda: _Shell(command = command))
+        return await asyncio.to_thread(lambda: _Shell(command = command, spawns = spawns))
 
     def _regenerate_chunks(value: typing.Iterable[bytes]):
         for value in value:
-            assert isinstance(value, bytes)
+            assert isinstance(value, (bytes, memoryview))
             assert value
             yield value
 
-    def _make_listener_delegate(shell: _Shell):
+    def _make_listener_delegate(shell: _Shell, session: dict):
         assert isinstance(shell, _Shell)
 
         async def _session_coroutine(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
@@ -55,55 +93,121 @@ def _private():
                 try:
                     assert isinstance(reader, asyncio.StreamReader)
 
-                    class _Context(object):
-                        reader = True
-                        writer = True
-
-                    def _make_read_delegate(size: int = None):
-                        if size is None: return reader.read
-                        assert isinstance(size, int)
-                        assert 0 < size
-                        return lambda: reader.read(size)
-
-                    class _Peer(_SessionPeer):
-                        @staticmethod
-                        async def read(size: int = None):
-                            _delegate = _make_read_delegate(size = size)
-
-                            assert _Context.reader is True
-                            _Context.reader = False
-
-                            try:
-                                _data = await _delegate()
-                                assert isinstance(_data, bytes)
-
-                            except BaseException:
-                                _Context.reader = None
-                                raise
-
-                            else: _Context.reader = True if _data else None
-
-                            return _data
-
-                        @staticmethod
-                        async def write(data: typing.Iterable[bytes]):
-                            data = await asyncio.to_thread(lambda: tuple(_regenerate_chunks(value = data)))
-
-                            assert _Context.writer is True
-                            _Context.writer = False
-
-                            try:
-                                for data in data: writer.write(data)
-                                await writer.drain()
-
-                            except BaseException:
-                                _Context.writer = None
-                                raise
-
-                            else: _Context.writer = True
-
-                    _session = await asyncio.to_thread(lambda: _make_session(peer = _Peer(), shell = shell))
-                    await _session()
+                    _socket = writer.get_extra_info("socket")
+                    _local = socket.AF_UNIX == _socket.family
+                    if not _local: _enable_keep_alive(value = _socket)
+
+                    async with contextlib.AsyncExitStack() as _stack:
+                        class _Context(object):
+                            reader = True
+                            writer = True
+                            ring = None
+
+                        def _make_read_delegate(size: int = None):
+                            assert _Context.ring is None, "shared memory transport reads into buffers"
+                            if size is None: return reader.read
+                            assert isinstance(size, int)
+                            assert 0 < size
+                            return lambda: reader.read(size)
+
+                        class _Peer(_SessionPeer):
+                            raw = True
+                            local = _local
+                            ring = _local and _ring_supported
+
+                            @staticmethod
+                            @contextlib.asynccontextmanager
+                            async def open_ring():
+                                assert _Context.ring is None
+                                _transport = writer.transport
+                                _transport.pause_reading()
+
+                                async def _switch(): _Context.ring = await _stack.enter_async_context(
+                                    _open_ring_server(reader = reader, writer = writer)
+                                )
+
+                                try: yield _switch
+                                finally: _transport.resume_reading()
+
+                            @staticmethod
+                            def get_read_into():
+                                if _Context.ring is None: return None
+                                return _Context.ring.read_into
+
+                            @staticmethod
+                            @contextlib.asynccontextmanager
+                            async def open_descriptors(count: int):
+                                assert isinstance(count, int)
+                                assert 0 < count
+                                assert _Context.ring is None, "shared memory transport has no socket stream"
+                                _transport = writer.transport
+                                _transport.pause_reading()
+                                try: yield lambda: _receive_descriptors(
+                                    descriptor = writer.get_extra_info("socket").fileno(), count = count
+                                )
+                                finally: _transport.resume_reading()
+
+                            @staticmethod
+                            @contextlib.asynccontextmanager
+                            async def open_raw():
+                                assert _Context.ring is None, "shared memory transport has no socket stream"
+                                assert _Context.writer is True
+                                _Context.writer = False
+                                _transport = writer.transport
+                                try:
+                                    _transport.set_write_buffer_limits(high = 0)
+                                    try:
+                                        await writer.drain()
+                                        assert 0 == _transport.get_write_buffer_size()
+                                        yield writer.get_extra_info("socket").fileno()
+                                    finally: _transport.set_write_buffer_limits()
+
+                                except BaseException:
+                                    _Context.writer = None
+                                    raise
+
+                                else: _Context.writer = True
+
+                            @staticmethod
+                            async def read(size: int = None):
+                                _delegate = _make_read_delegate(size = size)
+
+                                assert _Context.reader is True
+                                _Context.reader = False
+
+                                try:
+                                    _data = await _delegate()
+                                    assert isinstance(_data, bytes)
+
+                                except BaseException:
+                                    _Context.reader = None
+                                    raise
+
+                                else: _Context.reader = True if _data else None
+
+                                return _data
+
+                            @staticmethod
+                            async def write(data: typing.Iterable[bytes]):
+                                data = await asyncio.to_thread(lambda: tuple(_regenerate_chunks(value = data)))
+
+                                assert _Context.writer is True
+                                _Context.writer = False
+
+                                try:
+                                    if _Context.ring is not None: await _Context.ring.write(data)
+                                    else:
+                                        writer.writelines(data)
+                                        await writer.drain()
+
+                                except BaseException:
+                                    _Context.writer = None
+                                    raise
+
+                                else: _Context.writer = True
+
+                        _session = await asyncio.to_thread(lambda: _make_session(peer = _Peer(), shell = shell, **session))
+                        await _session()
 
                 finally: writer.close()
 
@@ -116,7 +220,7 @@ def _private():
 
         return _result
 
-    async def _stdio_session_coroutine(shell: _Shell):
+    async def _stdio_session_coroutine(shell: _Shell, session: dict):
         assert isinstance(shell, _Shell)
 
         async with (
@@ -170,18 +274,97 @@ def _private():
 
                     else: _Context.writer = True
 
-            _session = await asyncio.to_thread(lambda: _make_session(peer = _Peer(), shell = shell))
+            _session = await asyncio.to_thread(lambda: _make_session(peer = _Peer(), shell = shell, **session))
             await _session()
 
-    async def _coroutine(listen: typing.Optional[dict], shell: typing.Optional[typing.Iterable[str]]):
-        shell = await _make_shell(command = shell)
+    def _generate_executor_metrics():
+        _statistics = _executors.statistics()
+        for _key, _name, _kind, _help in _executor_metrics: yield _name, _kind, _help, [
+            ({"pool": _pool}, _values[_key]) for _pool, _values in _statistics.items()
+        ]
+
+    def _generate_pool_metrics(shell: _Shell):
+        _pool = shell.pool
+        if _pool is None: return
+        _statistics = _pool.statistics()
+        for _key, _name, _kind, _help in _pool_metrics: yield _name, _kind, _help, [(dict(), _statistics[_key])]
 
-        if listen is None: await _stdio_session_coroutine(shell = shell)
+    async def _metrics_coroutine(path: str):
+        async def _delegate(reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+            try:
+                writer.write((await asyncio.to_thread(_metrics.render)).encode("utf-8"))
+                await writer.drain()
+            except (BrokenPipeError, ConnectionResetError): pass
+            finally: writer.close()
+
+        await _listener_coroutine(config = {"mode": "unix", "path": path}, delegate = _delegate)
+
+    def _report_failure(task: asyncio.Task):
+        if task.cancelled() or (task.exception() is None): return
+        print("".join(traceback.format_exception(task.exception())), file = sys.stderr, flush = True)
+
+    @contextlib.asynccontextmanager
+    async def _open_metrics(path: typing.Optional[str], shell: _Shell):
+        if path is None:
+            yield
+            return
+        _removers = (
+            _metrics.collector(delegate = _generate_executor_metrics),
+            _metrics.collector(delegate = lambda: _generate_pool_metrics(shell = shell))
+        )
+        try:
+            _task = asyncio.create_task(_metrics_coroutine(path = path))
+            _task.add_done_callback(_report_failure)
+            try: yield
+            finally:
+                _task.cancel()
+                await asyncio.gather(_task, return_exceptions = True)
+        finally:
+            for _remover in _removers: _remover()
+
+    async def _serve_coroutine(
+        listen: typing.Optional[dict], shell: _Shell, session: dict, ready: typing.Optional[typing.Callable[[], None]] = None
+    ):
+        if listen is None: await _stdio_session_coroutine(shell = shell, session = session)
         else:
             await asyncio.to_thread(_close_stdio)
-            await _listener_coroutine(config = listen, delegate = _make_listener_delegate(shell = shell))
-
-    def _routine(*args, **kwargs): asyncio.run(_coroutine(*args, **kwargs))
+            await _listener_coroutine(
+                config = listen, delegate = _make_listener_delegate(shell = shell, session = session), ready = ready
+            )
+
+    async def _coroutine(
+        listen: typing.Optional[dict], shell: typing.Optional[typing.Iterable[str]], warm: typing.Optional[dict],
+        session: dict, metrics: typing.Optional[str] = None, profile: typing.Optional[dict] = None,
+        admission: typing.Optional[dict] = None, spawns: typing.Optional[int] = None,
+        ready: typing.Optional[typing.Callable[[], None]] = None
+    ):
+        asyncio.get_running_loop().set_default_executor(_executors.get())
+        shell = await _make_shell(command = shell, spawns = spawns)
+        if admission is not None: session = {**session, "admission": _make_admission(**admission)}
+        if profile is not None:
+            _profiler = await asyncio.to_thread(lambda: _make_profiler(**profile))
+            _profiler.install()
+            session = {**session, "profiler": _profiler}
+
+        async with _open_metrics(path = metrics, shell = shell):
+            if warm is None: return await _serve_coroutine(listen = listen, shell = shell, session = session, ready = ready)
+            async with shell.open_pool(**warm): await _serve_coroutine(
+                listen = listen, shell = shell, session = session, ready = ready
+            )
+
+    def _routine(
+        listen: typing.Optional[dict], metrics: typing.Optional[str] = None, workers: typing.Optional[int] = None,
+        pin: bool = False, loop: typing.Optional[str] = None, **kwargs
+    ):
+        if workers is None: return _run(_coroutine(listen = listen, metrics = metrics, **kwargs), loop = loop)
+        assert listen is not None, "workers require a listen address"
+        listen = _bind_listener(config = listen)
+
+        def _target(index: int, ready: typing.Callable[[], None]): _run(_coroutine(
+            listen = listen, metrics = None if metrics is None else f"{metrics}.{index}", ready = ready, **kwargs
+        ), loop = loop)
+
+        _supervise_workers(count = workers, target = _target, pin = pin)
 
     class _Result(object):
         routine = _routine
@@ -5,34 +5,118 @@ assert "__main__" != __name__
 
 
 def _private():
+    import sys
+    import time
     import typing
     import asyncio
     import traceback
 
     from . import peer as _peer_module
     from .. import _shell as _shell_module
+    from .. import _admission as _admission_module
     from .... import _common as _common_module
 
     _Peer = _peer_module.Class
+    _Profiler = _common_module.profiler.Class
+    _Admission = _admission_module.Class
     _Shell = _shell_module.Class
     _ShellSession = _shell_module.Session
+    _Session = _common_module.multiplexer.Session
     _IterationController = _common_module.asynchronous_tools.IterationController
 
     _protocol = _common_module.protocol.make()
+    _make_credit = _common_module.flow_control.make_credit
+    _make_window = _common_module.flow_control.make_window
+    _default_window = _common_module.flow_control.default_window
+    _validate_window = _common_module.flow_control.validate_window
+    _validate_heartbeat = _common_module.protocol_options.validate_heartbeat
+    _make_multiplexer = _common_module.multiplexer.make
+    _make_memory_budget = _common_module.memory_budget.make
+    _buffers = _common_module.buffer_pool.shared
+    _validate_memory = _common_module.memory_budget.validate_limit
     _valid_channels = {"stdin", "stdout", "stderr"}
     _make_task_group = _common_module.asynchronous_tools.task_group.make
+    _passthrough = _common_module.passthrough
+    _close_descriptors = _common_module.descriptor_passing.close_all
+    _metrics = _common_module.metrics.shared
+    _duration_buckets = _common_module.metrics.duration_buckets
+
+    _connections_active_metric = _metrics.gauge(name = "connections_active", help = "open peer connections")
+    _connections_metric = _metrics.counter(name = "connections_total", help = "accepted peer connections")
+    _sessions_active_metric = _metrics.gauge(name = "sessions_active", help = "running shell sessions")
+    _sessions_started_metric = _metrics.counter(name = "sessions_started_total", help = "shell sessions started")
+    _sessions_failed_metric = _metrics.counter(name = "sessions_failed_total", help = "shell sessions ended by an exception")
+    _session_duration_metric = _metrics.histogram(
+        name = "session_duration_seconds", help = "shell session lifetime by mode", labels = ("mode", ),
+        buckets = _duration_buckets
+    )
+    _flow_stall_metric = _metrics.counter(
+        name = "flow_control_stall_seconds_total", help = "time output waited for peer credit", labels = ("channel", )
+    )
+
+    def _pop_connection_options(value: dict):
+        assert isinstance(value, dict)
+        _options = dict()
+        _framing = value.pop("framing", None)
+        if _framing is not None:
+            assert _framing in _protocol.framings, f"unsupported framing: {_framing}"
+            _options["framing"] = _framing
+        _compression = value.pop("compression", None)
+        if _compression is not None:
+            assert _compression in _protocol.compressions, f"unsupported compression: {_compression}"
+            _options["compression"] = _compression
+        _heartbeat = value.pop("heartbeat", None)
+        if _heartbeat is not None: _options["heartbeat"] = _validate_heartbeat(value = _heartbeat)
+        _shared_memory = value.pop("shared-memory", False)
+        assert isinstance(_shared_memory, bool)
+        if _shared_memory: _options["shared-memory"] = True
+        return _options
 
     def _parse_start_request(value: dict):
         assert isinstance(value, dict)
         value = value.copy()
+        _options = _pop_connection_options(value = value)
         _arguments = value.pop("arguments")
         assert isinstance(_arguments, list)
         _arguments = _Shell.validate_arguments(value = _arguments)
         _environment = value.pop("environment")
         assert isinstance(_environment, dict)
         _environment = _Shell.validate_environment(value = _environment)
+        _window = value.pop("window", None)
+        if _window is not None: _window = _validate_window(value = _window)
+        _raw = value.pop("raw", False)
+        assert isinstance(_raw, bool)
+        _descriptors = value.pop("descriptors", False)
+        assert isinstance(_descriptors, bool)
+        assert not (_raw and _descriptors), "raw passthrough excludes descriptor passing"
+        assert not value, f"unknown keys: {value.keys()}"
+        return _arguments, _environment, _options, _window, _raw, _descriptors
+
+    def _parse_multiplex_request(value: dict):
+        assert isinstance(value, dict)
+        value = value.copy()
+        assert value.pop("multiplex") is True
+        _options = _pop_connection_options(value = value)
         assert not value, f"unknown keys: {value.keys()}"
-        return _arguments, _environment
+        return _options
+
+    async def _negotiate_options(
+        options: dict, holder: type, writer: typing.Callable, response: dict,
+        ring: typing.Optional[typing.Callable[[], typing.AsyncContextManager]] = None
+    ):
+        assert isinstance(options, dict)
+        if ring is None: options = {_key: _value for _key, _value in options.items() if "shared-memory" != _key}
+        if not options: return await writer(response)
+        _framing = options.get("framing")
+        if _framing is not None: holder.reader = _framing
+        holder.heartbeat = options.get("heartbeat")
+        if "shared-memory" not in options: await writer({**response, **options})
+        else:
+            async with ring() as _switch:
+                await writer({**response, **options})
+                await _switch()
+        if _framing is not None: holder.writer = _framing
+        holder.compression = options.get("compression")
 
     class _Logic(object):
         @property
@@ -41,76 +125,218 @@ def _private():
         async def __call__(self):
             assert self.__state is None
             self.__state = True
-
-            try:
-                _start_request = await _IterationController.anext(target = self.__reader)
-                _start_request = await asyncio.to_thread(lambda: _parse_start_request(value = _start_request))
-                _arguments, _environment = _start_request
-                await self.__send_message({"accepted": True})
-
-                async with (
-                    await self.__shell(arguments = _arguments, environment = _environment) as _shell,
-                    _make_task_group(lazy = True) as _task_group
-                ):
-                    try:
-                        _writer_task = _task_group.spawn(awaitable = self.__writer_coroutine(shell = _shell))
-                        _task_group.spawn(awaitable = self.__reader_coroutine(shell = _shell))
-                        await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
-                        assert _writer_task.done()
-                        await _writer_task
-                    finally: _task_group.cancel()
-
-            except BaseException:
-                await self.__send_message({"exception": traceback.format_exc()})
-                raise
-
-            finally: self.__state = False
-
-            assert not self.__writer_exception
+            if self.__admission is None: return await self.__run()
+            if self.__framing is not None:
+                try: self.__framing.heartbeat = _pop_connection_options(value = self.__request.copy()).get("heartbeat")
+                except AssertionError: pass
+                self.__writer.arm_heartbeat()
+            if not await self.__admission.acquire():
+                self.__state = False
+                return await self.__send_message({"busy": True})
+            try: await self.__run()
+            finally: self.__admission.release()
 
         def __init__(
             self,
             shell: _Shell,
+            request: dict,
             reader: typing.AsyncIterator[dict],
-            writer: typing.Callable[[dict], typing.Awaitable]
+            writer: typing.Callable[[dict], typing.Awaitable],
+            framing: typing.Optional[type],
+            window: int,
+            raw: typing.Optional[typing.Callable[[], typing.AsyncContextManager[int]]] = None,
+            descriptors: typing.Optional[typing.Callable[[int], typing.AsyncContextManager]] = None,
+            ring: typing.Optional[typing.Callable[[], typing.AsyncContextManager]] = None,
+            admission: _Admission = None, memory: int = None
         ):
             super().__init__()
             assert isinstance(shell, _Shell)
+            assert isinstance(request, dict)
+            if admission is not None: assert isinstance(admission, _Admission)
+            if memory is not None: memory = _validate_memory(value = memory)
             self.__state = None
             self.__shell = shell
+            self.__request = request
+            self.__framing = framing
+            self.__raw = raw
+            self.__descriptors = descriptors
+            self.__ring = ring
+            self.__admission = admission
+            self.__window = _validate_window(value = window)
+            self.__memory = memory
+            self.__budget = None
+            self.__credits = None
+            self.__stdin_window = None
             self.__reader = reader
             self.__writer = writer
             self.__closed_by_peer = set()
             self.__closed_by_shell = set()
             self.__writer_exception = False
 
-        async def __reader_coroutine(self, shell: _ShellSession):
+        async def __run(self):
+            _mode = "unknown"
+            _time = time.monotonic()
+            _sessions_started_metric.inc()
+            _sessions_active_metric.inc()
+            self.__budget = _make_memory_budget(limit = self.__memory)
+            if self.__framing is not None: self.__framing.budget = self.__budget
+
+            try:
+                _arguments, _environment, _options, _window, _raw, _descriptors = await asyncio.to_thread(
+                    lambda: _parse_start_request(value = self.__request)
+                )
+                _mode = "descriptors" if _descriptors else ("raw" if _raw else "stream")
+                if _options: assert self.__framing is not None, "connection options are negotiated per connection"
+                _response = {"accepted": True}
+                if _window is None: assert self.__framing is not None, "multiplexed sessions require flow control"
+                else:
+                    self.__credits = {_channel: _make_credit(window = _window) for _channel in ("stdout", "stderr")}
+                    _stdin_window = self.__window
+                    if self.__budget.chunk is not None: _stdin_window = min(_stdin_window, 2 * self.__budget.chunk)
+                    self.__stdin_window = _make_window(size = _stdin_window)
+                    _response["window"] = _stdin_window
+                if _raw:
+                    assert self.__raw is not None, "raw passthrough is not supported by this peer"
+                    assert "binary" == _options.get("framing"), "raw passthrough requires binary framing"
+                    assert "compression" not in _options, "raw passthrough excludes compression"
+                    _response["raw"] = True
+                if _options.get("shared-memory"):
+                    assert not _raw, "shared memory transport excludes raw passthrough"
+                    assert not _descriptors, "shared memory transport excludes descriptor passing"
+                if _descriptors:
+                    assert self.__descriptors is not None, "descriptor passing requires a local unix peer"
+                    _response["descriptors"] = True
+                    async with self.__descriptors(count = 3) as _receive_stdio:
+                        await _negotiate_options(
+                            options = _options, holder = self.__framing, writer = self.__send_message, response = _response
+                        )
+                        _stdio = await _receive_stdio()
+                else: await _negotiate_options(
+                    options = _options, holder = self.__framing, writer = self.__send_message, response = _response,
+                    ring = self.__ring
+                )
+
+                if _descriptors:
+                    try:
+                        async with await self.__shell(
+                            arguments = _arguments, environment = _environment, stdio = _stdio
+                        ) as _shell: await self.__result_coroutine(shell = _shell)
+                    finally: await asyncio.to_thread(lambda: _close_descriptors(descriptors = _stdio))
+
+                elif _raw:
+                    async with await self.__shell(arguments = _arguments, environment = _environment, raw = True) as _shell:
+                        await _shell.close_channel("stdin")
+                        async with self.__writer.hold(): await self.__raw_coroutine(shell = _shell)
+                        await self.__writer_coroutine(shell = _shell)
+
+                else:
+                    async with (
+                        await self.__shell(arguments = _arguments, environment = _environment) as _shell,
+                        _make_task_group(lazy = True) as _task_group
+                    ):
+                        try:
+                            _stdin = asyncio.Queue(maxsize = 1 if self.__stdin_window is None else 0)
+                            _writer_task = _task_group.spawn(awaitable = self.__writer_coroutine(shell = _shell))
+                            _task_group.spawn(awaitable = self.__reader_coroutine(shell = _shell, stdin = _stdin))
+                            _task_group.spawn(awaitable = self.__stdin_coroutine(shell = _shell, stdin = _stdin))
+                            await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
+                            assert _writer_task.done()
+                            await _writer_task
+                        finally: _task_group.cancel()
+
+            except BaseException:
+                _sessions_failed_metric.inc()
+                await self.__send_message({"exception": traceback.format_exc()})
+                raise
+
+            finally:
+                self.__state = False
+                self.__budget.close()
+                _sessions_active_metric.dec()
+                _session_duration_metric.labels(mode = _mode).observe(time.monotonic() - _time)
+
+            assert not self.__writer_exception
+
+        async def __reader_coroutine(self, shell: _ShellSession, stdin: asyncio.Queue):
             assert isinstance(shell, _ShellSession)
+            assert isinstance(stdin, asyncio.Queue)
             async for _message in self.__reader:
                 assert isinstance(_message, dict)
                 _channel = _message.pop("channel")
                 assert isinstance(_channel, str)
                 assert _channel in _valid_channels
+                try: _credit = _message.pop("credit")
+                except KeyError: pass
+                else:
+                    assert not _message, "invalid message"
+                    assert self.__credits is not None, "flow control is not negotiated"
+                    self.__credits[_channel].grant(size = _credit)
+                    continue
                 _blob = None
                 if "stdin" == _channel:
                     try: _blob = _message.pop("blob")
                     except KeyError: pass
-                    else: assert isinstance(_blob, bytes)
+                    else: assert isinstance(_blob, (bytes, memoryview))
                 assert not _message, "invalid message"
                 assert _channel not in self.__closed_by_peer
-                if _blob is None:
-                    self.__closed_by_peer.add(_channel)
+                if _blob is None: self.__closed_by_peer.add(_channel)
+                if "stdin" != _channel:
                     await shell.close_channel(_channel)
                     continue
-                if _channel in self.__closed_by_shell: continue
-                await shell.write(data = _blob)
+                if _blob is not None:
+                    if self.__stdin_window is not None: self.__stdin_window.receive(size = len(_blob))
+                    self.__budget.charge(size = len(_blob))
+                await stdin.put(_blob)
+
+        async def __stdin_coroutine(self, shell: _ShellSession, stdin: asyncio.Queue):
+            assert isinstance(shell, _ShellSession)
+            assert isinstance(stdin, asyncio.Queue)
+            while True:
+                _blob = await stdin.get()
+                if _blob is None:
+                    await shell.close_channel("stdin")
+                    continue
+                if "stdin" not in self.__closed_by_shell: await shell.write(data = _blob)
+                self.__budget.release(size = len(_blob))
+                if self.__stdin_window is None: continue
+                _credit = self.__stdin_window.release(size = len(_blob))
+                if 0 < _credit: await self.__send_message(message = {"channel": "stdin", "credit": _credit})
+
+        async def __raw_coroutine(self, shell: _ShellSession):
+            assert isinstance(shell, _ShellSession)
+            _message = await _IterationController.anext(target = self.__reader)
+            assert {"raw": True} == _message, "raw passthrough start expected"
+            async with self.__raw() as _descriptor, _make_task_group(lazy = True) as _task_group:
+                try:
+                    _send_task = _task_group.spawn(awaitable = _passthrough.send(
+                        sources = shell.descriptors, destination = _descriptor
+                    ))
+                    _task_group.spawn(awaitable = self.__idle_coroutine())
+                    await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
+                    assert _send_task.done(), "peer disconnected during raw passthrough"
+                    await _send_task
+                finally: _task_group.cancel()
+
+        async def __result_coroutine(self, shell: _ShellSession):
+            assert isinstance(shell, _ShellSession)
+            async with _make_task_group(lazy = True) as _task_group:
+                try:
+                    _writer_task = _task_group.spawn(awaitable = self.__writer_coroutine(shell = shell))
+                    _task_group.spawn(awaitable = self.__idle_coroutine())
+                    await _task_group.wait(return_when = asyncio.FIRST_COMPLETED)
+                    assert _writer_task.done(), "peer disconnected"
+                    await _writer_task
+                finally: _task_group.cancel()
+
+        async def __idle_coroutine(self):
+            async for _message in self.__reader: raise ValueError(f"unexpected message: {_message}")
 
         async def __writer_coroutine(self, shell: _ShellSession):
             assert isinstance(shell, _ShellSession)
 
             _result = None
 
-            async for _event in shell.generate_events():
+            async for _event in shell.generate_events(budget = self.__budget):
                 assert isinstance(_event, dict)
                 assert _result is None, "unexpected event"
                 try: _result = _event.pop("result")
@@ -125,16 +351,30 @@ def _private():
                 except KeyError: _blob = None
                 else:
                     assert "stdin" != _channel
-                    assert isinstance(_blob, bytes)
+                    assert isinstance(_blob, (bytes, memoryview))
                     assert _blob
                 assert not _event, "invalid event"
                 assert _channel not in self.__closed_by_shell
                 _message = {"channel": _channel}
                 if _blob is None: self.__closed_by_shell.add(_channel)
                 else:
-                    if _channel in self.__closed_by_peer: continue
+                    if _channel in self.__closed_by_peer:
+                        self.__budget.release(size = len(_blob), acquired = True)
+                        if isinstance(_blob, memoryview): _buffers.release(buffer = _blob)
+                        continue
+                    if self.__credits is not None:
+                        _credit = self.__credits[_channel]
+                        _stalled = 0 >= _credit.available
+                        _time = time.monotonic()
+                        await _credit.acquire(size = len(_blob))
+                        if _stalled: _flow_stall_metric.labels(channel = _channel).inc(time.monotonic() - _time)
                     _message["blob"] = _blob
                 await self.__send_message(message = _message)
+                del _message
+                if _blob is None: continue
+                self.__budget.release(size = len(_blob), acquired = True)
+                if isinstance(_blob, memoryview): _buffers.release(buffer = _blob)
+                _blob = None
 
             assert isinstance(_result, int)
             await self.__send_message(message = {"result": _result})
@@ -156,19 +396,85 @@ def _private():
         def shell(self): return self.__shell
 
         async def __call__(self):
-            async with (
-                _protocol.open_reader(source = self.__peer.read) as _protocol_reader,
-                _protocol.open_writer(destination = self.__peer.write) as _protocol_writer
-            ): await (await asyncio.to_thread(lambda: _Logic(
-                shell = self.__shell, reader = _protocol_reader, writer = _protocol_writer
-            )))()
+            _connections_metric.inc()
+            _connections_active_metric.inc()
+            try:
+                if self.__profiler is None: await self.__serve()
+                else: await self.__profiler(self.__serve())
+            finally: _connections_active_metric.dec()
 
-        def __init__(self, peer: _Peer, shell: _Shell):
+        def __init__(
+            self, peer: _Peer, shell: _Shell, window: int = None, latency: float = None, profiler: _Profiler = None,
+            admission: _Admission = None, memory: int = None
+        ):
             super().__init__()
             assert isinstance(peer, _Peer)
             assert isinstance(shell, _Shell)
+            if profiler is not None: assert isinstance(profiler, _Profiler)
+            if admission is not None: assert isinstance(admission, _Admission)
+            self.__profiler = profiler
+            self.__admission = admission
             self.__peer = peer
             self.__shell = shell
+            self.__window = _default_window if window is None else _validate_window(value = window)
+            self.__latency = None if latency is None else _protocol.validate_latency(value = latency)
+            self.__memory = None if memory is None else _validate_memory(value = memory)
+
+        async def __serve(self):
+            class _Framing(object):
+                reader = "json"
+                writer = "json"
+                compression = None
+                heartbeat = None
+                budget = None
+
+            async with (
+                _protocol.open_reader(
+                    source = self.__peer.read, framing = lambda: _Framing.reader, compression = lambda: _Framing.compression,
+                    heartbeat = lambda: _Framing.heartbeat, source_into = self.__peer.get_read_into,
+                    budget = lambda: _Framing.budget
+                ) as _protocol_reader,
+                _protocol.open_writer(
+                    destination = self.__peer.write, framing = lambda: _Framing.writer,
+                    compression = lambda: _Framing.compression, latency = self.__latency,
+                    heartbeat = lambda: _Framing.heartbeat, budget = lambda: _Framing.budget
+                ) as _protocol_writer
+            ):
+                _request = await _IterationController.anext(target = _protocol_reader)
+                assert isinstance(_request, dict)
+                if "multiplex" not in _request: return await (await asyncio.to_thread(lambda: _Logic(
+                    shell = self.__shell, request = _request,
+                    reader = _protocol_reader, writer = _protocol_writer, framing = _Framing, window = self.__window,
+                    raw = self.__peer.open_raw if self.__peer.raw else None,
+                    descriptors = self.__peer.open_descriptors if self.__peer.local else None,
+                    ring = self.__peer.open_ring if self.__peer.ring else None,
+                    admission = self.__admission, memory = self.__memory
+                )))()
+
+                try:
+                    _options = await asyncio.to_thread(lambda: _parse_multiplex_request(value = _request))
+                    await _negotiate_options(
+                        options = _options, holder = _Framing, writer = _protocol_writer,
+                        response = {"accepted": True, "multiplex": True},
+                        ring = self.__peer.open_ring if self.__peer.ring else None
+                    )
+                except BaseException:
+                    await _protocol_writer({"exception": traceback.format_exc()})
+                    raise
+
+                async with _make_multiplexer(
+                    reader = _protocol_reader, writer = _protocol_writer, acceptor = self.__accept
+                ) as _multiplexer: await _multiplexer.wait()
+
+        async def __accept(self, session: _Session):
+            assert isinstance(session, _Session)
+            try:
+                _request = await _IterationController.anext(target = session)
+                await (await asyncio.to_thread(lambda: _Logic(
+                    shell = self.__shell, request = _request, reader = session, writer = session.write,
+                    framing = None, window = self.__window, admission = self.__admission, memory = self.__memory
+                )))()
+            except Exception: print(traceback.format_exc(), file = sys.stderr, flush = True)
 
     class _Result(object):
         Class = _Class
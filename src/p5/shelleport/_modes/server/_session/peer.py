@@ -8,6 +8,24 @@ def _private():
     import typing
 
     class _Class(object):
+        raw = False
+        local = False
+        ring = False
+
+        @staticmethod
+        def open_raw() -> typing.AsyncContextManager[int]: raise NotImplementedError()
+
+        @staticmethod
+        def open_descriptors(count: int) -> typing.AsyncContextManager[typing.Callable[[], typing.Awaitable]]:
+            assert isinstance(count, int)
+            raise NotImplementedError()
+
+        @staticmethod
+        def open_ring() -> typing.AsyncContextManager[typing.Callable[[], typing.Awaitable]]: raise NotImplementedError()
+
+        @staticmethod
+        def get_read_into() -> typing.Optional[typing.Callable[[memoryview], typing.Awaitable[int]]]: return None
+
         @staticmethod
         async def read(size: int = None):
             assert (size is None) or isinstance(size, int)
@@ -11,6 +11,7 @@ def _private():
 
     class _Result(object):
         lazy_getter = _make_lazy_getter(dictionary = {
+            "Pool": lambda module: getattr(module, "_pool").Class,
             "Session": lambda module: module.session.Class,
             "Class": lambda module: getattr(module, "_class").Class,
             "make": lambda module: getattr(module, "_class").make
@@ -7,11 +7,14 @@ assert "__main__" != __name__
 def _private():
     import typing
     import asyncio
+    import contextlib
 
+    from . import _pool as _pool_module
     from . import session as _session_module
 
     _Session = _session_module.Class
 
+    _make_pool = _pool_module.make
     _make_session = _session_module.make
 
     _validate_command = _Session.validate_command
@@ -31,6 +34,12 @@ def _private():
         @property
         def environment(self): return None if self.__environment is None else self.__environment.copy()
 
+        @property
+        def pool(self): return self.__pool
+
+        @property
+        def spawns(self): return self.__spawns
+
         @staticmethod
         def get_default_command(): return _get_default_command()
 
@@ -44,26 +53,55 @@ def _private():
         def validate_environment(value: typing.Dict[str, str]): return _validate_environment(value = value)
 
         def make_session(
-            self, arguments: typing.Iterable[str] = None, environment: typing.Dict[str, str] = None
+            self, arguments: typing.Iterable[str] = None, environment: typing.Dict[str, str] = None, raw: bool = False,
+            stdio: typing.Tuple[int, int, int] = None
         ): return _make_session(
             command = _generate_session_command(head = self.__command, tail = arguments),
-            environment = environment
+            environment = environment, raw = raw, stdio = stdio
         )
 
-        async def __call__(self, arguments: typing.Iterable[str] = None, environment: typing.Dict[str, str] = None):
-            _session = await asyncio.to_thread(lambda: self.make_session(
-                arguments = arguments, environment = environment
-            ))
-            await _session.open()
-            return _session
-
-        def __init__(self, command: typing.Iterable[str], environment: typing.Dict[str, str] = None):
+        @contextlib.asynccontextmanager
+        async def open_pool(self, size: int, max_idle: float):
+            assert self.__pool is None, "pool is opened already"
+            async with _make_pool(factory = self.__spawn, size = size, max_idle = max_idle) as _pool:
+                self.__pool = _pool
+                try: yield _pool
+                finally: self.__pool = None
+
+        async def __call__(
+            self, arguments: typing.Iterable[str] = None, environment: typing.Dict[str, str] = None, raw: bool = False,
+            stdio: typing.Tuple[int, int, int] = None
+        ):
+            if (self.__pool is not None) and (not arguments) and (not environment) and (not raw) and (stdio is None):
+                _session = self.__pool.acquire()
+                if _session is not None: return _session
+            return await self.__spawn(arguments = arguments, environment = environment, raw = raw, stdio = stdio)
+
+        def __init__(self, command: typing.Iterable[str], environment: typing.Dict[str, str] = None, spawns: int = None):
             super().__init__()
             command = _validate_command(value = command)
             if environment is not None: environment = _validate_environment(value = environment)
+            if spawns is not None:
+                assert isinstance(spawns, int)
+                assert 0 < spawns
+            self.__pool = None
+            self.__spawns = spawns
+            self.__spawning = None if spawns is None else asyncio.Semaphore(spawns)
             self.__command = command
             self.__environment = environment
 
+        async def __spawn(
+            self, arguments: typing.Iterable[str] = None, environment: typing.Dict[str, str] = None, raw: bool = False,
+            stdio: typing.Tuple[int, int, int] = None
+        ):
+            _session = await asyncio.to_thread(lambda: self.make_session(
+                arguments = arguments, environment = environment, raw = raw, stdio = stdio
+            ))
+            if self.__spawning is None: await _session.open()
+            else:
+                async with self.__spawning: await _session.open()
+            return _session
+
     class _Result(object):
         Class = _Class
 
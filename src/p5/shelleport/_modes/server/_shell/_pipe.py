@@ -6,6 +6,7 @@ assert "__main__" != __name__
 
 def _private():
     import os
+    import fcntl
     import typing
     import asyncio
     import contextlib
@@ -14,15 +15,26 @@ def _private():
 
     _protocol = _common_module.protocol.make()
     _valid_modes = {"r", "w"}
-    _make_thread_pool = _common_module.asynchronous_tools.thread_pool.make
-    _make_asynchronizer = _common_module.asynchronous_tools.asynchronizer.make
-
-    @contextlib.asynccontextmanager
-    async def _open_asynchronizer():
-        with _make_thread_pool(max_workers = 1) as _thread_pool:
-            def _spawn(delegate: typing.Callable): return _thread_pool(delegate)
-            _thread_pool.open()
-            yield await _thread_pool(_make_asynchronizer, executor = _spawn)
+    _executors = _common_module.asynchronous_tools.executor_registry.shared
+    _buffers = _common_module.buffer_pool.shared
+    _pipe_size = 256 * 1024
+    _set_pipe_size = getattr(fcntl, "F_SETPIPE_SZ", None)
+
+    def _resize(descriptor: int):
+        if _set_pipe_size is None: return
+        try: fcntl.fcntl(descriptor, _set_pipe_size, _pipe_size)
+        except OSError: pass
+
+    def _read_into(descriptor: int, size: int):
+        _buffer = _buffers.acquire(size = size)
+        try:
+            with memoryview(_buffer) as _view, _view[:size] as _target: _size = os.readv(descriptor, (_target, ))
+        except BaseException:
+            _buffers.release(buffer = _buffer)
+            raise
+        if 0 < _size: return _buffers.view(buffer = _buffer, size = _size)
+        _buffers.release(buffer = _buffer)
+        return bytes()
 
     @contextlib.contextmanager
     def _open_streams():
@@ -31,6 +43,7 @@ def _private():
         try:
             assert isinstance(_reader, int)
             assert isinstance(_writer, int)
+            _resize(descriptor = _reader)
             _reader = os.fdopen(_reader, mode = "rb", buffering = -1, closefd = True)
             _writer = os.fdopen(_writer, mode = "wb", buffering = -1, closefd = True)
             yield _reader, _writer
@@ -56,20 +69,20 @@ def _private():
             event = asyncio.Event()
             class Manipulator(object): pass
 
-        async with (
-            _open_asynchronizer() as _asynchronizer,
-            _asynchronizer(await _asynchronizer(_open_streams)) as (_reader, _writer)
-        ):
+        _asynchronizer = _executors.make_asynchronizer(name = "io")
+
+        async with _asynchronizer(await _asynchronizer(_open_streams)) as (_reader, _writer):
             if "r" == mode:
                 _Context.local_descriptor = await _asynchronizer(_reader.fileno)
                 _Context.remote_stream = _writer
 
-                async def _read():
+                async def _read(size: int = None):
+                    if size is None: size = _protocol.ideal_chunk_size
+                    assert isinstance(size, int)
+                    assert 0 < size
                     if _Context.event is None: return bytes()
                     try:
-                        try: _data = await _asynchronizer(
-                            os.read, _Context.local_descriptor, _protocol.ideal_chunk_size
-                        )
+                        try: _data = _read_into(descriptor = _Context.local_descriptor, size = size)
                         except BlockingIOError: _data = None
                         if _data is None:
                             _Context.event.clear()
@@ -78,8 +91,8 @@ def _private():
                             finally: _loop.remove_reader(_Context.local_descriptor)
                             if _Context.event is None: return bytes()
                             assert _Context.event.is_set()
-                            _data = await _asynchronizer(os.read, _Context.local_descriptor, _protocol.ideal_chunk_size)
-                        assert isinstance(_data, bytes)
+                            _data = _read_into(descriptor = _Context.local_descriptor, size = size)
+                        assert isinstance(_data, (bytes, memoryview))
                         if not _data: _Context.event = None
                         return _data
                     except BaseException:
@@ -92,8 +105,8 @@ def _private():
                 _Context.local_descriptor = await _asynchronizer(_writer.fileno)
                 _Context.remote_stream = _reader
 
-                async def _write(data: bytes):
-                    assert isinstance(data, bytes)
+                async def _write(data: typing.Union[bytes, memoryview]):
+                    assert isinstance(data, (bytes, memoryview))
                     assert data
                     data = memoryview(data)
                     if _Context.event is None: return 0
@@ -102,7 +115,7 @@ def _private():
 
                     try:
                         while data:
-                            try: _size = await _asynchronizer(os.write, _Context.local_descriptor, data)
+                            try: _size = os.write(_Context.local_descriptor, data)
                             except BrokenPipeError: break
                             except BlockingIOError: _size = None
                             if _size is None:
@@ -112,7 +125,7 @@ def _private():
                                 finally: _loop.remove_writer(_Context.local_descriptor)
                                 if _Context.event is None: break
                                 assert _Context.event.is_set()
-                                try: _size = await _asynchronizer(os.write, _Context.local_descriptor, data)
+                                try: _size = os.write(_Context.local_descriptor, data)
                                 except BrokenPipeError: break
                             assert isinstance(_size, int)
                             if 0 == _size: break
@@ -140,6 +153,7 @@ def _private():
                 async def close(): await asyncio.to_thread(_Context.remote_stream.close)
 
             _Context.Manipulator.remote = _Remote()
+            _Context.Manipulator.descriptor = _Context.local_descriptor
             await _asynchronizer(os.set_blocking, _Context.local_descriptor, False)
             try: yield _Context.Manipulator
             finally:
@@ -159,6 +173,11 @@ def _private():
             _manipulator = self.__manipulator
             return None if _manipulator is None else _manipulator.remote
 
+        @property
+        def descriptor(self):
+            _manipulator = self.__manipulator
+            return None if _manipulator is None else _manipulator.descriptor
+
         async def open(self):
             assert self.__state is None
             self.__state = False
@@ -177,13 +196,13 @@ def _private():
             self.__context = None
             await _context.__aexit__(None, None, None)
 
-        async def read(self):
+        async def read(self, size: int = None):
             _manipulator = self.__manipulator
             assert _manipulator is not None, "not opened"
-            return await _manipulator.read()
+            return await _manipulator.read(size = size)
 
-        async def write(self, data: bytes):
-            assert isinstance(data, bytes)
+        async def write(self, data: typing.Union[bytes, memoryview]):
+            assert isinstance(data, (bytes, memoryview))
             assert data
             _manipulator = self.__manipulator
             assert _manipulator is not None, "not opened"
@@ -210,12 +229,15 @@ def _private():
 
     class _Result(object):
         Class = _Class
+        capacity = _pipe_size
 
     return _Result
 
 
 _private = _private()
-try: Class = _private.Class
+try:
+    Class = _private.Class
+    capacity = _private.capacity
 finally: del _private
 
 
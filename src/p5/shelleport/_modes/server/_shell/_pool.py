@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import sys
+    import time
+    import typing
+    import asyncio
+    import traceback
+    import collections
+
+    from . import session as _session_module
+
+    _Session = _session_module.Class
+
+    _retry_delay = +1.0e+0
+    _factory_type_hint = typing.Callable[[], typing.Awaitable[_Session]]
+
+    if isinstance(asyncio.TimeoutError, TimeoutError): _WaitTimeoutError = TimeoutError
+    else: _WaitTimeoutError = asyncio.TimeoutError
+
+    class _Class(object):
+        @property
+        def size(self): return self.__size
+
+        @property
+        def max_idle(self): return self.__max_idle
+
+        @property
+        def idle(self): return len(self.__idle)
+
+        def statistics(self): return {
+            "size": self.__size,
+            "idle": len(self.__idle),
+            "hits": self.__hits,
+            "misses": self.__misses,
+            "spawned": self.__spawned,
+            "evicted": self.__evicted,
+            "failed": self.__failed
+        }
+
+        def acquire(self):
+            assert self.__task is not None, "not opened"
+            while self.__idle:
+                _session, _time = self.__idle.popleft()
+                if _session.running:
+                    self.__hits += 1
+                    self.__wake.set()
+                    return _session
+                self.__evict(session = _session)
+            self.__misses += 1
+            self.__wake.set()
+            return None
+
+        async def __aenter__(self):
+            assert self.__task is None
+            self.__task = asyncio.create_task(self.__maintain())
+            return self
+
+        async def __aexit__(self, exception_type, exception_instance, exception_traceback):
+            _task = self.__task
+            assert _task is not None
+            _task.cancel()
+            await asyncio.gather(_task, return_exceptions = True)
+            while self.__idle: self.__evict(session = self.__idle.popleft()[0])
+            _closing = tuple(self.__closing)
+            await asyncio.gather(*_closing, return_exceptions = True)
+
+        def __init__(self, factory: _factory_type_hint, size: int, max_idle: float):
+            super().__init__()
+            assert callable(factory)
+            assert isinstance(size, int)
+            assert 0 < size
+            assert isinstance(max_idle, float)
+            assert 0 < max_idle
+            self.__size = size
+            self.__max_idle = max_idle
+            self.__factory = factory
+            self.__task = None
+            self.__wake = asyncio.Event()
+            self.__idle = collections.deque()
+            self.__closing = set()
+            self.__hits = 0
+            self.__misses = 0
+            self.__spawned = 0
+            self.__evicted = 0
+            self.__failed = 0
+
+        def __evict(self, session: _Session):
+            assert isinstance(session, _Session)
+            self.__evicted += 1
+            _task = asyncio.create_task(session.close())
+            self.__closing.add(_task)
+            _task.add_done_callback(self.__closing.discard)
+
+        async def __spawn(self):
+            try: _session = await self.__factory()
+            except asyncio.CancelledError: raise
+            except Exception:
+                self.__failed += 1
+                print(traceback.format_exc(), file = sys.stderr, flush = True)
+                await asyncio.sleep(_retry_delay)
+                return
+            assert isinstance(_session, _Session)
+            self.__spawned += 1
+            self.__idle.append((_session, time.monotonic()))
+
+        async def __maintain(self):
+            while True:
+                _time = time.monotonic()
+                _dead = False
+                while self.__idle:
+                    _session, _created = self.__idle[0]
+                    _running = _session.running
+                    if _running and (self.__max_idle > _time - _created): break
+                    self.__idle.popleft()
+                    self.__evict(session = _session)
+                    if not _running: _dead = True
+                if _dead:
+                    self.__failed += 1
+                    await asyncio.sleep(_retry_delay)
+                    continue
+                self.__wake.clear()
+                if self.__size > len(self.__idle):
+                    await self.__spawn()
+                    continue
+                _timeout = self.__idle[0][1] + self.__max_idle - _time
+                try: await asyncio.wait_for(self.__wake.wait(), timeout = _timeout)
+                except _WaitTimeoutError: pass
+
+    class _Result(object):
+        Class = _Class
+
+    return _Result
+
+
+_private = _private()
+try: Class = _private.Class
+finally: del _private
+
+
+# noinspection PyArgumentList
+def make(*args, **kwargs): return Class(*args, **kwargs)
@@ -6,6 +6,7 @@ assert "__main__" != __name__
 
 def _private():
     import os
+    import time
     import typing
     import shutil
     import asyncio
@@ -17,12 +18,23 @@ def _private():
     from .... import _common as _common_module
 
     _Pipe = _pipe_module.Class
+    _MemoryBudget = _common_module.memory_budget.Class
     _IterationController = _common_module.asynchronous_tools.IterationController
 
+    _protocol = _common_module.protocol.make()
     _make_pipe = _pipe_module.make
+    _pipe_capacity = _pipe_module.capacity
+    _make_chunk_sizer = _common_module.chunk_sizer.make
     _make_task_group = _common_module.asynchronous_tools.task_group.make
     _default_environment = os.environ.copy()
     _make_subprocess_cleaner = _subprocess_cleaner_module.make
+    _metrics = _common_module.metrics.shared
+
+    _spawn_metric = _metrics.histogram(
+        name = "shell_spawn_seconds", help = "time to set up pipes and start a shell subprocess", labels = ("kind", )
+    )
+    _spawn_failures_metric = _metrics.counter(name = "shell_spawn_failures_total", help = "shell subprocesses failed to start")
+    _running_metric = _metrics.gauge(name = "shells_open", help = "opened shell sessions (pooled ones included)")
 
     def _validate_arguments(value: typing.Iterable[str]):
         value = tuple(value)
@@ -84,30 +96,54 @@ def _private():
             await _pipe.open()
             yield _pipe
 
-    async def _read_pipe_coroutine(channel: str, pipe: _Pipe, queue: asyncio.Queue):
+    async def _read_pipe_coroutine(
+        channel: str, pipe: _Pipe, queue: asyncio.Queue, budget: typing.Optional[_MemoryBudget]
+    ):
         assert isinstance(channel, str)
         assert isinstance(pipe, _Pipe)
         assert isinstance(queue, asyncio.Queue)
         assert channel
+        _maximum = min(_protocol.ideal_chunk_size, _pipe_capacity)
+        if (budget is not None) and (budget.chunk is not None): _maximum = min(_maximum, budget.chunk)
+        _sizer = _make_chunk_sizer(maximum = _maximum)
         while True:
-            _chunk = await pipe.read()
-            assert isinstance(_chunk, bytes)
+            _size = _sizer.size
+            if budget is not None: await budget.acquire(size = _size)
+            try: _chunk = await pipe.read(size = _size)
+            except BaseException:
+                if budget is not None: budget.release(size = _size)
+                raise
+            assert isinstance(_chunk, (bytes, memoryview))
+            if budget is not None:
+                budget.release(size = _size - len(_chunk))
+                budget.retain(size = len(_chunk))
             if not _chunk: break
+            _sizer.observe(requested = _size, received = len(_chunk))
             await queue.put({"channel": channel, "blob": _chunk})
         await queue.put({"channel": channel})
 
-    async def _read_pipes_coroutine(pipes: typing.Iterable[typing.Tuple[str, _Pipe]], queue: asyncio.Queue):
+    async def _read_pipes_coroutine(
+        pipes: typing.Iterable[typing.Tuple[str, _Pipe]], queue: asyncio.Queue, budget: typing.Optional[_MemoryBudget]
+    ):
         assert isinstance(queue, asyncio.Queue)
 
         async with _make_task_group(lazy = True) as _task_group:
             try: await asyncio.wait([
-                _task_group.spawn(awaitable = _read_pipe_coroutine(channel = _channel, pipe = _pipe, queue = queue))
+                _task_group.spawn(awaitable = _read_pipe_coroutine(
+                    channel = _channel, pipe = _pipe, queue = queue, budget = budget
+                ))
                 for _channel, _pipe in pipes
             ], return_when = asyncio.FIRST_EXCEPTION)
             finally: _task_group.cancel()
 
+    async def _generate_result(subprocess: asyncio.subprocess.Process):
+        await subprocess.wait()
+        _exit_code = subprocess.returncode
+        assert isinstance(_exit_code, int)
+        yield {"result": _exit_code}
+
     @contextlib.asynccontextmanager
-    async def _open_manipulator(command: typing.Iterable[str], environment: typing.Dict[str, str]):
+    async def _open_manipulator(command: typing.Iterable[str], environment: typing.Dict[str, str], raw: bool):
         class _Manipulator(object): pass
 
         _queue = asyncio.Queue(maxsize = 1)
@@ -126,6 +162,9 @@ def _private():
                 _subprocess = _subprocess.subprocess
 
                 _Manipulator.write = _stdin.write
+                _Manipulator.budget = None
+                _Manipulator.subprocess = _subprocess
+                _Manipulator.descriptors = {"stdout": _stdout.descriptor, "stderr": _stderr.descriptor}
 
                 _pipes = {"stdin": _stdin, "stdout": _stdout, "stderr": _stderr}
 
@@ -150,7 +189,7 @@ def _private():
                 async def _generator():
                     _read_task = asyncio.create_task(_read_pipes_coroutine(
                         pipes = [(_channel, _pipe) for _channel, _pipe in _pipes.items() if "r" == _pipe.mode],
-                        queue = _queue
+                        queue = _queue, budget = _Manipulator.budget
                     ))
 
                     try:
@@ -180,7 +219,7 @@ def _private():
                         if not _read_task.done(): _read_task.cancel()
                         await asyncio.gather(_read_task, return_exceptions = True)
 
-                _generator = _generator()
+                _generator = _generate_result(subprocess = _subprocess) if raw else _generator()
 
                 try:
                     _Manipulator.iterator = _IterationController.aiter(target = _generator)
@@ -188,6 +227,35 @@ def _private():
 
                 finally: await _generator.aclose()
 
+    @contextlib.asynccontextmanager
+    async def _open_stdio_manipulator(
+        command: typing.Iterable[str], environment: typing.Dict[str, str], stdio: typing.Tuple[int, int, int]
+    ):
+        class _Manipulator(object): pass
+
+        _stdin, _stdout, _stderr = stdio
+
+        async with _make_subprocess_cleaner(subprocess = await asyncio.create_subprocess_exec(
+            *command, env = environment, stdin = _stdin, stdout = _stdout, stderr = _stderr
+        )) as _subprocess:
+            _subprocess = _subprocess.subprocess
+
+            async def _close_channel(key: str): assert isinstance(key, str)
+
+            _Manipulator.write = None
+            _Manipulator.budget = None
+            _Manipulator.subprocess = _subprocess
+            _Manipulator.descriptors = dict()
+            _Manipulator.close_channel = _close_channel
+
+            _generator = _generate_result(subprocess = _subprocess)
+
+            try:
+                _Manipulator.iterator = _IterationController.aiter(target = _generator)
+                yield _Manipulator
+
+            finally: await _generator.aclose()
+
     class _Class(object):
         @property
         def state(self): return self.__state
@@ -198,6 +266,21 @@ def _private():
         @property
         def environment(self): return self.__environment.copy()
 
+        @property
+        def raw(self): return self.__raw
+
+        @property
+        def descriptors(self):
+            assert self.__raw, "pipe descriptors are owned by the event generator"
+            _manipulator = self.__manipulator
+            assert _manipulator is not None, "not opened"
+            return _manipulator.descriptors.copy()
+
+        @property
+        def running(self):
+            if self.__state is not True: return False
+            return self.__manipulator.subprocess.returncode is None
+
         @staticmethod
         def get_default_command(): return _get_default_command()
 
@@ -214,8 +297,20 @@ def _private():
             assert self.__state is None
             self.__state = False
             assert self.__context is None
-            _context = _open_manipulator(command = self.__command, environment = self.__environment)
-            _manipulator = await _context.__aenter__()
+            if self.__stdio is None: _context = _open_manipulator(
+                command = self.__command, environment = self.__environment, raw = self.__raw
+            )
+            else: _context = _open_stdio_manipulator(
+                command = self.__command, environment = self.__environment, stdio = self.__stdio
+            )
+            _kind = "stdio" if self.__stdio is not None else ("raw" if self.__raw else "pipes")
+            _time = time.monotonic()
+            try: _manipulator = await _context.__aenter__()
+            except BaseException:
+                _spawn_failures_metric.inc()
+                raise
+            _spawn_metric.labels(kind = _kind).observe(time.monotonic() - _time)
+            _running_metric.inc()
             self.__state = True
             self.__context = _context
             self.__manipulator = _manipulator
@@ -226,18 +321,22 @@ def _private():
             _context = self.__context
             assert _context is not None
             self.__context = None
-            await _context.__aexit__(None, None, None)
+            try: await _context.__aexit__(None, None, None)
+            finally: _running_metric.dec()
 
-        async def write(self, data: bytes):
-            assert isinstance(data, bytes)
+        async def write(self, data: typing.Union[bytes, memoryview]):
+            assert isinstance(data, (bytes, memoryview))
             assert data
+            assert self.__stdio is None, "passed stdio is owned by the process"
             _manipulator = self.__manipulator
             assert _manipulator is not None, "not opened"
             return await _manipulator.write(data = data)
 
-        async def generate_events(self):
+        async def generate_events(self, budget: _MemoryBudget = None):
+            if budget is not None: assert isinstance(budget, _MemoryBudget)
             _manipulator = self.__manipulator
             assert _manipulator is not None, "not opened"
+            _manipulator.budget = budget
             _iterator = _manipulator.iterator
             _manipulator.iterator = None
             assert _iterator is not None
@@ -258,12 +357,24 @@ def _private():
             _context = self.__context
             assert _context is not None
             self.__context = None
-            await _context.__aexit__(exception_type, exception_instance, exception_traceback)
+            try: await _context.__aexit__(exception_type, exception_instance, exception_traceback)
+            finally: _running_metric.dec()
 
-        def __init__(self, command: typing.Iterable[str], environment: typing.Dict[str, str] = None):
+        def __init__(
+            self, command: typing.Iterable[str], environment: typing.Dict[str, str] = None, raw: bool = False,
+            stdio: typing.Tuple[int, int, int] = None
+        ):
             super().__init__()
+            assert isinstance(raw, bool)
+            if stdio is not None:
+                stdio = tuple(stdio)
+                assert 3 == len(stdio)
+                for _descriptor in stdio: assert isinstance(_descriptor, int) and (0 <= _descriptor)
+                assert not raw
             command = _validate_command(value = command)
             environment = _rebuild_environment(value = environment)
+            self.__raw = raw
+            self.__stdio = stdio
             self.__state = None
             self.__context = None
             self.__command = command
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+assert "__main__" != __name__
+
+
+def _private():
+    import os
+    import sys
+    import time
+    import signal
+    import typing
+    import traceback
+
+    _restart_delay = +1.0e+0
+    _max_restart_delay = +3.0e+1
+    _stable_uptime = +6.0e+1
+    _max_restarts = 5
+    _sleep_step = +2.5e-1
+    _ready_byte = b"\x01"
+    _stop_signals = (signal.SIGINT, signal.SIGTERM)
+
+    def _spawn(
+        index: int, target: typing.Callable[[int, typing.Callable[[], None]], typing.Any],
+        cpus: typing.Optional[typing.List[int]]
+    ):
+        _ready_reader, _ready_writer = os.pipe()
+        try: _pid = os.fork()
+        except BaseException:
+            os.close(_ready_reader)
+            os.close(_ready_writer)
+            raise
+        if 0 != _pid:
+            os.close(_ready_writer)
+            os.set_blocking(_ready_reader, False)
+            return _pid, _ready_reader
+        _code = 1
+        try:
+            os.close(_ready_reader)
+
+            def _ready():
+                try: os.write(_ready_writer, _ready_byte)
+                except OSError: pass
+
+            for _signal in _stop_signals: signal.signal(_signal, signal.SIG_DFL)
+            signal.signal(signal.SIGINT, signal.default_int_handler)
+            os.setpgid(0, 0)
+            if cpus: os.sched_setaffinity(0, {cpus[index % len(cpus)]})
+            target(index, _ready)
+            _code = 0
+        except KeyboardInterrupt: _code = 0
+        except BaseException: print(traceback.format_exc(), file = sys.stderr, flush = True)
+        finally:
+            try:
+                sys.stdout.flush()
+                sys.stderr.flush()
+            finally: os._exit(_code)
+
+    def _was_ready(descriptor: int):
+        try: return _ready_byte == os.read(descriptor, len(_ready_byte))
+        except BlockingIOError: return False
+        finally: os.close(descriptor)
+
+    def _routine(
+        count: int, target: typing.Callable[[int, typing.Callable[[], None]], typing.Any], pin: bool = False
+    ):
+        assert isinstance(count, int)
+        assert 0 < count
+        assert callable(target)
+        assert isinstance(pin, bool)
+
+        class _Context(object):
+            stopping = False
+            failure = None
+
+        _cpus = sorted(os.sched_getaffinity(0)) if pin else None
+        _workers = dict()
+        _restarts = [0] * count
+
+        def _interrupt(pid: int):
+            try: os.kill(pid, signal.SIGINT)
+            except ProcessLookupError: pass
+
+        def _stop(number: int, frame):
+            if _Context.stopping: return
+            _Context.stopping = True
+            for _pid in tuple(_workers.keys()): _interrupt(pid = _pid)
+
+        def _fail(message: str):
+            _Context.failure = message
+            _stop(number = None, frame = None)
+
+        def _start(index: int):
+            _pid, _ready = _spawn(index = index, target = target, cpus = _cpus)
+            _workers[_pid] = index, _ready, time.monotonic()
+            if _Context.stopping: _interrupt(pid = _pid)
+
+        _handlers = {_signal: signal.signal(_signal, _stop) for _signal in _stop_signals}
+        try:
+            for _index in range(count): _start(index = _index)
+            while _workers:
+                try: _pid, _status = os.wait()
+                except ChildProcessError: break
+                try: _index, _ready, _started = _workers.pop(_pid)
+                except KeyError: continue
+                _ready = _was_ready(descriptor = _ready)
+                if _Context.stopping: continue
+                _worker = f"worker {_index} (pid {_pid}) exited with {os.waitstatus_to_exitcode(_status)}"
+                if not _ready:
+                    _fail(message = f"{_worker} before it was ready, stopping")
+                    continue
+                if _stable_uptime <= time.monotonic() - _started: _restarts[_index] = 0
+                _restarts[_index] += 1
+                if _max_restarts < _restarts[_index]:
+                    _fail(message = f"{_worker}, {_max_restarts} restarts in a row failed, stopping")
+                    continue
+                _delay = min(_max_restart_delay, _restart_delay * 2 ** (_restarts[_index] - 1))
+                print(f"{_worker}, restarting in {_delay:g}s", file = sys.stderr, flush = True)
+                _deadline = time.monotonic() + _delay
+                while not _Context.stopping:
+                    _delay = _deadline - time.monotonic()
+                    if 0 >= _delay: break
+                    time.sleep(min(_delay, _sleep_step))
+                if not _Context.stopping: _start(index = _index)
+
+        finally:
+            for _signal, _handler in _handlers.items(): signal.signal(_signal, _handler)
+            for _, _ready, _ in _workers.values(): os.close(_ready)
+
+        if _Context.failure is not None:
+            print(_Context.failure, file = sys.stderr, flush = True)
+            exit(1)
+
+    class _Result(object):
+        routine = _routine
+
+    return _Result
+
+
+_private = _private()
+try: routine = _private.routine
+finally: del _private